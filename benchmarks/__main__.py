@@ -0,0 +1,141 @@
+import os
+from typing import List, Optional
+
+import typer
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from . import compare as _compare
+from . import suite
+
+app = typer.Typer(help="Benchmarks of the dc-avro command paths")
+console = Console()
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}µs"
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
+def format_ratio(ratio: Optional[float], threshold: float) -> str:
+    if ratio is None:
+        return "-"
+    if ratio > 1 + threshold:
+        return f"[red]{ratio:.2f}x[/red]"
+    if ratio < 1 - threshold:
+        return f"[green]{ratio:.2f}x[/green]"
+    return f"{ratio:.2f}x"
+
+
+@app.command()
+def run(
+    filter: Optional[List[str]] = typer.Option(
+        None,
+        "--filter",
+        "-k",
+        help="Only run the benchmarks whose name contains the text, e.g. serialize",
+    ),
+    quick: bool = typer.Option(
+        False, help="Only run the smallest size of every corpus"
+    ),
+    repeat: int = typer.Option(suite.REPEAT, min=1, help="Timed runs per benchmark"),
+    records: int = typer.Option(
+        suite.RECORDS,
+        min=1,
+        help="Records of the serialize, deserialize and generate-data benchmarks, "
+        "fewer for big schemas",
+    ),
+    output: Optional[str] = typer.Option(
+        None, help="Path of the results, benchmarks/results/<revision>.json by default"
+    ),
+) -> None:
+    """
+    Run the benchmarks and save the latency, throughput and peak memory of
+    every one, so the results of two revisions can be compared.
+    """
+    sizes = suite.SIZES
+    if quick:
+        sizes = {corpus: corpus_sizes[:1] for corpus, corpus_sizes in sizes.items()}
+
+    env = suite.environment()
+    table = Table(title=f"Benchmarks of {env['revision']}")
+    for column in ("Benchmark", "Min", "Median", "Throughput", "Peak memory"):
+        table.add_column(column, justify="left" if column == "Benchmark" else "right")
+
+    results = []
+    for case in suite.cases(sizes, records=records):
+        if filter and not any(text in case.name for text in filter):
+            continue
+        with console.status(case.name):
+            result = suite.measure(case, repeat=repeat)
+        results.append(result)
+        table.add_row(
+            escape(result.name),
+            format_seconds(result.min),
+            format_seconds(result.median),
+            f"{result.throughput:,.0f} {result.unit}/s",
+            format_bytes(result.peak_memory),
+        )
+
+    console.print(table)
+    path = output or os.path.join(suite.RESULTS_DIR, f"{env['revision']}.json")
+    suite.save(path, env, results)
+    console.print(f"Results saved to {path}")
+
+
+@app.command()
+def compare(
+    baseline: str = typer.Argument(..., help="Results of the baseline revision"),
+    current: str = typer.Argument(..., help="Results of the revision to check"),
+    threshold: float = typer.Option(
+        _compare.THRESHOLD,
+        help="Relative slowdown or memory increase reported as a regression",
+    ),
+) -> None:
+    """Compare two results, exiting with 1 when there are regressions."""
+    old = suite.load(baseline)
+    new = suite.load(current)
+    for package, version in new["packages"].items():
+        if old["packages"].get(package) != version:
+            console.print(
+                f"{package}: {old['packages'].get(package)} -> {version}",
+                style="bold",
+            )
+
+    table = Table(title=f"{old['revision']} -> {new['revision']}")
+    for column in ("Benchmark", "Median", "Time", "Peak memory", "Memory"):
+        table.add_column(column, justify="left" if column == "Benchmark" else "right")
+
+    comparisons = _compare.compare(old["results"], new["results"], threshold)
+    for comparison in comparisons:
+        result = comparison.current or comparison.baseline
+        assert result is not None
+        table.add_row(
+            escape(comparison.name),
+            format_seconds(result.median),
+            format_ratio(comparison.time_ratio, threshold),
+            format_bytes(result.peak_memory),
+            format_ratio(comparison.memory_ratio, threshold),
+        )
+    console.print(table)
+
+    regressions = [comparison for comparison in comparisons if comparison.regression]
+    if regressions:
+        console.print(f"{len(regressions)} regressions", style="bold red")
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,49 @@
+from typing import Dict, List, NamedTuple, Optional
+
+from .suite import Result
+
+# Relative slowdown, or memory increase, reported as a regression
+THRESHOLD = 0.1
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: Optional[Result]
+    current: Optional[Result]
+    # current / baseline of the median latency and the peak memory
+    time_ratio: Optional[float]
+    memory_ratio: Optional[float]
+    regression: bool
+
+
+def _ratio(current: float, baseline: float) -> Optional[float]:
+    return current / baseline if baseline else None
+
+
+def compare(
+    baseline: Dict[str, Result],
+    current: Dict[str, Result],
+    threshold: float = THRESHOLD,
+) -> List[Comparison]:
+    """
+    Compare the results of two runs by benchmark name. Benchmarks that are
+    only in one of the runs have no ratios.
+    """
+    comparisons = []
+    for name in {**baseline, **current}:
+        old = baseline.get(name)
+        new = current.get(name)
+        if old is None or new is None:
+            comparisons.append(Comparison(name, old, new, None, None, False))
+            continue
+
+        time_ratio = _ratio(new.median, old.median)
+        memory_ratio = _ratio(new.peak_memory, old.peak_memory)
+        regression = any(
+            ratio is not None and ratio > 1 + threshold
+            for ratio in (time_ratio, memory_ratio)
+        )
+        comparisons.append(
+            Comparison(name, old, new, time_ratio, memory_ratio, regression)
+        )
+    return comparisons
@@ -0,0 +1,123 @@
+import io
+import json
+import random
+from typing import Any, Callable, Dict, List, Tuple
+
+import fastavro
+from fastavro.types import Schema
+from fastavro.utils import generate_many
+
+from dc_avro._stream import json_default
+from dc_avro._types import JsonDict
+
+# Field types of the synthetic records, cycled field by field. They are json
+# friendly, so the generated records can be used as serialize input.
+FIELD_TYPES: List[Any] = [
+    "int",
+    "long",
+    "string",
+    "double",
+    "boolean",
+    ["null", "string"],
+    {"type": "array", "items": "int"},
+    {"type": "map", "values": "long"},
+]
+
+
+def wide_record(fields: int) -> JsonDict:
+    """Record with `fields` fields of every kind of type."""
+    return {
+        "type": "record",
+        "name": "Wide",
+        "namespace": "benchmarks",
+        "fields": [
+            {"name": f"field_{index}", "type": FIELD_TYPES[index % len(FIELD_TYPES)]}
+            for index in range(fields)
+        ],
+    }
+
+
+def deep_record(depth: int) -> JsonDict:
+    """Record with `depth` levels of nested records."""
+    schema: JsonDict = {
+        "type": "record",
+        "name": f"Level{depth - 1}",
+        "fields": [{"name": "value", "type": "string"}],
+    }
+    for level in range(depth - 2, -1, -1):
+        schema = {
+            "type": "record",
+            "name": f"Level{level}",
+            "fields": [
+                {"name": "value", "type": "long"},
+                {"name": "child", "type": schema},
+            ],
+        }
+    schema["namespace"] = "benchmarks"
+    return schema
+
+
+def large_union(branches: int) -> JsonDict:
+    """Record with a field that is a union of `branches` records and null."""
+    union: List[Any] = ["null"]
+    for branch in range(branches):
+        union.append(
+            {
+                "type": "record",
+                "name": f"Branch{branch}",
+                "fields": [
+                    {"name": f"id_{branch}", "type": "long"},
+                    {"name": f"name_{branch}", "type": "string"},
+                ],
+            }
+        )
+    return {
+        "type": "record",
+        "name": "Union",
+        "namespace": "benchmarks",
+        "fields": [{"name": "value", "type": union}],
+    }
+
+
+# Schema of every corpus by the size it grows with
+CORPORA: Dict[str, Callable[[int], JsonDict]] = {
+    "wide": wide_record,
+    "deep": deep_record,
+    "union": large_union,
+}
+
+
+def records(schema: Schema, count: int, seed: int = 0) -> List[Any]:
+    """`count` random records of a parsed schema, the same for the same seed."""
+    random.seed(seed)
+    return list(generate_many(schema, count=count))
+
+
+def ndjson(records: List[Any]) -> str:
+    """The records as serialize input, one json document per line."""
+    encoder = json.JSONEncoder(default=json_default)
+    return "".join(encoder.encode(record) + "\n" for record in records)
+
+
+def container(schema: Schema, records: List[Any]) -> bytes:
+    """The records as an avro object container file, the deserialize input."""
+    output = io.BytesIO()
+    fastavro.writer(output, schema, records)
+    return output.getvalue()
+
+
+def diff_pair(lines: int, every: int = 10) -> Tuple[List[str], List[str]]:
+    """
+    Source and target resources of about `lines` lines, as schema-diff reads
+    them, where the type of one field out of `every` changes.
+    """
+    # a field takes 5 lines of the indented json on average
+    source = wide_record(max(lines // 5, 1))
+    target = json.loads(json.dumps(source))
+    for field in target["fields"][::every]:
+        field["type"] = ["null", "string"] if field["type"] != "string" else "bytes"
+
+    return (
+        json.dumps(source, indent=2).splitlines(keepends=True),
+        json.dumps(target, indent=2).splitlines(keepends=True),
+    )
@@ -0,0 +1,289 @@
+import datetime
+import functools
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from fastavro import parse_schema
+
+from dc_avro import _diff, _generate, _schema_utils, _stream
+
+from . import corpora
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Packages whose releases can change the results
+PACKAGES = ("dc-avro", "fastavro", "dataclasses-avroschema", "rich")
+
+# Sizes of every corpus, from small to big
+SIZES: Dict[str, List[int]] = {
+    "wide": [10, 100, 1000],
+    "deep": [10, 50, 200],
+    "union": [10, 100, 1000],
+    "diff": [500, 5000, 50000],
+}
+# Records processed by every run, fewer for big schemas so a run handles
+# about VALUES values
+RECORDS = 1000
+VALUES = 100_000
+REPEAT = 3
+
+# Unit of the size of every corpus
+UNITS = {"wide": "fields", "deep": "levels", "union": "branches", "diff": "lines"}
+
+
+class Case(NamedTuple):
+    # command path, e.g. serialize or schema-diff
+    command: str
+    corpus: str
+    size: int
+    # number of items processed by every run and what they are
+    items: int
+    unit: str
+    # creates the input, outside of the measurements, and returns the run
+    prepare: Callable[[], Callable[[], Any]]
+
+    @property
+    def name(self) -> str:
+        return f"{self.command}[{self.corpus}-{self.size}]"
+
+
+class Result(NamedTuple):
+    name: str
+    command: str
+    corpus: str
+    size: int
+    items: int
+    unit: str
+    repeat: int
+    # seconds per run
+    min: float
+    median: float
+    # items per second of the median run
+    throughput: float
+    # bytes allocated by python at the peak of a run
+    peak_memory: int
+
+
+def _validate(schema: Dict[str, Any]) -> Callable[[], Any]:
+    def run() -> Any:
+        # every run parses the schema instead of reusing the parsed one
+        _schema_utils._parsed_schemas.clear()
+        return _schema_utils.validate(schema=schema)
+
+    return run
+
+
+def _serialize(schema: Dict[str, Any], count: int) -> Callable[[], Any]:
+    parsed = parse_schema(schema)
+    text = corpora.ndjson(corpora.records(parsed, count))
+    return lambda: _stream.serialize_records(
+        input=io.StringIO(text), output=io.BytesIO(), schema=parsed
+    )
+
+
+def _deserialize(schema: Dict[str, Any], count: int) -> Callable[[], Any]:
+    parsed = parse_schema(schema)
+    data = corpora.container(parsed, corpora.records(parsed, count))
+    return lambda: _stream.deserialize_records(
+        input=io.BytesIO(data), output=io.StringIO()
+    )
+
+
+def _generate_data(schema: Dict[str, Any], count: int) -> Callable[[], Any]:
+    parsed = parse_schema(schema)
+    return lambda: _generate.generate(
+        output=io.BytesIO(), schema=parsed, count=count, seed=0
+    )
+
+
+def _table_diff(lines: int) -> Callable[[], Any]:
+    from rich.console import Console
+
+    source, target = corpora.diff_pair(lines)
+
+    def run() -> None:
+        # rendered in pages like `schema-diff --page-size`
+        console = Console(file=io.StringIO(), width=160)
+        for table in _diff.iter_table_diff(
+            source_resource=source,
+            target_resource=target,
+            source_name="source",
+            target_name="target",
+        ):
+            console.print(table)
+
+    return run
+
+
+def _unified_diff(lines: int) -> Callable[[], Any]:
+    source, target = corpora.diff_pair(lines)
+    return lambda: _diff.unified_diff(
+        source_resource=source,
+        target_resource=target,
+        source_name="source",
+        target_name="target",
+    )
+
+
+def _semantic_diff(lines: int) -> Callable[[], Any]:
+    source, target = corpora.diff_pair(lines)
+    source_schema = json.loads("".join(source))
+    target_schema = json.loads("".join(target))
+    return lambda: _diff.semantic_diff(
+        source_schema=source_schema, target_schema=target_schema
+    )
+
+
+# Commands that process records, by the function preparing their run
+RECORD_COMMANDS: Dict[str, Callable[[Dict[str, Any], int], Callable[[], Any]]] = {
+    "serialize": _serialize,
+    "deserialize": _deserialize,
+    "generate-data": _generate_data,
+}
+DIFFS: Dict[str, Callable[[int], Callable[[], Any]]] = {
+    "table": _table_diff,
+    "unified": _unified_diff,
+    "semantic": _semantic_diff,
+}
+
+
+def cases(
+    sizes: Optional[Dict[str, List[int]]] = None, records: int = RECORDS
+) -> Iterator[Case]:
+    """Every benchmark of the command paths for the given corpus sizes."""
+    sizes = SIZES if sizes is None else sizes
+    for corpus, make_schema in corpora.CORPORA.items():
+        for size in sizes.get(corpus, ()):
+            schema = make_schema(size)
+            unit = UNITS[corpus]
+            count = max(min(records, VALUES // size), 1)
+
+            yield Case(
+                "validate",
+                corpus,
+                size,
+                size,
+                unit,
+                functools.partial(_validate, schema),
+            )
+            for command, prepare in RECORD_COMMANDS.items():
+                yield Case(
+                    command,
+                    corpus,
+                    size,
+                    count,
+                    "records",
+                    functools.partial(prepare, schema, count),
+                )
+
+    for lines in sizes.get("diff", ()):
+        for kind, prepare_diff in DIFFS.items():
+            yield Case(
+                f"schema-diff-{kind}",
+                "diff",
+                lines,
+                lines,
+                "lines",
+                functools.partial(prepare_diff, lines),
+            )
+
+
+def measure(case: Case, repeat: int = REPEAT) -> Result:
+    """
+    Run the case once to measure the peak memory, which also warms up the
+    imports and caches, and then repeat times to measure the latency.
+    """
+    run = case.prepare()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return Result(
+        name=case.name,
+        command=case.command,
+        corpus=case.corpus,
+        size=case.size,
+        items=case.items,
+        unit=case.unit,
+        repeat=repeat,
+        min=min(timings),
+        median=median,
+        throughput=case.items / median if median else 0.0,
+        peak_memory=peak_memory,
+    )
+
+
+def revision() -> str:
+    """Git revision of the tree, with a -dirty suffix for local changes."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(__file__),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """What the results depend on besides the code."""
+    return {
+        "revision": revision(),
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "packages": {package: _version(package) for package in PACKAGES},
+    }
+
+
+def save(path: str, env: Dict[str, Any], results: List[Result]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as output:
+        json.dump(
+            {**env, "results": [result._asdict() for result in results]},
+            output,
+            indent=2,
+        )
+        output.write("\n")
+
+
+def load(path: str) -> Dict[str, Any]:
+    """Results saved by `save`, with the results by name."""
+    with open(path) as results_file:
+        content = json.load(results_file)
+    content["results"] = {
+        result["name"]: Result(**result) for result in content["results"]
+    }
+    return content
@@ -0,0 +1,24 @@
+import os
+import sys
+
+
+def main() -> None:
+    """
+    Entry point of the CLI. When DC_AVRO_DAEMON is set the command is
+    forwarded to the daemon before the CLI, and its dependencies, are imported.
+    """
+    from . import _daemon
+
+    socket_path = os.environ.get(_daemon.DAEMON_ENV)
+    if socket_path:
+        exit_code = _daemon.forward(sys.argv[1:], socket_path)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .main import app
+
+    app(prog_name="dc-avro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import NamedTuple, Optional
+
+from . import exceptions
+from ._types import JsonDict
+
+# Upper bound for the total size of the cache entries on disk. When it is
+# exceeded the least recently used entries are evicted.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    if os.environ.get("DC_AVRO_CACHE_DIR"):
+        return os.environ["DC_AVRO_CACHE_DIR"]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "dc-avro")
+
+
+def outcome_from_error(error: Optional[Exception]) -> JsonDict:
+    if error is None:
+        return {"error": None}
+    return {"error": type(error).__name__, "message": str(error)}
+
+
+def error_from_outcome(outcome: JsonDict) -> Optional[Exception]:
+    if outcome["error"] is None:
+        return None
+    error_class = getattr(exceptions, outcome["error"])
+    return error_class(outcome["message"])
+
+
+def _package_version(name: str) -> str:
+    from importlib import metadata
+
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class DiskCache:
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Entries stored as files in directory, one sub directory per first
+        two characters of the key, with a max total size.
+
+        Args:
+            directory (str): Directory where the entries are stored
+            max_size (int, optional): Max total size in bytes of the entries.
+                Default to 64MB.
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _read(self, key: str) -> Optional[JsonDict]:
+        """
+        Return the stored entry for key, or None when it is not cached.
+        A hit marks the entry as recently used.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, mode="rb") as entry:
+                content = json.loads(entry.read())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return content
+
+    def _write(self, key: str, content: JsonDict) -> None:
+        """
+        Store content for key. The entry is written to a temporary file first
+        so concurrent writers never leave a half written entry behind.
+
+        When the cache directory can not be written the entry is not stored,
+        a cache failure never makes the command fail.
+        """
+        path = self._entry_path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, mode="w") as entry:
+                json.dump(content, entry)
+            os.replace(tmp_path, path)
+        except OSError:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def prune(self) -> None:
+        """
+        Evict the least recently used entries until max_size is honored.
+        Nothing is evicted when the cache directory can not be read.
+        """
+        entries = []
+        total_size = 0
+        try:
+            for bucket in os.scandir(self.directory):
+                if not bucket.is_dir():
+                    continue
+                for entry in os.scandir(bucket.path):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+        except OSError:
+            return
+
+        if total_size <= self.max_size:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+
+class ValidationCache(DiskCache):
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        On disk cache with the outcome of validating a schema.
+
+        Entries are keyed by the SHA-256 of the schema content together with
+        the fastavro and dc-avro versions, so upgrading any of them
+        invalidates the previous results.
+
+        Args:
+            directory (str): Directory where the entries are stored
+            max_size (int, optional): Max total size in bytes of the entries.
+                Default to 64MB.
+        """
+        super().__init__(os.path.join(directory, "validation"), max_size=max_size)
+        self.salt = (
+            f"fastavro={_package_version('fastavro')};"
+            f"dc-avro={_package_version('dc-avro')}"
+        ).encode()
+
+    def key(self, content: bytes) -> str:
+        return hashlib.sha256(self.salt + b"\0" + content).hexdigest()
+
+    def get(self, key: str) -> Optional[JsonDict]:
+        """Return the stored outcome for key, or None when it is not cached."""
+        return self._read(key)
+
+    def set(self, key: str, outcome: JsonDict) -> None:
+        self._write(key, outcome)
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HttpCache(DiskCache):
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        On disk cache of the resources fetched from urls.
+
+        Only responses with an ETag or a Last-Modified header are stored, so
+        the next request for the same url can be a conditional request.
+
+        Args:
+            directory (str): Directory where the entries are stored
+            max_size (int, optional): Max total size in bytes of the entries.
+                Default to 64MB.
+        """
+        super().__init__(os.path.join(directory, "http"), max_size=max_size)
+
+    def key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        entry = self._read(self.key(url))
+        if entry is None or entry.get("url") != url:
+            return None
+        return CachedResponse(
+            # latin-1 maps every byte to one character, so it is lossless
+            content=entry["content"].encode("iso-8859-1"),
+            content_type=entry["content_type"],
+            etag=entry["etag"],
+            last_modified=entry["last_modified"],
+        )
+
+    def set(self, url: str, response: CachedResponse) -> None:
+        self._write(
+            self.key(url),
+            {
+                "url": url,
+                "content": response.content.decode("iso-8859-1"),
+                "content_type": response.content_type,
+                "etag": response.etag,
+                "last_modified": response.last_modified,
+            },
+        )
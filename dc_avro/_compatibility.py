@@ -0,0 +1,310 @@
+import hashlib
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastavro.types import Schema
+
+from ._named_types import NAMED_TYPES
+from ._types import CompatibilityLevel, JsonDict
+
+# Types that the data written with the key type can be read as
+PROMOTIONS = {
+    "int": ("long", "float", "double"),
+    "long": ("float", "double"),
+    "float": ("double",),
+    "string": ("bytes",),
+    "bytes": ("string",),
+}
+
+
+class Incompatibility(NamedTuple):
+    # dotted path of the incompatible element, e.g. `com.example.User.age`
+    path: str
+    message: str
+
+
+class CompatibilityResult(NamedTuple):
+    # name of the previous version
+    version: str
+    # backward or forward
+    direction: str
+    errors: List[Incompatibility]
+
+
+def _type_name(schema: Any) -> str:
+    if isinstance(schema, str):
+        return schema
+    if isinstance(schema, list):
+        return " | ".join(_type_name(branch) for branch in schema)
+    if schema["type"] in NAMED_TYPES:
+        return schema["name"]
+    return schema["type"]
+
+
+def _short_name(name: str) -> str:
+    return name.rsplit(".", 1)[-1]
+
+
+def named_types(schema: Schema) -> Dict[str, JsonDict]:
+    """Definitions of the named types of a parsed schema by full name."""
+    names: Dict[str, JsonDict] = {}
+
+    def walk(schema: Any) -> None:
+        if isinstance(schema, list):
+            for branch in schema:
+                walk(branch)
+        elif isinstance(schema, dict):
+            if schema["type"] in NAMED_TYPES:
+                if schema["name"] in names:
+                    return
+                names[schema["name"]] = schema
+                for field in schema.get("fields", ()):
+                    walk(field["type"])
+            elif schema["type"] == "array":
+                walk(schema["items"])
+            elif schema["type"] == "map":
+                walk(schema["values"])
+
+    walk(schema)
+    return names
+
+
+def fingerprints(names: Dict[str, JsonDict]) -> Dict[str, str]:
+    """
+    Fingerprint of every named type that includes the named types it
+    references, so equal fingerprints mean equal types in any schema.
+    """
+    result: Dict[str, str] = {}
+    stack: List[str] = []
+
+    def expand(schema: Any, name: str) -> Any:
+        if isinstance(schema, str):
+            return fingerprint(schema) if schema in names else schema
+        if isinstance(schema, list):
+            return [expand(branch, name) for branch in schema]
+        if schema["type"] in NAMED_TYPES and schema["name"] != name:
+            return fingerprint(schema["name"])
+
+        expanded = {}
+        for key, value in schema.items():
+            if key.startswith("__"):
+                continue
+            if key in ("type", "items", "values"):
+                value = expand(value, name)
+            elif key == "fields":
+                value = [
+                    {**field, "type": expand(field["type"], name)} for field in value
+                ]
+            expanded[key] = value
+        return expanded
+
+    def fingerprint(name: str) -> str:
+        if name in result:
+            return result[name]
+        if name in stack:
+            # recursive reference
+            return name
+        stack.append(name)
+        expanded = json.dumps(expand(names[name], name), sort_keys=True)
+        stack.pop()
+        result[name] = hashlib.sha256(expanded.encode()).hexdigest()
+        return result[name]
+
+    for name in names:
+        fingerprint(name)
+    return result
+
+
+class _ParsedSchema(NamedTuple):
+    schema: Schema
+    names: Dict[str, JsonDict]
+    fingerprints: Dict[str, str]
+
+
+class CompatibilityChecker:
+    def __init__(self) -> None:
+        """
+        Check whether the data written with a writer schema can be read with
+        a reader schema following the avro schema resolution rules.
+
+        The result of every pair of named types is kept by the fingerprints
+        of the types, so the types shared by many versions of a schema are
+        only checked once.
+        """
+        self._results: Dict[Tuple[str, str], List[Incompatibility]] = {}
+        self._schemas: Dict[int, _ParsedSchema] = {}
+
+    def _parsed(self, schema: Schema) -> _ParsedSchema:
+        parsed = self._schemas.get(id(schema))
+        if parsed is None:
+            names = named_types(schema)
+            parsed = _ParsedSchema(schema, names, fingerprints(names))
+            self._schemas[id(schema)] = parsed
+        return parsed
+
+    def check(self, *, reader: Schema, writer: Schema) -> List[Incompatibility]:
+        return _Check(self, self._parsed(reader), self._parsed(writer)).run()
+
+
+class _Check:
+    def __init__(
+        self,
+        checker: CompatibilityChecker,
+        reader: _ParsedSchema,
+        writer: _ParsedSchema,
+    ) -> None:
+        self.results = checker._results
+        self.reader = reader
+        self.writer = writer
+
+    def run(self) -> List[Incompatibility]:
+        return self.check(
+            _type_name(self.reader.schema), self.reader.schema, self.writer.schema
+        )
+
+    def check(self, path: str, reader: Any, writer: Any) -> List[Incompatibility]:
+        if isinstance(reader, str):
+            reader = self.reader.names.get(reader, reader)
+        if isinstance(writer, str):
+            writer = self.writer.names.get(writer, writer)
+
+        if isinstance(writer, list):
+            errors = []
+            for branch in writer:
+                errors.extend(
+                    self.check(f"{path}[{_type_name(branch)}]", reader, branch)
+                )
+            return errors
+        if isinstance(reader, list):
+            if any(not self.check(path, branch, writer) for branch in reader):
+                return []
+            return [
+                Incompatibility(
+                    path,
+                    f"{_type_name(writer)} is not a branch of {_type_name(reader)}",
+                )
+            ]
+
+        reader_type = reader if isinstance(reader, str) else reader["type"]
+        writer_type = writer if isinstance(writer, str) else writer["type"]
+        if reader_type != writer_type:
+            if reader_type in PROMOTIONS.get(writer_type, ()):
+                return []
+            return [
+                Incompatibility(
+                    path,
+                    f"{_type_name(writer)} can not be read as {_type_name(reader)}",
+                )
+            ]
+
+        if reader_type in NAMED_TYPES:
+            errors = self.check_named(reader, writer)
+            return [
+                Incompatibility(path + error.path, error.message) for error in errors
+            ]
+        if reader_type == "array":
+            return self.check(f"{path}.items", reader["items"], writer["items"])
+        if reader_type == "map":
+            return self.check(f"{path}.values", reader["values"], writer["values"])
+        return []
+
+    def check_named(self, reader: JsonDict, writer: JsonDict) -> List[Incompatibility]:
+        """Errors of a pair of named types, with paths relative to the type."""
+        key = (
+            self.reader.fingerprints[reader["name"]],
+            self.writer.fingerprints[writer["name"]],
+        )
+        errors = self.results.get(key)
+        if errors is not None:
+            return errors
+
+        # a recursive reference to the pair while it is checked is compatible
+        self.results[key] = []
+        errors = self._check_named(reader, writer)
+        self.results[key] = errors
+        return errors
+
+    def _check_named(self, reader: JsonDict, writer: JsonDict) -> List[Incompatibility]:
+        aliases = {_short_name(alias) for alias in reader.get("aliases", ())}
+        writer_name = _short_name(writer["name"])
+        if _short_name(reader["name"]) != writer_name and writer_name not in aliases:
+            return [
+                Incompatibility(
+                    "", f"{writer['name']} can not be read as {reader['name']}"
+                )
+            ]
+
+        if reader["type"] == "fixed" and reader["size"] != writer["size"]:
+            return [
+                Incompatibility(
+                    ".size",
+                    f"size {writer['size']} can not be read as {reader['size']}",
+                )
+            ]
+
+        if reader["type"] == "enum":
+            symbols = set(reader["symbols"])
+            missing = [symbol for symbol in writer["symbols"] if symbol not in symbols]
+            if missing and "default" not in reader:
+                return [
+                    Incompatibility(
+                        ".symbols",
+                        f"symbols {', '.join(missing)} are missing and there is "
+                        "no default",
+                    )
+                ]
+            return []
+
+        if reader["type"] in ("record", "error"):
+            return self.check_fields(reader["fields"], writer["fields"])
+        return []
+
+    def check_fields(
+        self, reader: List[JsonDict], writer: List[JsonDict]
+    ) -> List[Incompatibility]:
+        writer_fields = {field["name"]: field for field in writer}
+        errors = []
+        for field in reader:
+            path = f".{field['name']}"
+            other: Optional[JsonDict] = writer_fields.get(field["name"])
+            for alias in field.get("aliases", ()):
+                other = other or writer_fields.get(alias)
+
+            if other is None:
+                if "default" not in field:
+                    errors.append(
+                        Incompatibility(
+                            path, "field is not in the writer schema and has no default"
+                        )
+                    )
+                continue
+            errors.extend(self.check(path, field["type"], other["type"]))
+        return errors
+
+
+def check_compatibility(
+    schema: Schema,
+    previous: Sequence[Tuple[str, Schema]],
+    level: CompatibilityLevel = CompatibilityLevel.BACKWARD,
+    transitive: bool = False,
+    checker: Optional[CompatibilityChecker] = None,
+) -> List[CompatibilityResult]:
+    """
+    Check schema against the previous versions, a sequence of name and
+    parsed schema from oldest to newest, and return one result per version
+    and direction.
+
+    Only the latest version is checked unless transitive is set.
+    """
+    checker = checker or CompatibilityChecker()
+    versions = previous if transitive else previous[-1:]
+
+    results = []
+    for name, version in versions:
+        if level in (CompatibilityLevel.BACKWARD, CompatibilityLevel.FULL):
+            errors = checker.check(reader=schema, writer=version)
+            results.append(CompatibilityResult(name, "backward", errors))
+        if level in (CompatibilityLevel.FORWARD, CompatibilityLevel.FULL):
+            errors = checker.check(reader=version, writer=schema)
+            results.append(CompatibilityResult(name, "forward", errors))
+    return results
@@ -0,0 +1,316 @@
+import bz2
+import contextlib
+import io
+import json
+import lzma
+import mmap
+import os
+import sys
+import zlib
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import fastavro
+from fastavro.types import Schema
+
+from .exceptions import InvalidData
+
+# Number of blocks sent at once to every worker process
+CHUNKSIZE = 4
+
+MAGIC = b"Obj\x01"
+SYNC_SIZE = 16
+
+Buffer = Union[bytes, memoryview, mmap.mmap]
+
+DECOMPRESSORS: Dict[str, Callable[[memoryview], Buffer]] = {
+    "null": lambda data: data,
+    # -15: raw deflate stream, without zlib headers
+    "deflate": lambda data: zlib.decompress(data, -15),
+    "bzip2": bz2.decompress,
+    "xz": lzma.decompress,
+}
+
+# the same optional libraries used by fastavro
+try:
+    from cramjam import snappy  # type: ignore
+except ImportError:
+    # cramjam is not available, snappy blocks can not be decompressed
+    ...
+else:
+    # the payload is followed by the CRC32 of the uncompressed data
+    DECOMPRESSORS["snappy"] = lambda data: bytes(snappy.decompress_raw(data[:-4]))
+
+try:
+    import lz4.block  # type: ignore
+except ImportError:
+    # lz4 is not available, lz4 blocks can not be decompressed
+    ...
+else:
+    DECOMPRESSORS["lz4"] = lz4.block.decompress
+
+try:
+    if sys.version_info >= (3, 14):
+        from compression import zstd  # type: ignore
+    else:
+        from backports import zstd  # type: ignore
+except ImportError:
+    # zstd is not available, zstandard blocks can not be decompressed
+    ...
+else:
+    DECOMPRESSORS["zstandard"] = zstd.decompress
+
+
+def read_long(buffer: Buffer, position: int) -> Tuple[int, int]:
+    """
+    Read a zig-zag encoded variable length long starting at position.
+    Returns the value and the position right after it.
+    """
+    shift = 0
+    value = 0
+    while True:
+        try:
+            byte = buffer[position]
+        except IndexError:
+            raise InvalidData("Truncated long at the end of the buffer") from None
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return (value >> 1) ^ -(value & 1), position
+        shift += 7
+
+
+def read_bytes(buffer: Buffer, position: int) -> Tuple[memoryview, int]:
+    size, position = read_long(buffer, position)
+    end = position + size
+    if end > len(buffer):
+        raise InvalidData("Truncated bytes at the end of the buffer")
+    return memoryview(buffer)[position:end], end
+
+
+class Header(NamedTuple):
+    metadata: Dict[str, bytes]
+    sync: bytes
+    # position of the first block
+    end: int
+
+    @property
+    def codec(self) -> str:
+        return self.metadata.get("avro.codec", b"null").decode()
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return json.loads(self.metadata["avro.schema"])
+
+
+class Block(NamedTuple):
+    # position of the block in the file
+    position: int
+    # number of records in the block
+    records: int
+    # the payload as stored in the file, compressed with the header codec
+    data: memoryview
+
+
+def read_header(buffer: Buffer) -> Header:
+    if bytes(buffer[: len(MAGIC)]) != MAGIC:
+        raise InvalidData("The input is not an Avro Object Container File")
+
+    metadata = {}
+    position = len(MAGIC)
+    while True:
+        count, position = read_long(buffer, position)
+        if count == 0:
+            break
+        if count < 0:
+            # negative counts are followed by the size in bytes of the block
+            count = -count
+            _, position = read_long(buffer, position)
+        for _ in range(count):
+            key, position = read_bytes(buffer, position)
+            value, position = read_bytes(buffer, position)
+            metadata[bytes(key).decode()] = bytes(value)
+
+    sync = bytes(buffer[position : position + SYNC_SIZE])
+    return Header(metadata=metadata, sync=sync, end=position + SYNC_SIZE)
+
+
+def find_block(buffer: Buffer, header: Header, offset: int) -> int:
+    """
+    Return the position of the first block that starts at offset or after it,
+    using the sync marker that ends every block. The end of the buffer is
+    returned when there are no more blocks.
+    """
+    if offset <= header.end:
+        return header.end
+
+    if isinstance(buffer, memoryview):
+        buffer = buffer.obj  # type: ignore
+    # the sync marker of the previous block can start right before offset
+    position = buffer.find(header.sync, offset - SYNC_SIZE)  # type: ignore
+    if position == -1:
+        return len(buffer)
+    return position + SYNC_SIZE
+
+
+def read_block(buffer: Buffer, header: Header, position: int) -> Tuple[Block, int]:
+    """
+    Read the block that starts at position. Returns the block and the
+    position of the next one.
+    """
+    view = memoryview(buffer)
+    count, data_position = read_long(view, position)
+    data, end = read_bytes(view, data_position)
+    if bytes(view[end : end + SYNC_SIZE]) != header.sync:
+        raise InvalidData(f"Invalid sync marker after the block at {position}")
+    return Block(position=position, records=count, data=data), end + SYNC_SIZE
+
+
+def iter_blocks(
+    buffer: Buffer, header: Header, offset: int = 0, limit: Optional[int] = None
+) -> Iterator[Block]:
+    """
+    Iterate over the blocks of the container stored in buffer.
+
+    Only the block headers are read, the payloads are zero-copy slices of
+    buffer.
+
+    Args:
+        buffer (bytes | memoryview): the container file
+        header (Header): the header of the container file
+        offset (int, optional): Position in bytes from where to look for
+            the first block. Default to 0, the first block of the file.
+        limit (int, optional): Max number of blocks. Default to None, all.
+    """
+    position = find_block(buffer, header, offset)
+    blocks = 0
+
+    while position < len(buffer) and (limit is None or blocks < limit):
+        block, position = read_block(buffer, header, position)
+        yield block
+        blocks += 1
+
+
+def decompress(codec: str, data: memoryview) -> Buffer:
+    try:
+        decompressor = DECOMPRESSORS[codec]
+    except KeyError:
+        raise InvalidData(
+            f"Codec {codec} is not supported. Make sure that its library is installed"
+        ) from None
+    return decompressor(data)
+
+
+def decode_block(
+    block: Block,
+    codec: str,
+    writer_schema: Schema,
+    reader_schema: Optional[Schema] = None,
+) -> Iterator[Any]:
+    payload = io.BytesIO(decompress(codec, block.data))
+    for _ in range(block.records):
+        yield fastavro.schemaless_reader(payload, writer_schema, reader_schema)
+
+
+def iter_records(
+    buffer: Buffer,
+    reader_schema: Optional[Schema] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Lazily decode the records of the container file stored in buffer,
+    starting from the first block after offset and reading at most limit
+    blocks.
+    """
+    header = read_header(buffer)
+    writer_schema = fastavro.parse_schema(header.schema)
+    for block in iter_blocks(buffer, header, offset=offset, limit=limit):
+        yield from decode_block(block, header.codec, writer_schema, reader_schema)
+
+
+# state of every worker process, set once by `_init_worker`
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(path: str, header: Header, reader_schema: Optional[Schema]) -> None:
+    with open(path, mode="rb") as file:
+        _worker["buffer"] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _worker["header"] = header
+    _worker["writer_schema"] = fastavro.parse_schema(header.schema)
+    _worker["reader_schema"] = reader_schema
+
+
+def _decode_block_at(position: int) -> List[Any]:
+    header = _worker["header"]
+    block, _ = read_block(_worker["buffer"], header, position)
+    return list(
+        decode_block(
+            block, header.codec, _worker["writer_schema"], _worker["reader_schema"]
+        )
+    )
+
+
+def iter_records_parallel(
+    path: str,
+    reader_schema: Optional[Schema] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    jobs: int = 0,
+) -> Iterator[Any]:
+    """
+    Decode the records of the container file in path using a pool of jobs
+    worker processes, 0 for one per CPU.
+
+    The block boundaries are located in the current process, then every
+    worker memory-maps the file and decompresses and decodes whole blocks.
+    Records are yielded in the same order as in the file.
+    """
+    with open_mapped(path) as buffer:
+        header = read_header(buffer)
+        positions = [
+            block.position
+            for block in iter_blocks(buffer, header, offset=offset, limit=limit)
+        ]
+
+    import multiprocessing
+
+    with multiprocessing.Pool(
+        processes=jobs or None,
+        initializer=_init_worker,
+        initargs=(path, header, reader_schema),
+    ) as pool:
+        for records in pool.imap(_decode_block_at, positions, chunksize=CHUNKSIZE):
+            yield from records
+
+
+@contextlib.contextmanager
+def open_mapped(path: str) -> Iterator[mmap.mmap]:
+    """
+    Memory-map the file in path for reading. Empty files can not be mapped
+    and are not container files, so InvalidData is raised.
+    """
+    with open(path, mode="rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise InvalidData(
+                f"{path} is empty, it is not an Avro Object Container File"
+            )
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            # a record iterator that was not exhausted still holds a slice,
+            # the map is released once it is garbage collected
+            ...
@@ -0,0 +1,221 @@
+import base64
+import contextlib
+import io
+import json
+import os
+import shutil
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import traceback
+from typing import Any, Dict, Iterator, List, Optional
+
+from .exceptions import DaemonError
+
+# Environment variable with the socket of a `dc-avro serve` daemon. When it
+# is set the commands in FORWARDED_COMMANDS are run by the daemon
+DAEMON_ENV = "DC_AVRO_DAEMON"
+FORWARDED_COMMANDS = (
+    "deserialize",
+    "lint",
+    "schema-diff",
+    "serialize",
+    "validate-schema",
+)
+
+# Modules imported when the daemon starts, so the first requests are fast
+WARM_MODULES = (
+    "dataclasses_avroschema",
+    "dc_avro._diff",
+    "dc_avro._http",
+    "fastavro.utils",
+    "rich.console",
+)
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "dc-avro.sock")
+    return os.path.join(tempfile.gettempdir(), f"dc-avro-{os.getuid()}.sock")
+
+
+def _option_values(args: List[str], name: str) -> List[str]:
+    values = [value for arg, value in zip(args, args[1:]) if arg == name]
+    values.extend(arg[len(name) + 1 :] for arg in args if arg.startswith(name + "="))
+    return values
+
+
+def streams_stdio(args: List[str]) -> bool:
+    """
+    Whether the command line streams records from stdin or to stdout with
+    --input, or lint results to stdout with a --format other than text.
+    The daemon would keep the whole stream in memory to send it in a single
+    response, so those commands run in the client process.
+    """
+    formats = _option_values(args, "--format")
+    if formats and formats[-1] != "text":
+        return True
+
+    inputs = _option_values(args, "--input")
+    if not inputs:
+        return False
+    outputs = _option_values(args, "--output") or ["-"]
+    return "-" in inputs or "-" in outputs
+
+
+def watches_files(args: List[str]) -> bool:
+    """
+    Whether the command line lints the files again when they change with
+    --watch. It runs until interrupted, so it would block the daemon and
+    its output would never be sent.
+    """
+    flags = [arg for arg in args if arg in ("--watch", "--no-watch")]
+    return bool(flags) and flags[-1] == "--watch"
+
+
+def forward(args: List[str], socket_path: str) -> Optional[int]:
+    """
+    Run the command line args in the daemon listening on socket_path, write
+    its output to stdout and stderr and return the exit code.
+
+    None is returned when the command has to run in this process: it is
+    not forwarded, it streams records or lint results from stdin or to
+    stdout, it watches files or the daemon is not running.
+    """
+    if (
+        not args
+        or args[0] not in FORWARDED_COMMANDS
+        or streams_stdio(args)
+        or watches_files(args)
+    ):
+        return None
+
+    env = dict(os.environ)
+    if sys.stdout.isatty():
+        # the daemon renders for a terminal as wide as this one
+        env.setdefault("COLUMNS", str(shutil.get_terminal_size().columns))
+    request = {"args": args, "cwd": os.getcwd(), "env": env}
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile(mode="rb") as stream:
+                response = json.loads(stream.readline())
+    except (FileNotFoundError, ConnectionError, json.JSONDecodeError):
+        return None
+
+    sys.stdout.buffer.write(base64.b64decode(response["stdout"]))
+    sys.stdout.flush()
+    sys.stderr.buffer.write(base64.b64decode(response["stderr"]))
+    sys.stderr.flush()
+    return response["exit_code"]
+
+
+@contextlib.contextmanager
+def _client_context(cwd: str, env: Dict[str, str]) -> Iterator[None]:
+    """Run the block in the working directory and environment of a client."""
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+
+def run(command: Any, args: List[str]) -> Dict[str, Any]:
+    """Run a click command with args capturing its output and exit code."""
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+    stderr = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            command.main(args=args, prog_name="dc-avro")
+            exit_code = 0
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                exit_code = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                exit_code = 1
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+
+    return {
+        "exit_code": exit_code,
+        "stdout": _captured(stdout),
+        "stderr": _captured(stderr),
+    }
+
+
+def _captured(stream: io.TextIOWrapper) -> str:
+    # detach, so the BytesIO is not closed with the wrapper
+    buffer: io.BytesIO = stream.detach()  # type: ignore
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        with _client_context(request["cwd"], request["env"]):
+            response = run(self.server.command, request["args"])
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str, command: Any) -> None:
+        """
+        Server that runs the command lines sent by `forward` with command,
+        the click command of the CLI, one at a time.
+
+        Requests change the working directory and the environment of the
+        process, so they are not handled concurrently.
+        """
+        self.command = command
+        _remove_stale_socket(socket_path)
+        # only the user running the daemon can connect to it
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.server_address)  # type: ignore
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise DaemonError(f"{socket_path} exists and it is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except ConnectionError:
+            # left behind by a daemon that did not stop cleanly
+            os.unlink(socket_path)
+            return
+    raise DaemonError(f"A daemon is already listening on {socket_path}")
+
+
+def warm_up() -> None:
+    import importlib
+
+    for module in WARM_MODULES:
+        importlib.import_module(module)
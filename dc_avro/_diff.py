@@ -1,20 +1,39 @@
 import difflib
+import functools
+import itertools
+import json
 from dataclasses import dataclass
-from enum import Enum
-from typing import Dict, NamedTuple, Optional, Sequence
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from rich.style import Style
 from rich.table import Table
 from rich.text import Text
 
+from . import _schema_utils
+from ._named_types import NAMED_TYPES
+from ._types import JsonDict
+
 DELETE_COLOR = "red"
 ADD_COLOR = "green"
+CHANGE_COLOR = "yellow"
 
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
 
-class DiffTypes(str, Enum):
-    TABLE = "table"
-    CONTEXT = "context"
-    UNIFIED = "unified"
+# keys compared by the semantic diff of every type instead of as attributes
+STRUCTURE_KEYS = ("type", "name", "fields", "symbols", "items", "values", "doc")
 
 
 @dataclass
@@ -24,7 +43,17 @@ class Content:
 
     @property
     def diff_format(self) -> str:
-        return f"{self.line_number} {self.sequence}".replace("\t", "").replace("\n", "")
+        return _diff_format(self.line_number, self.sequence)
+
+
+def _diff_format(line_number: Any, sequence: str) -> str:
+    return f"{line_number} {sequence}".replace("\t", "").replace("\n", "")
+
+
+@functools.lru_cache(maxsize=None)
+def _style(style: Tuple[Tuple[str, str], ...]) -> Style:
+    """Style shared by all the cells with the same style."""
+    return Style(**dict(style))  # type: ignore
 
 
 class DiffLine(NamedTuple):
@@ -40,6 +69,8 @@ class TableDiff:
         source_name: str,
         target_name: str,
         only_deltas: bool = False,
+        show_header: bool = True,
+        expand: bool = False,
     ) -> None:
         """
         Class to create a table with the differences between two resources.
@@ -51,10 +82,17 @@ class TableDiff:
             only_deltas (bool, optional): Whether to include only deltas.
                 If set to True then only deltas are included rather than the
                 whole resource in the diff result. Default to False.
+            show_header (bool, optional): Whether to show the column names.
+            expand (bool, optional): Whether to use the whole console width.
         """
-        self.table = Table(title=title, highlight=True)
-        self.table.add_column(source_name)
-        self.table.add_column(target_name)
+        self.table = Table(
+            title=title, highlight=True, show_header=show_header, expand=expand
+        )
+        # with expand both columns take half of the width, so consecutive
+        # tables of the same diff are aligned
+        ratio = 1 if expand else None
+        self.table.add_column(source_name, ratio=ratio)
+        self.table.add_column(target_name, ratio=ratio)
         self.only_deltas = only_deltas
 
     def add_content(self, diff_line: DiffLine) -> None:
@@ -84,10 +122,29 @@ class TableDiff:
                 ),
             )
 
+    def add_line(
+        self, line_one: Tuple[Any, str], line_two: Tuple[Any, str], has_diff: bool
+    ) -> None:
+        """
+        Same as add_content for a line of difflib._mdiff, without building
+        the intermediate Content and DiffLine objects.
+        """
+        source_text = _diff_format(*line_one)
+        target_text = _diff_format(*line_two)
+        if has_diff:
+            self.table.add_row(
+                Text(source_text, style=_style((("color", DELETE_COLOR),))),
+                Text(target_text, style=_style((("color", ADD_COLOR),))),
+            )
+        else:
+            self.table.add_row(
+                Text(source_text, style=_style(())), Text(target_text, style=_style(()))
+            )
+
     @staticmethod
     def build_text(text: str, style: Optional[Dict[str, str]] = None) -> Text:
         style = style or {}
-        return Text(text=text, style=Style(**style))  # type: ignore
+        return Text(text=text, style=_style(tuple(sorted(style.items()))))
 
     def add_row(
         self, *, source_colum: Text, target_column: Text, style: Optional[str] = None
@@ -150,6 +207,22 @@ def context_diff(
     return "".join(diff)
 
 
+def _table_diff_lines(
+    source_resource: Sequence[str],
+    target_resource: Sequence[str],
+    only_deltas: bool,
+    num_lines: int,
+) -> Iterator[Tuple[Tuple[Any, str], Tuple[Any, str], bool]]:
+    if only_deltas and num_lines >= 0:
+        context_lines = num_lines
+    else:
+        context_lines = None
+
+    diff = difflib._mdiff(source_resource, target_resource, context=context_lines)  # type: ignore
+    # the lines with None separate the groups of context lines
+    return (line for line in diff if None not in line)
+
+
 def table_diff(
     *,
     source_resource: Sequence[str],
@@ -165,20 +238,279 @@ def table_diff(
         target_name=target_name,
     )
 
-    if only_deltas and num_lines >= 0:
-        context_lines = num_lines
-    else:
-        context_lines = None
+    for line in _table_diff_lines(
+        source_resource, target_resource, only_deltas, num_lines
+    ):
+        table_diff.add_line(*line)
+    return table_diff.table
 
-    diff = difflib._mdiff(source_resource, target_resource, context=context_lines)  # type: ignore
 
-    for line in diff:
-        if None not in line:
-            content_one, content_two, has_diff = line
-            diff_line = DiffLine(
-                content_one=Content(content_one[0], sequence=content_one[1]),
-                content_two=Content(content_two[0], sequence=content_two[1]),
-                has_diff=has_diff,
+def iter_table_diff(
+    *,
+    source_resource: Sequence[str],
+    target_resource: Sequence[str],
+    source_name: str,
+    target_name: str,
+    only_deltas: bool = False,
+    num_lines: int = 5,
+    page_size: int = 1000,
+) -> Iterator[Table]:
+    """
+    Same diff as table_diff split in tables of page_size rows, created as they
+    are rendered, so the first rows of huge diffs are shown right away and
+    only one page is kept in memory.
+
+    The tables use the whole console width, so their columns are aligned,
+    and only the first one has the title and the column names.
+    """
+    lines = _table_diff_lines(source_resource, target_resource, only_deltas, num_lines)
+    first = True
+    while True:
+        page = list(itertools.islice(lines, page_size))
+        if not page and not first:
+            return
+
+        table_diff = TableDiff(
+            title="Schema Diff" if first else "",
+            source_name=source_name,
+            target_name=target_name,
+            show_header=first,
+            expand=True,
+        )
+        for line in page:
+            table_diff.add_line(*line)
+        yield table_diff.table
+        first = False
+
+
+class Change(NamedTuple):
+    # added, removed or changed
+    kind: str
+    # dotted path of the changed element, e.g. `com.example.User.address.street`
+    path: str
+    source: Any = None
+    target: Any = None
+
+
+def _type_key(schema: Any) -> str:
+    """Name of a named type, type of the rest of types."""
+    if isinstance(schema, str):
+        return schema
+    if isinstance(schema, list):
+        return "union"
+    if schema["type"] in NAMED_TYPES:
+        return schema["name"]
+    return schema["type"]
+
+
+class SemanticDiff:
+    def __init__(
+        self, source_names: Dict[str, Any], target_names: Dict[str, Any]
+    ) -> None:
+        """
+        Diff of the avro structure of two parsed schemas.
+
+        Fields, union branches and enum symbols are indexed by name, and every
+        pair of named types is compared once, so the diff takes linear time.
+
+        Args:
+            source_names (Dict[str, Any]): named types of the source schema
+            target_names (Dict[str, Any]): named types of the target schema
+        """
+        self.source_names = source_names
+        self.target_names = target_names
+        self.changes: List[Change] = []
+        self.seen: Set[Tuple[str, str]] = set()
+
+    def add(self, kind: str, path: str, source: Any = None, target: Any = None) -> None:
+        self.changes.append(Change(kind=kind, path=path, source=source, target=target))
+
+    def describe(self, schema: Any, names: Dict[str, Any]) -> str:
+        schema = names.get(schema, schema) if isinstance(schema, str) else schema
+        if isinstance(schema, list):
+            return " | ".join(self.describe(branch, names) for branch in schema)
+        return _type_key(schema)
+
+    def diff(self, path: str, source: Any, target: Any) -> None:
+        if isinstance(source, str):
+            source = self.source_names.get(source, {"type": source})
+        if isinstance(target, str):
+            target = self.target_names.get(target, {"type": target})
+
+        source_key, target_key = _type_key(source), _type_key(target)
+        if source_key != target_key and not _is_alias(source, target):
+            self.add(CHANGED, path, source_key, target_key)
+            return
+
+        if isinstance(source, list):
+            self.diff_union(path, source, target)
+            return
+
+        if source["type"] in NAMED_TYPES:
+            if (source_key, target_key) in self.seen:
+                return
+            self.seen.add((source_key, target_key))
+            if source_key != target_key:
+                self.add(CHANGED, f"{path}.name", source_key, target_key)
+
+        self.diff_attributes(path, source, target, exclude=STRUCTURE_KEYS)
+        if source["type"] in ("record", "error"):
+            self.diff_fields(path, source["fields"], target["fields"])
+        elif source["type"] == "enum":
+            self.diff_symbols(path, source["symbols"], target["symbols"])
+        elif source["type"] == "array":
+            self.diff(f"{path}.items", source["items"], target["items"])
+        elif source["type"] == "map":
+            self.diff(f"{path}.values", source["values"], target["values"])
+
+    def diff_attributes(
+        self, path: str, source: JsonDict, target: JsonDict, exclude: Iterable[str]
+    ) -> None:
+        """Diff defaults, aliases, logical types and the rest of attributes."""
+        for key in dict.fromkeys([*source, *target]):
+            if key in exclude or key.startswith("__"):
+                continue
+            if key not in target:
+                self.add(REMOVED, f"{path}.{key}", source=source[key])
+            elif key not in source:
+                self.add(ADDED, f"{path}.{key}", target=target[key])
+            elif source[key] != target[key]:
+                self.add(CHANGED, f"{path}.{key}", source[key], target[key])
+
+    def diff_fields(
+        self, path: str, source: List[JsonDict], target: List[JsonDict]
+    ) -> None:
+        target_fields = {field["name"]: field for field in target}
+        # renamed fields keep the old name as an alias
+        renamed_fields = {
+            alias: field for field in target for alias in field.get("aliases", ())
+        }
+
+        matched: Dict[str, str] = {}
+        for field in source:
+            field_path = f"{path}.{field['name']}"
+            other = target_fields.get(field["name"]) or renamed_fields.get(
+                field["name"]
             )
-            table_diff.add_content(diff_line=diff_line)
-    return table_diff.table
+            if other is None:
+                self.add(
+                    REMOVED,
+                    field_path,
+                    source=self.describe(field["type"], self.source_names),
+                )
+                continue
+
+            matched[other["name"]] = field["name"]
+            if other["name"] != field["name"]:
+                self.add(CHANGED, f"{field_path}.name", field["name"], other["name"])
+            self.diff_attributes(
+                field_path, field, other, exclude=("name", "type", "doc")
+            )
+            self.diff(field_path, field["type"], other["type"])
+
+        for field in target:
+            if field["name"] not in matched:
+                self.add(
+                    ADDED,
+                    f"{path}.{field['name']}",
+                    target=self.describe(field["type"], self.target_names),
+                )
+
+        target_order = [
+            matched[field["name"]] for field in target if field["name"] in matched
+        ]
+        matched_names = set(matched.values())
+        source_order = [
+            field["name"] for field in source if field["name"] in matched_names
+        ]
+        if source_order != target_order:
+            self.add(CHANGED, f"{path}.fields", source_order, target_order)
+
+    def diff_symbols(self, path: str, source: List[str], target: List[str]) -> None:
+        source_symbols, target_symbols = set(source), set(target)
+        for symbol in source:
+            if symbol not in target_symbols:
+                self.add(REMOVED, f"{path}.symbols", source=symbol)
+        for symbol in target:
+            if symbol not in source_symbols:
+                self.add(ADDED, f"{path}.symbols", target=symbol)
+
+        source_order = [symbol for symbol in source if symbol in target_symbols]
+        target_order = [symbol for symbol in target if symbol in source_symbols]
+        if source_order != target_order:
+            self.add(CHANGED, f"{path}.symbols", source_order, target_order)
+
+    def diff_union(self, path: str, source: List[Any], target: List[Any]) -> None:
+        source_branches = {
+            self.describe(branch, self.source_names): branch for branch in source
+        }
+        target_branches = {
+            self.describe(branch, self.target_names): branch for branch in target
+        }
+        for key, branch in source_branches.items():
+            if key not in target_branches:
+                self.add(REMOVED, f"{path}[{key}]", source=key)
+            else:
+                self.diff(f"{path}[{key}]", branch, target_branches[key])
+        for key in target_branches:
+            if key not in source_branches:
+                self.add(ADDED, f"{path}[{key}]", target=key)
+
+        # the first branch is the type of the default value
+        source_order = [key for key in source_branches if key in target_branches]
+        target_order = [key for key in target_branches if key in source_branches]
+        if source_order != target_order:
+            self.add(CHANGED, path, " | ".join(source_order), " | ".join(target_order))
+
+
+def _is_alias(source: Any, target: Any) -> bool:
+    """Whether target is the named type source renamed, keeping its name as alias."""
+    if not isinstance(source, dict) or not isinstance(target, dict):
+        return False
+    if source["type"] not in NAMED_TYPES or source["type"] != target["type"]:
+        return False
+    name = source["name"]
+    aliases = target.get("aliases", ())
+    return name in aliases or name.rsplit(".", 1)[-1] in aliases
+
+
+def semantic_diff(*, source_schema: JsonDict, target_schema: JsonDict) -> List[Change]:
+    """
+    Parse both schemas and return the changes of the avro structure, so
+    formatting and the order of the json keys are ignored.
+    """
+    source_names: Dict[str, Any] = {}
+    target_names: Dict[str, Any] = {}
+    source = _schema_utils.parse(schema=source_schema, named_schemas=source_names)
+    target = _schema_utils.parse(schema=target_schema, named_schemas=target_names)
+
+    diff = SemanticDiff(source_names=source_names, target_names=target_names)
+    diff.diff(_type_key(source), source, target)
+    return diff.changes
+
+
+def format_changes(changes: Sequence[Change]) -> Text:
+    if not changes:
+        return Text("No changes")
+
+    lines = []
+    for change in changes:
+        if change.kind == ADDED:
+            lines.append(
+                Text(f"+ {change.path}: {json.dumps(change.target)}", style=ADD_COLOR)
+            )
+        elif change.kind == REMOVED:
+            lines.append(
+                Text(
+                    f"- {change.path}: {json.dumps(change.source)}", style=DELETE_COLOR
+                )
+            )
+        else:
+            lines.append(
+                Text(
+                    f"~ {change.path}: {json.dumps(change.source)} -> "
+                    f"{json.dumps(change.target)}",
+                    style=CHANGE_COLOR,
+                )
+            )
+    return Text("\n").join(lines)
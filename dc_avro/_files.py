@@ -0,0 +1,215 @@
+import glob
+import os
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_INCLUDE = ("*.avsc",)
+IGNORE_FILE_NAME = ".gitignore"
+SKIP_DIRECTORIES = (".git",)
+
+
+def compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """
+    Compile a .gitignore style pattern to a regex matching relative paths
+    that use / as separator.
+
+    A pattern without a slash matches at any depth, otherwise it is anchored
+    to the base directory. `*` and `?` never match a slash while `**`
+    matches any number of directories.
+    """
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    regex = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            regex.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            regex.append(".*")
+            index += 2
+            continue
+
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[" and "]" in pattern[index + 2 :]:
+            end = pattern.index("]", index + 2)
+            chars = pattern[index + 1 : end]
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            chars = chars.replace("\\", "\\\\")
+            regex.append(f"[{chars}]")
+            index = end
+        else:
+            regex.append(re.escape(char))
+        index += 1
+
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(prefix + "".join(regex))
+
+
+class IgnoreRule(NamedTuple):
+    regex: "re.Pattern[str]"
+    negate: bool = False
+    directory_only: bool = False
+
+    @classmethod
+    def from_pattern(cls, pattern: str) -> "IgnoreRule":
+        negate = pattern.startswith("!")
+        if negate:
+            pattern = pattern[1:]
+        directory_only = pattern.endswith("/")
+        return cls(
+            regex=compile_pattern(pattern.rstrip("/")),
+            negate=negate,
+            directory_only=directory_only,
+        )
+
+
+def read_ignore_file(path: str) -> List[IgnoreRule]:
+    rules = []
+    with open(path, mode="r") as ignore_file:
+        for line in ignore_file:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            rules.append(IgnoreRule.from_pattern(line))
+    return rules
+
+
+# Rules defined in an ignore file together with the directory, relative to
+# the walked root, where the file lives
+IgnoreLayer = Tuple[str, List[IgnoreRule]]
+
+
+def is_ignored(relative_path: str, is_dir: bool, layers: Sequence[IgnoreLayer]) -> bool:
+    """
+    Evaluate the ignore rules in order, the last rule that matches the path
+    decides whether it is ignored, like git does.
+    """
+    ignored = False
+    for base, rules in layers:
+        if base:
+            if not relative_path.startswith(base + "/"):
+                continue
+            path = relative_path[len(base) + 1 :]
+        else:
+            path = relative_path
+
+        for rule in rules:
+            if rule.directory_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(path):
+                ignored = not rule.negate
+    return ignored
+
+
+def matches_any(relative_path: str, patterns: Sequence["re.Pattern[str]"]) -> bool:
+    return any(pattern.fullmatch(relative_path) for pattern in patterns)
+
+
+def walk(
+    root: str,
+    include: Sequence["re.Pattern[str]"],
+    exclude: Sequence[IgnoreRule],
+    use_ignore_files: bool = True,
+) -> Iterator[str]:
+    """
+    Lazily walk root with os.scandir yielding the files that match include.
+
+    Directories are visited depth first and their entries sorted by name so
+    the order is stable, but only one directory is listed at a time: files
+    are yielded as soon as they are discovered.
+    """
+    exclude_layers: List[IgnoreLayer] = [("", list(exclude))]
+    stack: List[Tuple[str, str, List[IgnoreLayer]]] = [(root, "", [])]
+
+    def skip(relative_path: str, is_dir: bool, layers: List[IgnoreLayer]) -> bool:
+        return is_ignored(relative_path, is_dir, exclude_layers) or is_ignored(
+            relative_path, is_dir, layers
+        )
+
+    while stack:
+        directory, relative_directory, layers = stack.pop()
+
+        ignore_file = os.path.join(directory, IGNORE_FILE_NAME)
+        if use_ignore_files and os.path.isfile(ignore_file):
+            layers = [*layers, (relative_directory, read_ignore_file(ignore_file))]
+
+        with os.scandir(directory) as entries:
+            sorted_entries = sorted(entries, key=lambda entry: entry.name)
+
+        subdirectories = []
+        for entry in sorted_entries:
+            relative_path = (
+                f"{relative_directory}/{entry.name}"
+                if relative_directory
+                else entry.name
+            )
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in SKIP_DIRECTORIES or skip(relative_path, True, layers):
+                    continue
+                subdirectories.append((entry.path, relative_path, layers))
+            elif matches_any(relative_path, include) and not skip(
+                relative_path, False, layers
+            ):
+                yield entry.path
+
+        stack.extend(reversed(subdirectories))
+
+
+def is_excluded(path: str, layers: Sequence[IgnoreLayer]) -> bool:
+    """
+    Whether a file given by path, instead of found by walking a directory,
+    is excluded. Its parent directories are checked first, like `walk`
+    does, so directory rules exclude the files inside them.
+    """
+    parts = [part for part in path.replace(os.sep, "/").split("/") if part != "."]
+    for index in range(1, len(parts)):
+        if parts[index - 1] and is_ignored("/".join(parts[:index]), True, layers):
+            return True
+    return is_ignored("/".join(parts), False, layers)
+
+
+def iter_schema_files(
+    paths: Iterable[str],
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    use_ignore_files: bool = True,
+) -> Iterator[str]:
+    """
+    Expand files, directories and glob patterns to schema files.
+
+    Args:
+        paths (Iterable[str]): files, directories or glob patterns
+        include (Sequence[str], optional): patterns that the files found in
+            directories must match. Default to `*.avsc`
+        exclude (Sequence[str], optional): patterns of files and directories
+            to skip. Default to None
+        use_ignore_files (bool, optional): Whether to honor the .gitignore
+            files found while walking directories. Default to True
+    """
+    include_patterns = [
+        compile_pattern(pattern) for pattern in include or DEFAULT_INCLUDE
+    ]
+    exclude_rules = [IgnoreRule.from_pattern(pattern) for pattern in exclude or ()]
+    exclude_layers: List[IgnoreLayer] = [("", exclude_rules)]
+
+    for path in paths:
+        if glob.has_magic(path):
+            for match in glob.iglob(path, recursive=True):
+                if os.path.isfile(match) and not is_excluded(match, exclude_layers):
+                    yield match
+        elif os.path.isdir(path):
+            yield from walk(
+                path,
+                include=include_patterns,
+                exclude=exclude_rules,
+                use_ignore_files=use_ignore_files,
+            )
+        elif not is_excluded(path, exclude_layers):
+            yield path
@@ -0,0 +1,226 @@
+import contextlib
+import os
+import random
+import shutil
+import tempfile
+import uuid
+from typing import IO, Callable, Iterator, List, NamedTuple, Optional
+
+from fastavro.types import Schema
+
+from . import _container, _schema_utils, _stream
+from ._types import DataFormat
+
+
+class _SeededUUID:
+    """
+    Replacement of the uuid module used by fastavro, so the generated uuids
+    come from the seeded `random` module instead of os.urandom.
+    """
+
+    UUID = uuid.UUID
+
+    @staticmethod
+    def uuid4() -> uuid.UUID:
+        return uuid.UUID(int=random.getrandbits(128), version=4)
+
+
+@contextlib.contextmanager
+def seeded(seed: Optional[int]) -> Iterator[None]:
+    """Make the data generated inside the block reproducible for a seed."""
+    if seed is None:
+        yield
+        return
+
+    import fastavro.utils
+
+    state = random.getstate()
+    random.seed(seed)
+    fastavro.utils.uuid = _SeededUUID  # type: ignore
+    try:
+        yield
+    finally:
+        fastavro.utils.uuid = uuid  # type: ignore
+        random.setstate(state)
+
+
+def derive_seed(seed: int, shard: int) -> int:
+    """Return the seed of a shard, independent of the seeds of other shards."""
+    return random.Random(f"{seed}:{shard}").getrandbits(64)
+
+
+def sync_marker(seed: Optional[int]) -> bytes:
+    """Container files written with the same seed share the sync marker."""
+    if seed is None:
+        return os.urandom(_container.SYNC_SIZE)
+    return random.Random(seed).randbytes(_container.SYNC_SIZE)
+
+
+def worker_count(jobs: int) -> int:
+    """Number of worker processes for jobs, 0 means one per CPU."""
+    return jobs or os.cpu_count() or 1
+
+
+def shard_counts(count: int, shards: int) -> List[int]:
+    """Split count in shards, the first shards get the remainder."""
+    size, remainder = divmod(count, shards)
+    return [size + (shard < remainder) for shard in range(shards)]
+
+
+class Shard(NamedTuple):
+    path: str
+    schema: Schema
+    # number of records of the shard
+    records: int
+    seed: Optional[int]
+    output_format: DataFormat
+    codec: str
+    sync_marker: bytes
+
+
+def write_data(
+    output: IO[bytes],
+    schema: Schema,
+    count: int,
+    seed: Optional[int] = None,
+    output_format: DataFormat = DataFormat.NDJSON,
+    codec: str = "null",
+    sync_marker: Optional[bytes] = None,
+) -> int:
+    """Generate count records and write them to output."""
+    with seeded(seed):
+        return _stream.write_records(
+            output=output,
+            schema=schema,
+            records=_schema_utils.iter_data(schema=schema, count=count),
+            output_format=output_format,
+            codec=codec,
+            sync_marker=sync_marker,
+        )
+
+
+def write_shard(shard: Shard) -> int:
+    with open(shard.path, mode="wb") as output:
+        return write_data(
+            output,
+            shard.schema,
+            shard.records,
+            seed=shard.seed,
+            output_format=shard.output_format,
+            codec=shard.codec,
+            sync_marker=shard.sync_marker,
+        )
+
+
+def generate_shards(
+    *,
+    paths: List[str],
+    schema: Schema,
+    count: int,
+    seed: Optional[int] = None,
+    output_format: DataFormat = DataFormat.NDJSON,
+    codec: str = "null",
+) -> int:
+    """
+    Generate count records split in one file per path, using one worker
+    process per file, and return the number of records written.
+
+    Every shard is generated with a seed derived from seed, so the files
+    are the same byte for byte for the same seed and number of files.
+    """
+    marker = sync_marker(seed)
+    shards = [
+        Shard(
+            path=path,
+            schema=schema,
+            records=shard_count,
+            seed=None if seed is None else derive_seed(seed, index),
+            output_format=output_format,
+            codec=codec,
+            sync_marker=marker,
+        )
+        for index, (path, shard_count) in enumerate(
+            zip(paths, shard_counts(count, len(paths)))
+        )
+    ]
+
+    if len(shards) == 1:
+        return write_shard(shards[0])
+
+    import multiprocessing
+
+    with multiprocessing.Pool(processes=len(shards)) as pool:
+        return sum(pool.map(write_shard, shards, chunksize=1))
+
+
+def merge_shards(
+    output: IO[bytes], paths: List[str], output_format: DataFormat
+) -> None:
+    """
+    Concatenate the shard files into output. Container files share the
+    header and sync marker, so only the blocks of the next shards are copied.
+    """
+    for index, path in enumerate(paths):
+        with open(path, mode="rb") as shard:
+            if index and output_format == DataFormat.CONTAINER:
+                with _container.open_mapped(path) as buffer:
+                    shard.seek(_container.read_header(buffer).end)
+            shutil.copyfileobj(shard, output)
+
+
+def generate(
+    *,
+    output: IO[bytes],
+    schema: Schema,
+    count: int,
+    jobs: int = 1,
+    seed: Optional[int] = None,
+    output_format: DataFormat = DataFormat.NDJSON,
+    codec: str = "null",
+) -> int:
+    """
+    Generate count records with jobs worker processes, 0 for one per CPU,
+    and write them to output in shard order.
+
+    A single job writes straight to output, otherwise every worker writes
+    its shard to a temporary file and the files are merged.
+    """
+    jobs = worker_count(jobs)
+    if jobs == 1:
+        return write_data(
+            output,
+            schema,
+            count,
+            seed=None if seed is None else derive_seed(seed, 0),
+            output_format=output_format,
+            codec=codec,
+            sync_marker=sync_marker(seed),
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, str(shard)) for shard in range(jobs)]
+        total = generate_shards(
+            paths=paths,
+            schema=schema,
+            count=count,
+            seed=seed,
+            output_format=output_format,
+            codec=codec,
+        )
+        merge_shards(output, paths, output_format)
+    return total
+
+
+def message_batches(
+    schema: Schema, output_format: DataFormat, batch_size: int = _stream.BATCH_SIZE
+) -> Callable[[], List[bytes]]:
+    """Return a function that generates a batch of encoded messages."""
+    encode = _stream.message_encoder(schema, output_format)
+
+    def generate_batch() -> List[bytes]:
+        return [
+            encode(record)
+            for record in _schema_utils.iter_data(schema=schema, count=batch_size)
+        ]
+
+    return generate_batch
@@ -0,0 +1,140 @@
+import atexit
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from ._cache import CachedResponse, HttpCache, default_cache_dir
+
+try:
+    import h2  # type: ignore # noqa: F401
+except ImportError:
+    # h2 is not available, continue with HTTP/1.1
+    HTTP2 = False
+else:
+    HTTP2 = True
+
+_client: Optional[httpx.Client] = None
+_truststore_injected = False
+
+
+def inject_truststore() -> None:
+    """
+    Verify certificates with the system trust store, when truststore is
+    installed. It is done before the first client is created, instead of
+    on import, so the commands that do not use the network do not pay for it.
+    """
+    global _truststore_injected
+    if _truststore_injected:
+        return
+    _truststore_injected = True
+
+    try:
+        import truststore
+
+        truststore.inject_into_ssl()
+    except ImportError:
+        # truststore is not available, continue without it
+        ...
+
+
+def get_client() -> httpx.Client:
+    """
+    Return the client shared by every request of the process, so the
+    connections to the same host are kept alive and reused.
+    """
+    global _client
+    if _client is None:
+        inject_truststore()
+        _client = httpx.Client(http2=HTTP2, follow_redirects=True)
+        atexit.register(_client.close)
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return a new async client, closed by the caller."""
+    inject_truststore()
+    return httpx.AsyncClient(http2=HTTP2, follow_redirects=True)
+
+
+def default_cache() -> HttpCache:
+    return HttpCache(default_cache_dir())
+
+
+def _conditional_headers(cached: Optional[CachedResponse]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _handle_response(
+    url: str,
+    response: httpx.Response,
+    cached: Optional[CachedResponse],
+    cache: Optional[HttpCache],
+) -> Tuple[httpx.Response, bool]:
+    """
+    Return the response, or the cached one when it was not modified, and
+    whether a new entry was stored in cache.
+    """
+    if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+        return httpx.Response(
+            status_code=httpx.codes.OK,
+            content=cached.content,
+            headers={"Content-Type": cached.content_type or "application/json"},
+            request=response.request,
+        ), False
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache is not None and response.is_success and (etag or last_modified):
+        cache.set(
+            url,
+            CachedResponse(
+                content=response.content,
+                content_type=response.headers.get("Content-Type"),
+                etag=etag,
+                last_modified=last_modified,
+            ),
+        )
+        return response, True
+    return response, False
+
+
+def get(
+    url: str,
+    *,
+    client: Optional[httpx.Client] = None,
+    cache: Optional[HttpCache] = None,
+) -> httpx.Response:
+    """
+    GET url with the shared client.
+
+    When a cache is provided, responses with an ETag or a Last-Modified
+    header are cached on disk and the next requests for url are conditional:
+    when the server answers `304 Not Modified` the cached content is returned.
+    """
+    client = client or get_client()
+
+    cached = cache.get(url) if cache is not None else None
+    response = client.get(url, headers=_conditional_headers(cached))
+    response, stored = _handle_response(url, response, cached, cache)
+    if stored and cache is not None:
+        cache.prune()
+    return response
+
+
+async def async_get(
+    url: str, *, client: httpx.AsyncClient, cache: Optional[HttpCache] = None
+) -> httpx.Response:
+    """
+    Same as `get` using an async client. The cache is not pruned, so the
+    caller can prune it once after many requests.
+    """
+    cached = cache.get(url) if cache is not None else None
+    response = await client.get(url, headers=_conditional_headers(cached))
+    response, _ = _handle_response(url, response, cached, cache)
+    return response
@@ -0,0 +1,170 @@
+import functools
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from urllib.parse import quote
+
+from . import _cache, _named_types, _schema_utils
+from ._cache import HttpCache, ValidationCache
+from .exceptions import InvalidSchema, JsonRequired
+
+# Number of paths sent to a worker process per task. Big enough to amortize
+# the inter process communication, small enough to keep results streaming.
+CHUNKSIZE = 16
+
+
+class LintResult(NamedTuple):
+    path: str
+    error: Optional[Exception] = None
+    cached: bool = False
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+
+def lint_file(path: str, cache: Optional[ValidationCache] = None) -> LintResult:
+    """
+    Read, parse and validate the schema stored in path.
+
+    When a cache is provided and the file content was already linted,
+    the stored outcome is returned without parsing the schema.
+    """
+    with open(path, mode="rb") as resource:
+        content = resource.read()
+    return lint_content(path, content, cache=cache)
+
+
+def lint_content(
+    path: str, content: bytes, cache: Optional[ValidationCache] = None
+) -> LintResult:
+    """Parse and validate the schema content read from path."""
+    if cache is None:
+        return LintResult(path=path, error=_lint_content(path, content))
+
+    key = cache.key(content)
+    outcome = cache.get(key)
+    if outcome is not None:
+        return LintResult(
+            path=path, error=_cache.error_from_outcome(outcome), cached=True
+        )
+
+    error = _lint_content(path, content)
+    cache.set(key, _cache.outcome_from_error(error))
+    return LintResult(path=path, error=error)
+
+
+def _lint_content(path: str, content: bytes) -> Optional[Exception]:
+    try:
+        schema = _schema_utils.load_resource(content, name=path)
+        _schema_utils.validate(schema=schema)
+    except (JsonRequired, InvalidSchema) as exc:
+        return exc
+    return None
+
+
+def lint_files(
+    files: Iterable[str], jobs: int = 1, cache: Optional[ValidationCache] = None
+) -> Iterator[LintResult]:
+    """
+    Lint files yielding one result per file, in the same order as files.
+
+    Args:
+        files (Iterable[str]): paths to the schemas to lint
+        jobs (int, optional): Number of worker processes. With 1 the files
+            are linted in the current process, with 0 one worker per CPU
+            is used. Default to 1.
+        cache (ValidationCache, optional): cache used to skip the files
+            that did not change since they were linted. Default to None.
+    """
+    if jobs == 1:
+        for path in files:
+            yield lint_file(path, cache=cache)
+        return
+
+    import multiprocessing
+
+    with multiprocessing.Pool(processes=jobs or None) as pool:
+        yield from pool.imap(
+            functools.partial(lint_file, cache=cache), files, chunksize=CHUNKSIZE
+        )
+
+
+def lint_files_with_references(files: Iterable[str]) -> Iterator[LintResult]:
+    """
+    Lint files resolving the named types that they reference across files.
+
+    All the files are read first so the named types they define can be
+    registered, then every file is parsed once, after the files it depends
+    on. Results are yielded in the same order as files.
+    """
+    registry, paths = _named_types.load_registry(files)
+    errors = registry.resolve()
+    for path in paths:
+        yield LintResult(path=path, error=errors[path])
+
+
+async def _lint_urls(
+    urls: List[str],
+    concurrency: int,
+    cache: Optional[ValidationCache],
+    http_cache: Optional[HttpCache],
+) -> List[LintResult]:
+    import asyncio
+
+    import httpx
+
+    from . import _http
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with _http.get_async_client() as client:
+
+        async def lint_url(url: str) -> LintResult:
+            async with semaphore:
+                try:
+                    response = await _http.async_get(
+                        url, client=client, cache=http_cache
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as exc:
+                    return LintResult(path=url, error=exc)
+            # the schema is validated while the other requests are in flight
+            return lint_content(url, response.content, cache=cache)
+
+        results = await asyncio.gather(*(lint_url(url) for url in urls))
+
+    if http_cache is not None:
+        http_cache.prune()
+    return results
+
+
+def lint_urls(
+    urls: Iterable[str],
+    concurrency: int = 16,
+    cache: Optional[ValidationCache] = None,
+    http_cache: Optional[HttpCache] = None,
+) -> Iterator[LintResult]:
+    """
+    Fetch the schemas from urls concurrently, with at most concurrency
+    requests in flight, and lint them. Results are yielded in the same order
+    as urls. The responses are cached in http_cache, when provided.
+    """
+    import asyncio
+
+    urls = list(urls)
+    if urls:
+        yield from asyncio.run(_lint_urls(urls, concurrency, cache, http_cache))
+
+
+def registry_schema_urls(
+    registry_url: str, http_cache: Optional[HttpCache] = None
+) -> List[str]:
+    """Return the urls of the latest schema of every subject in a registry."""
+    from . import _http
+
+    registry_url = registry_url.rstrip("/")
+    response = _http.get(f"{registry_url}/subjects", cache=http_cache)
+    response.raise_for_status()
+    return [
+        f"{registry_url}/subjects/{quote(subject, safe='')}/versions/latest/schema"
+        for subject in response.json()
+    ]
@@ -0,0 +1,682 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from . import _schema_utils
+from ._cache import _package_version
+from ._named_types import PRIMITIVE_TYPES, get_fullname
+from ._types import JsonDict, ModelType
+from .exceptions import InvalidSchema, JsonRequired
+
+# Module, at the root of the package, with the named types used by more than
+# one schema
+COMMON_MODULE = "common"
+MANIFEST_NAME = ".dc-avro-models.json"
+# Bumped when the format of the manifest changes
+MANIFEST_VERSION = 2
+# Named types that are rendered as classes. Fixed types are rendered as type
+# hints, so they stay inside the type that defines them
+CLASS_TYPES = frozenset(("record", "error", "enum"))
+
+
+def module_name(name: str) -> str:
+    """Python identifier for a file or directory name."""
+    name = re.sub(r"\W", "_", name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def module_path(relative_path: str) -> str:
+    """Path of the module, relative to the package, of a schema file."""
+    parts = relative_path.replace(os.sep, "/").split("/")
+    stem = os.path.splitext(parts[-1])[0]
+    return "/".join([*map(module_name, parts[:-1]), module_name(stem) + ".py"])
+
+
+def _reference(fullname: str, namespace: str, enclosing_namespace: str) -> str:
+    if namespace and namespace == enclosing_namespace:
+        return fullname.rsplit(".", 1)[-1]
+    return fullname
+
+
+class FlatSchema(NamedTuple):
+    # schema, or a reference to the root named type, where the named types
+    # are replaced by references to them
+    root: Any
+    # fullname -> definition of the named types, with their named types
+    # replaced by references
+    definitions: Dict[str, JsonDict]
+    # fullname -> namespace of the named types
+    namespaces: Dict[str, str]
+    # fullname -> fullnames of the named types that the definition references
+    dependencies: Dict[str, Set[str]]
+    # fullnames of the named types that the root references
+    references: Set[str]
+
+
+def flatten(schema: Any) -> FlatSchema:
+    """
+    Split the named types that schema defines inline, so they can be
+    rendered in a different module than the schema that uses them.
+    """
+    flat = FlatSchema(None, {}, {}, {}, set())
+
+    def walk(item: Any, namespace: str, references: Set[str]) -> Any:
+        if isinstance(item, list):
+            return [walk(branch, namespace, references) for branch in item]
+        if isinstance(item, str):
+            if item not in PRIMITIVE_TYPES:
+                references.add(get_fullname(item, namespace))
+            return item
+        if not isinstance(item, dict):
+            return item
+
+        schema_type = item.get("type")
+        if schema_type in CLASS_TYPES and isinstance(item.get("name"), str):
+            name = item["name"]
+            if "." in name:
+                item_namespace = name.rsplit(".", 1)[0]
+            else:
+                item_namespace = item.get("namespace", namespace)
+            fullname = get_fullname(name, item_namespace)
+            item_references: Set[str] = set()
+            definition = dict(item)
+            if isinstance(item.get("fields"), list):
+                definition["fields"] = [
+                    {
+                        **field,
+                        "type": walk(field["type"], item_namespace, item_references),
+                    }
+                    if isinstance(field, dict) and "type" in field
+                    else field
+                    for field in item["fields"]
+                ]
+            flat.definitions.setdefault(fullname, definition)
+            flat.namespaces.setdefault(fullname, item_namespace)
+            flat.dependencies.setdefault(fullname, item_references - {fullname})
+            references.add(fullname)
+            return _reference(fullname, item_namespace, namespace)
+
+        if schema_type in ("record", "error", "enum", "fixed"):
+            # a fixed, or an invalid named type, stays where it is
+            return item
+        if schema_type == "array" and "items" in item:
+            return {**item, "items": walk(item["items"], namespace, references)}
+        if schema_type == "map" and "values" in item:
+            return {**item, "values": walk(item["values"], namespace, references)}
+        if schema_type is not None:
+            return {**item, "type": walk(schema_type, namespace, references)}
+        return item
+
+    return flat._replace(root=walk(schema, "", flat.references))
+
+
+def placed(definition: JsonDict, namespace: str, enclosing_namespace: str) -> JsonDict:
+    """Definition that keeps its namespace when it is moved."""
+    if (
+        namespace != enclosing_namespace
+        and "namespace" not in definition
+        and "." not in definition["name"]
+    ):
+        return {**definition, "namespace": namespace}
+    return definition
+
+
+def class_name(fullname: str) -> str:
+    import casefy
+
+    return casefy.pascalcase(fullname.rsplit(".", 1)[-1])
+
+
+class ModelModule(NamedTuple):
+    # path of the module relative to the package
+    path: str
+    # schemas rendered in the module
+    schemas: List[Any]
+    # classes imported from the common module
+    imports: List[str]
+    # fullnames of the shared named types that the module defines or imports
+    named_types: List[str]
+    # definitions of the imported named types and the ones they depend on,
+    # in the common module order, so the schemas can be parsed on their own
+    references: List[JsonDict]
+
+    def key(self, salt: str) -> str:
+        """Hash of everything the content of the module depends on."""
+        content = json.dumps([salt, self.schemas, self.imports], sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+
+def generator_salt(model_type: ModelType) -> str:
+    """Part of the module keys that changes with the rendered code."""
+    version = _package_version("dataclasses-avroschema")
+    return f"{model_type.value};dataclasses-avroschema={version}"
+
+
+class _Planner:
+    def __init__(self) -> None:
+        self.flat: Dict[str, FlatSchema] = {}
+        self.errors: Dict[str, Exception] = {}
+        # fullname -> files that define the named type
+        self.definers: Dict[str, List[str]] = {}
+        # fullname -> canonical json of the different definitions of the type
+        self.variants: Dict[str, Set[str]] = {}
+
+    def add(self, path: str, schema: Any) -> None:
+        flat = flatten(schema)
+        self.flat[path] = flat
+        for name, definition in flat.definitions.items():
+            self.definers.setdefault(name, []).append(path)
+            self.variants.setdefault(name, set()).add(
+                _schema_utils.canonical_json(
+                    placed(definition, flat.namespaces[name], "")
+                )
+            )
+
+    def shared_names(self) -> Set[str]:
+        """
+        Named types defined by more than one file or used by files that do
+        not define them, together with the named types they depend on.
+
+        Named types defined differently by several files, for instance by
+        two versions of a schema, are kept in the modules of those files,
+        like the shared types that depend on them.
+        """
+        shared = {name for name, definers in self.definers.items() if len(definers) > 1}
+        for flat in self.flat.values():
+            used = set(flat.references)
+            for dependencies in flat.dependencies.values():
+                used.update(dependencies)
+            shared.update(
+                name
+                for name in used
+                if name not in flat.definitions and name in self.definers
+            )
+
+        pending = list(shared)
+        while pending:
+            for dependency in self.definition(pending.pop())[2]:
+                if dependency in self.definers and dependency not in shared:
+                    shared.add(dependency)
+                    pending.append(dependency)
+
+        changed = True
+        while changed:
+            unshared = {
+                name
+                for name in shared
+                if len(self.variants[name]) > 1
+                or any(
+                    dependency in self.definers and dependency not in shared
+                    for dependency in self.definition(name)[2]
+                )
+            }
+            shared -= unshared
+            changed = bool(unshared)
+        return shared
+
+    def definition(self, name: str) -> Tuple[JsonDict, str, Set[str]]:
+        flat = self.flat[self.definers[name][0]]
+        return flat.definitions[name], flat.namespaces[name], flat.dependencies[name]
+
+    def common_order(self, shared: Set[str]) -> List[str]:
+        """Shared named types sorted so they come after their dependencies."""
+        order: List[str] = []
+        visited: Set[str] = set()
+
+        def visit(name: str) -> None:
+            visited.add(name)
+            for dependency in sorted(self.definition(name)[2]):
+                if dependency in shared and dependency not in visited:
+                    visit(dependency)
+            order.append(name)
+
+        for name in sorted(shared):
+            if name not in visited:
+                visit(name)
+        return order
+
+    def inline(
+        self, flat: FlatSchema, shared: Set[str], used: Set[str]
+    ) -> Optional[Any]:
+        """
+        Schema of a file with its own named types defined where they are
+        first used, and the shared ones, added to used, referenced.
+        """
+        defined: Set[str] = set()
+
+        def define(name: str, enclosing_namespace: str) -> JsonDict:
+            namespace = flat.namespaces[name]
+            definition = placed(flat.definitions[name], namespace, enclosing_namespace)
+            if not isinstance(definition.get("fields"), list):
+                return definition
+            fields = [
+                {**field, "type": walk(field["type"], namespace)}
+                if isinstance(field, dict) and "type" in field
+                else field
+                for field in definition["fields"]
+            ]
+            return {**definition, "fields": fields}
+
+        def walk(item: Any, namespace: str) -> Any:
+            if isinstance(item, list):
+                return [walk(branch, namespace) for branch in item]
+            if isinstance(item, str):
+                if item in PRIMITIVE_TYPES:
+                    return item
+                name = get_fullname(item, namespace)
+                if name in shared:
+                    used.add(name)
+                elif name in flat.definitions and name not in defined:
+                    defined.add(name)
+                    return define(name, namespace)
+                return item
+            if not isinstance(item, dict):
+                return item
+
+            schema_type = item.get("type")
+            if schema_type == "array" and "items" in item:
+                return {**item, "items": walk(item["items"], namespace)}
+            if schema_type == "map" and "values" in item:
+                return {**item, "values": walk(item["values"], namespace)}
+            if schema_type in ("record", "error", "enum", "fixed"):
+                return item
+            if schema_type is not None:
+                return {**item, "type": walk(schema_type, namespace)}
+            return item
+
+        root = walk(flat.root, "")
+        if isinstance(root, str) and get_fullname(root, "") in shared:
+            # the schema itself is shared, its module only imports it
+            return None
+        return root
+
+
+class ModulePlan(NamedTuple):
+    modules: List[ModelModule]
+    # schema path -> error
+    errors: Dict[str, Exception]
+    # fullname of the shared named types -> schemas that define them
+    definitions: Dict[str, List[str]]
+
+
+def plan_modules(files: Iterable[Tuple[str, str]]) -> ModulePlan:
+    """
+    Plan the modules of a package with the models of files, pairs of
+    schema path and module path.
+
+    The named types used by more than one schema are moved to the common
+    module and imported from it. The modules are returned with their schemas
+    validated, together with the errors of the files that are not valid.
+    """
+    planner = _Planner()
+    modules: Dict[str, str] = {}
+    for path, module in files:
+        try:
+            schema = _schema_utils.get_resource_from_path(path=path)
+        except JsonRequired as exc:
+            planner.errors[path] = exc
+            continue
+        if module in modules or module == f"{COMMON_MODULE}.py":
+            planner.errors[path] = InvalidSchema(
+                f"Module {module} of {path} is already used by "
+                f"{modules.get(module, 'the common named types')}"
+            )
+            continue
+        modules[module] = path
+        planner.add(path, schema)
+
+    shared = planner.shared_names()
+    named_schemas: Dict[str, Any] = {}
+    common_schemas = []
+    common_names = []
+    # fullname -> definition of the common named types
+    common: Dict[str, JsonDict] = {}
+    for name in planner.common_order(shared):
+        definition, namespace, _ = planner.definition(name)
+        schema = placed(definition, namespace, "")
+        try:
+            _schema_utils.validate(schema=schema, named_schemas=named_schemas)
+        except InvalidSchema as exc:
+            planner.errors.setdefault(planner.definers[name][0], exc)
+            continue
+        common_schemas.append(schema)
+        common_names.append(name)
+        common[name] = schema
+
+    result = []
+    if common_schemas:
+        result.append(
+            ModelModule(
+                f"{COMMON_MODULE}.py", common_schemas, [], sorted(common_names), []
+            )
+        )
+
+    for module, path in modules.items():
+        if path in planner.errors:
+            continue
+        used: Set[str] = set()
+        root = planner.inline(planner.flat[path], shared, used)
+        if root is None:
+            used.add(get_fullname(planner.flat[path].root, ""))
+        else:
+            try:
+                _schema_utils.validate(schema=root, named_schemas=dict(named_schemas))
+            except InvalidSchema as exc:
+                planner.errors[path] = exc
+                continue
+        result.append(
+            ModelModule(
+                module,
+                [] if root is None else [root],
+                sorted({class_name(name) for name in used}),
+                sorted(used),
+                references(used, common, planner),
+            )
+        )
+
+    definitions = {name: planner.definers[name] for name in common_names}
+    return ModulePlan(result, planner.errors, definitions)
+
+
+def references(
+    used: Set[str], common: Dict[str, JsonDict], planner: _Planner
+) -> List[JsonDict]:
+    """Definitions of the common named types in used and their dependencies."""
+    needed: Set[str] = set()
+    pending = [name for name in used if name in common]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(
+                dependency
+                for dependency in planner.definition(name)[2]
+                if dependency in common
+            )
+    return [schema for name, schema in common.items() if name in needed]
+
+
+def render(module: ModelModule, model_type: ModelType) -> str:
+    """Python code of module."""
+    lines = []
+    if module.imports:
+        package = "." * (module.path.count("/") + 1)
+        lines.append(
+            f"from {package}{COMMON_MODULE} import {', '.join(module.imports)}\n"
+        )
+    if module.schemas:
+        from dataclasses_avroschema import ModelGenerator
+
+        # the named types of the common module are known, not rendered again
+        named_schemas: Dict[str, Any] = {}
+        for reference in module.references:
+            _schema_utils.parse(schema=reference, named_schemas=named_schemas)
+        lines.append(
+            ModelGenerator().render_module(
+                schemas=module.schemas,
+                model_type=model_type.value,
+                named_schemas=named_schemas,
+            )
+        )
+    return "".join(lines)
+
+
+class RenderedModule(NamedTuple):
+    path: str
+    code: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+def render_module(task: Tuple[ModelModule, ModelType]) -> RenderedModule:
+    module, model_type = task
+    try:
+        return RenderedModule(module.path, code=render(module, model_type))
+    except Exception as exc:
+        return RenderedModule(module.path, error=exc)
+
+
+def file_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, mode="rb") as content:
+            return hashlib.sha256(content.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class Manifest(NamedTuple):
+    """
+    Build manifest of a package, stored in it, so the next run can tell
+    what changed since the package was written.
+    """
+
+    # model type and generator version the modules were rendered with
+    salt: str
+    # schema path -> sha256 of the schema and path of its module
+    schemas: Dict[str, Tuple[str, str]]
+    # module path -> key of the module, sha256 of the module file and the
+    # shared named types it defines or imports
+    modules: Dict[str, Tuple[str, str, List[str]]]
+    # shared named type fullname -> schemas that define it. Together with
+    # the named types of the modules it is the dependency graph between the
+    # schemas and the modules
+    named_types: Dict[str, List[str]]
+    # schemas that could not be rendered
+    errors: List[str]
+
+    @classmethod
+    def empty(cls) -> "Manifest":
+        return cls(salt="", schemas={}, modules={}, named_types={}, errors=[])
+
+    @classmethod
+    def read(cls, output: str) -> "Manifest":
+        try:
+            with open(os.path.join(output, MANIFEST_NAME)) as manifest_file:
+                content = json.load(manifest_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            content = {}
+        if content.get("version") != MANIFEST_VERSION:
+            return cls.empty()
+        return cls(
+            salt=content["salt"],
+            schemas={
+                path: (schema_hash, module)
+                for path, (schema_hash, module) in content["schemas"].items()
+            },
+            modules={
+                path: (key, module_hash, named_types)
+                for path, (key, module_hash, named_types) in content["modules"].items()
+            },
+            named_types=content["named_types"],
+            errors=content["errors"],
+        )
+
+    def write(self, output: str) -> None:
+        os.makedirs(output, exist_ok=True)
+        with open(os.path.join(output, MANIFEST_NAME), mode="w") as manifest_file:
+            json.dump(
+                {"version": MANIFEST_VERSION, **self._asdict()},
+                manifest_file,
+                indent=2,
+                sort_keys=True,
+            )
+
+    def is_current(
+        self, salt: str, schemas: Dict[str, Tuple[str, str]], output: str
+    ) -> bool:
+        """
+        Whether the package is up to date: the schemas and the generator did
+        not change, and the modules are the ones that were written.
+        """
+        return (
+            not self.errors
+            and self.salt == salt
+            and self.schemas == schemas
+            and all(
+                file_hash(os.path.join(output, path)) == module_hash
+                for path, (_, module_hash, _) in self.modules.items()
+            )
+        )
+
+    def affected_modules(self, schemas: Dict[str, Tuple[str, str]]) -> Set[str]:
+        """
+        Modules of the schemas that changed since the manifest was written,
+        and the modules that use the shared named types they define.
+        """
+        changed = {
+            path
+            for path in set(schemas) | set(self.schemas)
+            if schemas.get(path) != self.schemas.get(path)
+        }
+        affected = {self.schemas[path][1] for path in changed if path in self.schemas}
+        affected.update(schemas[path][1] for path in changed if path in schemas)
+        names = {
+            name
+            for name, definers in self.named_types.items()
+            if changed.intersection(definers)
+        }
+        affected.update(
+            path
+            for path, (_, _, named_types) in self.modules.items()
+            if names.intersection(named_types)
+        )
+        return affected
+
+
+def write_module(output: str, path: str, code: str) -> None:
+    """Write a module creating the packages that contain it."""
+    directory = output
+    for part in path.split("/")[:-1]:
+        directory = os.path.join(directory, part)
+    os.makedirs(directory, exist_ok=True)
+
+    package = output
+    for part in ["", *path.split("/")[:-1]]:
+        package = os.path.join(package, part)
+        init = os.path.join(package, "__init__.py")
+        if not os.path.exists(init):
+            open(init, mode="w").close()
+
+    with open(os.path.join(output, path), mode="w") as module_file:
+        module_file.write(code)
+
+
+class GenerationResult(NamedTuple):
+    written: List[str]
+    unchanged: List[str]
+    removed: List[str]
+    # schema path or module path -> error
+    errors: Dict[str, Exception]
+
+
+def generate_package(
+    files: Iterable[Tuple[str, str]],
+    output: str,
+    model_type: ModelType = ModelType.DATACLASS,
+    jobs: int = 1,
+    incremental: bool = True,
+) -> GenerationResult:
+    """
+    Write the models of files, pairs of schema path and module path, as a
+    package in output.
+
+    With incremental, the manifest of the previous run is used to render
+    only the modules whose content changes and the modules that were
+    modified or deleted since they were written. When no schema changed
+    the schemas are not even parsed. The modules of the schemas that no
+    longer exist are removed. Modules are rendered by jobs worker
+    processes, 0 for one per CPU.
+    """
+    files = list(files)
+    salt = generator_salt(model_type)
+    schemas = {path: (file_hash(path) or "", module) for path, module in files}
+    previous = Manifest.read(output) if incremental else Manifest.empty()
+    if previous.is_current(salt, schemas, output):
+        return GenerationResult(
+            written=[], unchanged=sorted(previous.modules), removed=[], errors={}
+        )
+
+    modules, errors, definitions = plan_modules(files)
+    keys = {module.path: module.key(salt) for module in modules}
+    unchanged = [
+        module.path
+        for module in modules
+        if module.path in previous.modules
+        and previous.modules[module.path][0] == keys[module.path]
+        and previous.salt == salt
+        and file_hash(os.path.join(output, module.path))
+        == previous.modules[module.path][1]
+    ]
+    skipped = set(unchanged)
+    tasks = [(module, model_type) for module in modules if module.path not in skipped]
+
+    written = []
+    hashes = {path: previous.modules[path][1] for path in unchanged}
+    with contextlib.ExitStack() as stack:
+        if jobs == 1 or len(tasks) < 2:
+            rendered: Iterable[RenderedModule] = map(render_module, tasks)
+        else:
+            import multiprocessing
+
+            pool = stack.enter_context(multiprocessing.Pool(processes=jobs or None))
+            rendered = pool.imap_unordered(render_module, tasks)
+
+        for module in rendered:
+            if module.error is not None:
+                errors[module.path] = module.error
+                continue
+            code = module.code or ""
+            write_module(output, module.path, code)
+            written.append(module.path)
+            hashes[module.path] = hashlib.sha256(code.encode()).hexdigest()
+
+    removed = []
+    for path in sorted(set(previous.modules) - set(keys)):
+        if os.path.exists(os.path.join(output, path)):
+            os.remove(os.path.join(output, path))
+            removed.append(path)
+
+    Manifest(
+        salt=salt,
+        schemas=schemas,
+        modules={
+            module.path: (keys[module.path], hashes[module.path], module.named_types)
+            for module in modules
+            if module.path in hashes
+        },
+        named_types=definitions,
+        errors=sorted(errors),
+    ).write(output)
+    return GenerationResult(
+        written=sorted(written),
+        unchanged=unchanged,
+        removed=removed,
+        errors=errors,
+    )
+
+
+def affected_modules(
+    files: Iterable[Tuple[str, str]],
+    output: str,
+    model_type: ModelType = ModelType.DATACLASS,
+) -> List[str]:
+    """
+    Modules of the package in output affected by the changes since it was
+    written, without parsing the schemas: the modules of the schemas that
+    changed, the modules that use the shared named types those schemas
+    define and the modules that were modified or deleted.
+    """
+    schemas = {path: (file_hash(path) or "", module) for path, module in files}
+    manifest = Manifest.read(output)
+    if manifest.salt != generator_salt(model_type):
+        return sorted({module for _, module in schemas.values()})
+
+    affected = manifest.affected_modules(schemas)
+    affected.update(
+        path
+        for path, (_, module_hash, _) in manifest.modules.items()
+        if file_hash(os.path.join(output, path)) != module_hash
+    )
+    return sorted(affected)
@@ -0,0 +1,215 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import _schema_utils
+from ._types import JsonDict
+from .exceptions import InvalidSchema, JsonRequired
+
+PRIMITIVE_TYPES = frozenset(
+    ("null", "boolean", "int", "long", "float", "double", "bytes", "string")
+)
+NAMED_TYPES = frozenset(("record", "error", "enum", "fixed"))
+
+
+def get_fullname(name: str, namespace: str) -> str:
+    if "." in name or not namespace:
+        return name
+    return f"{namespace}.{name}"
+
+
+def collect_names(schema: Any, namespace: str = "") -> Tuple[Set[str], Set[str]]:
+    """
+    Return the fullnames of the named types that schema defines and the
+    fullnames of the named types that it references.
+    """
+    defined: Set[str] = set()
+    referenced: Set[str] = set()
+    pending: List[Tuple[Any, str]] = [(schema, namespace)]
+
+    while pending:
+        item, namespace = pending.pop()
+        if isinstance(item, list):
+            pending.extend((sub_item, namespace) for sub_item in item)
+        elif isinstance(item, str):
+            # named type keywords are invalid types, not references, so the
+            # schema is validated and gets the real error
+            if item not in PRIMITIVE_TYPES and item not in NAMED_TYPES:
+                referenced.add(get_fullname(item, namespace))
+        elif isinstance(item, dict):
+            schema_type = item.get("type")
+            if schema_type in NAMED_TYPES and isinstance(item.get("name"), str):
+                name = item["name"]
+                if "." in name:
+                    namespace = name.rsplit(".", 1)[0]
+                else:
+                    namespace = item.get("namespace", namespace)
+                defined.add(get_fullname(name, namespace))
+                pending.extend(
+                    (field.get("type"), namespace)
+                    for field in item.get("fields", [])
+                    if isinstance(field, dict)
+                )
+            elif schema_type in NAMED_TYPES:
+                # without a name, invalid
+                continue
+            elif schema_type == "array":
+                pending.append((item.get("items"), namespace))
+            elif schema_type == "map":
+                pending.append((item.get("values"), namespace))
+            else:
+                pending.append((schema_type, namespace))
+
+    return defined, referenced - defined
+
+
+class NamedTypeRegistry:
+    def __init__(self) -> None:
+        """
+        Registry of the named types defined across several schema files.
+
+        Every file is added once, then `resolve` parses them in topological
+        order so the named types a file references are parsed, exactly once,
+        before the file itself and shared with it through fastavro
+        named_schemas.
+        """
+        self.schemas: Dict[str, JsonDict] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.defined: Dict[str, Set[str]] = {}
+        self.referenced: Dict[str, Set[str]] = {}
+        # named type fullname -> path of the file that defines it
+        self.definitions: Dict[str, str] = {}
+
+    def add(self, path: str, schema: JsonDict) -> None:
+        defined, referenced = collect_names(schema)
+        self.schemas[path] = schema
+        self.defined[path] = defined
+        self.referenced[path] = referenced
+
+        duplicated = sorted(name for name in defined if name in self.definitions)
+        if duplicated:
+            name = duplicated[0]
+            self.errors[path] = InvalidSchema(
+                f"Named type `{name}` is already defined in {self.definitions[name]}"
+            )
+            return
+
+        for name in defined:
+            self.definitions[name] = path
+
+    def add_error(self, path: str, error: Exception) -> None:
+        self.errors[path] = error
+
+    def dependencies(self, path: str) -> List[str]:
+        return sorted(
+            {
+                self.definitions[name]
+                for name in self.referenced[path]
+                if name in self.definitions and self.definitions[name] != path
+            }
+        )
+
+    def _topological_order(
+        self, dependencies: Dict[str, List[str]]
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Sort the files so that every file comes after its dependencies.
+
+        Returns the sorted files and, for the files that are part of a cycle,
+        the cycle they belong to.
+        """
+        order: List[str] = []
+        cycles: Dict[str, List[str]] = {}
+        # 1: visiting, 2: visited
+        state: Dict[str, int] = {}
+
+        for root in self.schemas:
+            if root in state:
+                continue
+            state[root] = 1
+            stack: List[Tuple[str, Iterator[str]]] = [(root, iter(dependencies[root]))]
+            while stack:
+                path, pending = stack[-1]
+                dependency = next(pending, None)
+                if dependency is None:
+                    stack.pop()
+                    state[path] = 2
+                    order.append(path)
+                elif dependency not in state:
+                    state[dependency] = 1
+                    stack.append((dependency, iter(dependencies[dependency])))
+                elif state[dependency] == 1:
+                    visiting = [item for item, _ in stack]
+                    cycle = visiting[visiting.index(dependency) :] + [dependency]
+                    for item in cycle:
+                        cycles.setdefault(item, cycle)
+
+        return order, cycles
+
+    def resolve(self) -> Dict[str, Optional[Exception]]:
+        """
+        Parse every file exactly once, in topological order, and return
+        the validation error, or None, of each file.
+        """
+        dependencies = {path: self.dependencies(path) for path in self.schemas}
+        order, cycles = self._topological_order(dependencies)
+        results: Dict[str, Optional[Exception]] = dict(self.errors)
+        # named types available to the files depending on a given file
+        available: Dict[str, Dict[str, Any]] = {}
+
+        for path in order:
+            if path in results:
+                continue
+
+            missing = sorted(
+                name for name in self.referenced[path] if name not in self.definitions
+            )
+            if path in cycles:
+                results[path] = InvalidSchema(
+                    "Cyclic reference between schemas: " + " -> ".join(cycles[path])
+                )
+                continue
+            if missing:
+                results[path] = InvalidSchema(
+                    f"Schema {path} references unknown named types: "
+                    + ", ".join(missing)
+                )
+                continue
+
+            named_schemas: Dict[str, Any] = {}
+            invalid_dependencies = []
+            for dependency in dependencies[path]:
+                if results.get(dependency) is not None or dependency not in available:
+                    invalid_dependencies.append(dependency)
+                else:
+                    named_schemas.update(available[dependency])
+            if invalid_dependencies:
+                results[path] = InvalidSchema(
+                    f"Schema {path} depends on invalid schemas: "
+                    + ", ".join(invalid_dependencies)
+                )
+                continue
+
+            try:
+                _schema_utils.validate(
+                    schema=self.schemas[path], named_schemas=named_schemas
+                )
+            except InvalidSchema as exc:
+                results[path] = exc
+                continue
+
+            results[path] = None
+            available[path] = named_schemas
+
+        return results
+
+
+def load_registry(files: Iterable[str]) -> Tuple[NamedTypeRegistry, List[str]]:
+    """Read every file once and add it to a new registry."""
+    registry = NamedTypeRegistry()
+    paths = []
+    for path in files:
+        paths.append(path)
+        try:
+            registry.add(path, _schema_utils.get_resource_from_path(path=path))
+        except JsonRequired as exc:
+            registry.add_error(path, exc)
+    return registry, paths
@@ -0,0 +1,213 @@
+import math
+import queue
+import socket
+import threading
+import time
+from typing import IO, Callable, Generator, Iterator, List, Optional, Union
+from urllib.parse import urlparse
+
+# Number of generated batches kept ready before they are emitted
+PREFETCH_BATCHES = 8
+
+
+class Lateness:
+    def __init__(self) -> None:
+        """
+        Lateness of the records, how long after their scheduled time they
+        were written. The jitter is the standard deviation of the lateness.
+        """
+        self.count = 0
+        self.sum = 0.0
+        self.squares = 0.0
+        self.max = 0.0
+
+    def add(self, lateness: float) -> None:
+        self.count += 1
+        self.sum += lateness
+        self.squares += lateness * lateness
+        self.max = max(self.max, lateness)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    @property
+    def jitter(self) -> float:
+        if not self.count:
+            return 0.0
+        variance = self.squares / self.count - self.mean**2
+        return math.sqrt(max(variance, 0.0))
+
+
+class RateStats:
+    def __init__(self, start: float) -> None:
+        """
+        Statistics of the records emitted since start and since the last
+        report, the window that is reset by every report.
+        """
+        self.started = start
+        self.overall = Lateness()
+        self.reset(start)
+
+    def reset(self, start: float) -> None:
+        self.start = start
+        self.window = Lateness()
+
+    def add(self, lateness: float) -> None:
+        self.overall.add(lateness)
+        self.window.add(lateness)
+
+    @property
+    def total(self) -> int:
+        return self.overall.count
+
+    @property
+    def count(self) -> int:
+        return self.window.count
+
+    @property
+    def lateness_mean(self) -> float:
+        return self.window.mean
+
+    @property
+    def lateness_max(self) -> float:
+        return self.window.max
+
+    @property
+    def jitter(self) -> float:
+        return self.window.jitter
+
+    def rate(self, now: float) -> float:
+        """Records per second of the window."""
+        elapsed = now - self.start
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def average_rate(self, now: float) -> float:
+        """Records per second since start."""
+        elapsed = now - self.started
+        return self.total / elapsed if elapsed > 0 else 0.0
+
+    def summary(self, now: float, final: bool = False) -> str:
+        """
+        Summary of the window, or with final of all the records emitted, so
+        the last line is not about the last window only.
+        """
+        rate = self.average_rate(now) if final else self.rate(now)
+        lateness = self.overall if final else self.window
+        return (
+            f"sent={self.total} rate={rate:.0f}/s "
+            f"latency={lateness.mean * 1000:.2f}ms "
+            f"max={lateness.max * 1000:.2f}ms "
+            f"jitter={lateness.jitter * 1000:.2f}ms"
+        )
+
+
+def prefetch(
+    generate_batch: Callable[[], List[bytes]], size: int = PREFETCH_BATCHES
+) -> Generator[List[bytes], None, None]:
+    """
+    Generate batches in a background thread, keeping up to size batches
+    ready, so emitting records does not wait for them to be generated.
+    An error raised by generate_batch is raised by the generator.
+    """
+    batches: "queue.Queue[Union[List[bytes], Exception]]" = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    def produce() -> None:
+        while not stopped.is_set():
+            item: Union[List[bytes], Exception]
+            try:
+                item = generate_batch()
+            except Exception as exc:
+                item = exc
+            while not stopped.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if isinstance(item, Exception):
+                return
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = batches.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
+def emit_at_rate(
+    output: IO[bytes],
+    batches: Iterator[List[bytes]],
+    rate: float,
+    duration: Optional[float] = None,
+    count: Optional[int] = None,
+    report: Optional[Callable[[RateStats, float], None]] = None,
+    report_interval: float = 1.0,
+) -> RateStats:
+    """
+    Write the messages from batches to output at a steady rate per second,
+    for duration seconds, until count messages are written, batches is
+    exhausted or until interrupted.
+
+    Every message has a scheduled time, start + n / rate. Messages that are
+    due are written together and output is flushed before waiting for the
+    next one. report is called every report_interval seconds with the stats.
+    """
+    start = time.perf_counter()
+    stats = RateStats(start)
+    next_report = start + report_interval
+    limits = [] if count is None else [count]
+    if duration is not None:
+        limits.append(math.ceil(duration * rate))
+    limit = min(limits, default=None)
+
+    try:
+        for batch in batches:
+            for message in batch:
+                if limit is not None and stats.total >= limit:
+                    return stats
+
+                due = start + stats.total / rate
+                now = time.perf_counter()
+                if due > now:
+                    output.flush()
+                    time.sleep(due - now)
+                    now = time.perf_counter()
+
+                output.write(message)
+                stats.add(now - due)
+
+                if report is not None and now >= next_report:
+                    report(stats, now)
+                    stats.reset(now)
+                    next_report = now + report_interval
+    except KeyboardInterrupt:
+        # without duration records are emitted until the user stops them
+        ...
+    finally:
+        output.flush()
+    return stats
+
+
+def connect(address: str) -> IO[bytes]:
+    """Open a socket to tcp://host:port or unix:///path for writing."""
+    url = urlparse(address)
+    if url.scheme == "tcp":
+        sock = socket.create_connection((url.hostname, url.port))
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(url.path)
+    output = sock.makefile(mode="wb")
+    # the file keeps the socket open until it is closed
+    sock.close()
+    return output
+
+
+def is_socket_address(output: str) -> bool:
+    return output.startswith(("tcp://", "unix://"))
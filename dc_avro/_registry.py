@@ -0,0 +1,232 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, NamedTuple, Optional
+from urllib.parse import quote, unquote
+
+from ._cache import HttpCache
+from ._types import JsonDict
+from .exceptions import RegistryError
+
+SCHEME = "registry://"
+INDEX_FILE_NAME = "index.json"
+LATEST = "latest"
+
+# Environment variables with the Schema Registry url and the directory of
+# a snapshot made with `dc-avro registry snapshot`
+REGISTRY_URL_ENV = "DC_AVRO_REGISTRY_URL"
+SNAPSHOT_DIR_ENV = "DC_AVRO_REGISTRY_SNAPSHOT"
+
+
+class RegistryResource(NamedTuple):
+    subject: Optional[str] = None
+    version: str = LATEST
+    schema_id: Optional[int] = None
+
+    @classmethod
+    def parse(cls, resource: str) -> "RegistryResource":
+        """
+        Parse `registry://subject[/version]` or `registry://schemas/ids/id`.
+        The version defaults to latest and subjects with `/` are quoted.
+        """
+        parts = [unquote(part) for part in resource[len(SCHEME) :].split("/")]
+        if len(parts) == 3 and parts[:2] == ["schemas", "ids"] and parts[2].isdigit():
+            return cls(schema_id=int(parts[2]))
+        if len(parts) == 1 and parts[0]:
+            return cls(subject=parts[0])
+        if len(parts) == 2 and parts[0] and (parts[1].isdigit() or parts[1] == LATEST):
+            return cls(subject=parts[0], version=parts[1])
+        raise RegistryError(
+            f"Invalid registry resource {resource}. "
+            "Use registry://subject/version or registry://schemas/ids/id"
+        )
+
+    def path(self) -> str:
+        """Path of the resource in the Schema Registry REST api."""
+        if self.schema_id is not None:
+            return f"schemas/ids/{self.schema_id}"
+        return f"subjects/{quote(str(self.subject), safe='')}/versions/{self.version}"
+
+
+def is_registry_resource(resource: str) -> bool:
+    return resource.startswith(SCHEME)
+
+
+def unwrap(payload: Any) -> Any:
+    """
+    Return the schema of a Schema Registry payload, which has the schema
+    as a json string in `schema`, or the payload itself for plain schemas.
+    """
+    if (
+        isinstance(payload, dict)
+        and isinstance(payload.get("schema"), str)
+        and "type" not in payload
+    ):
+        return json.loads(payload["schema"])
+    return payload
+
+
+def resolve(resource: str) -> str:
+    """
+    Return where the schema of a registry resource is stored: a file of the
+    snapshot in DC_AVRO_REGISTRY_SNAPSHOT or a url of the registry in
+    DC_AVRO_REGISTRY_URL.
+    """
+    registry_resource = RegistryResource.parse(resource)
+
+    snapshot_dir = os.environ.get(SNAPSHOT_DIR_ENV)
+    if snapshot_dir:
+        path = Snapshot(snapshot_dir).find(registry_resource)
+        if path is not None:
+            return path
+
+    registry_url = os.environ.get(REGISTRY_URL_ENV)
+    if not registry_url:
+        raise RegistryError(
+            f"Can not resolve {resource}. Set {REGISTRY_URL_ENV} or "
+            f"{SNAPSHOT_DIR_ENV} with a snapshot that includes it"
+        )
+    return f"{registry_url.rstrip('/')}/{registry_resource.path()}"
+
+
+class Snapshot:
+    def __init__(self, directory: str) -> None:
+        """
+        Local mirror of the subjects of a Schema Registry.
+
+        Every schema version is stored as a pretty printed avsc file under
+        `subjects/<subject>/<version>.avsc` and `index.json` maps the
+        subjects, versions and schema ids to those files.
+        """
+        self.directory = directory
+        self._index: Optional[JsonDict] = None
+
+    @property
+    def index(self) -> JsonDict:
+        if self._index is None:
+            try:
+                with open(os.path.join(self.directory, INDEX_FILE_NAME)) as index:
+                    self._index = json.load(index)
+            except FileNotFoundError:
+                self.clear()
+        return self._index  # type: ignore
+
+    def clear(self) -> None:
+        self._index = {"subjects": {}, "ids": {}}
+
+    def find(self, resource: RegistryResource) -> Optional[str]:
+        if resource.schema_id is not None:
+            relative_path = self.index["ids"].get(str(resource.schema_id))
+        else:
+            subject = self.index["subjects"].get(resource.subject)
+            if subject is None:
+                return None
+            version = (
+                subject["latest"] if resource.version == LATEST else resource.version
+            )
+            relative_path = subject["versions"].get(str(version))
+        if relative_path is None:
+            return None
+        return os.path.join(self.directory, relative_path)
+
+    def add(self, subject: str, version: int, schema_id: int, schema: Any) -> None:
+        relative_path = os.path.join(
+            "subjects", quote(subject, safe=""), f"{version}.avsc"
+        )
+        path = os.path.join(self.directory, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode="w") as schema_file:
+            json.dump(schema, schema_file, indent=2)
+            schema_file.write("\n")
+
+        entry = self.index["subjects"].setdefault(
+            subject, {"latest": version, "versions": {}}
+        )
+        entry["versions"][str(version)] = relative_path
+        entry["latest"] = max(entry["latest"], version)
+        self.index["ids"][str(schema_id)] = relative_path
+
+    def save(self, registry_url: str) -> None:
+        """Write the index atomically, so readers never see a partial one."""
+        self.index["registry"] = registry_url
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, mode="w") as index:
+            json.dump(self.index, index, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE_NAME))
+
+
+async def _snapshot(
+    registry_url: str,
+    snapshot: Snapshot,
+    concurrency: int,
+    http_cache: Optional[HttpCache],
+) -> List[str]:
+    import asyncio
+
+    from . import _http
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with _http.get_async_client() as client:
+
+        async def get(path: str) -> Any:
+            async with semaphore:
+                response = await _http.async_get(
+                    f"{registry_url}/{path}", client=client, cache=http_cache
+                )
+            response.raise_for_status()
+            return response.json()
+
+        async def get_version(subject: str, version: int) -> Dict[str, Any]:
+            return await get(RegistryResource(subject, str(version)).path())
+
+        async def get_versions(subject: str) -> List[Dict[str, Any]]:
+            versions = await get(f"subjects/{quote(subject, safe='')}/versions")
+            return await asyncio.gather(
+                *(get_version(subject, version) for version in versions)
+            )
+
+        subjects: List[str] = await get("subjects")
+        for versions in await asyncio.gather(*map(get_versions, subjects)):
+            for version in versions:
+                # only avro schemas, schemaType is not set for them
+                if version.get("schemaType", "AVRO") != "AVRO":
+                    continue
+                snapshot.add(
+                    version["subject"],
+                    version["version"],
+                    version["id"],
+                    unwrap(version),
+                )
+
+    if http_cache is not None:
+        http_cache.prune()
+    return subjects
+
+
+def snapshot(
+    registry_url: str,
+    directory: str,
+    concurrency: int = 16,
+    http_cache: Optional[HttpCache] = None,
+) -> Snapshot:
+    """
+    Mirror every version of every subject of the Schema Registry in
+    registry_url into directory, fetching up to concurrency at the same time.
+    The responses are cached in http_cache, when provided.
+    """
+    import asyncio
+
+    import httpx
+
+    registry_url = registry_url.rstrip("/")
+    os.makedirs(directory, exist_ok=True)
+    registry_snapshot = Snapshot(directory)
+    # subjects and versions deleted from the registry are not kept
+    registry_snapshot.clear()
+    try:
+        asyncio.run(_snapshot(registry_url, registry_snapshot, concurrency, http_cache))
+    except httpx.HTTPError as exc:
+        raise RegistryError(f"Can not snapshot {registry_url}: {exc}") from exc
+    registry_snapshot.save(registry_url)
+    return registry_snapshot
@@ -0,0 +1,146 @@
+import abc
+import json
+import shutil
+import tempfile
+from typing import IO, Dict, Type
+from xml.sax.saxutils import escape, quoteattr
+
+from ._lint import LintResult
+from ._types import LintFormat
+from .exceptions import InvalidSchema, JsonRequired
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+INFORMATION_URI = "https://github.com/marcosschroh/dc-avro"
+
+# SARIF rule of every kind of error, the rest are reported as unreadable
+RULES = {
+    InvalidSchema: ("invalid-schema", "The schema is not a valid avro schema"),
+    JsonRequired: ("json-required", "The schema is not valid json"),
+}
+UNREADABLE_RULE = ("unreadable-schema", "The schema could not be read")
+
+# Size of the JUnit test cases kept in memory before spooling them to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def rule_id(error: Exception) -> str:
+    return RULES.get(type(error), UNREADABLE_RULE)[0]
+
+
+class LintReport(abc.ABC):
+    def __init__(self, output: IO[str]) -> None:
+        """
+        Report of the lint results written to output as they are added, so
+        the results are never kept in memory.
+        """
+        self.output = output
+
+    def start(self) -> None: ...
+
+    @abc.abstractmethod
+    def add(self, result: LintResult) -> None: ...
+
+    def finish(self) -> None: ...
+
+
+class JsonLinesReport(LintReport):
+    """One json object per linted file."""
+
+    def add(self, result: LintResult) -> None:
+        error = result.error
+        line = {
+            "path": result.path,
+            "valid": error is None,
+            "error": None if error is None else str(error),
+            "error_type": None if error is None else type(error).__name__,
+        }
+        self.output.write(json.dumps(line) + "\n")
+        # results are streamed, so tools can consume them while linting
+        self.output.flush()
+
+
+class SarifReport(LintReport):
+    """SARIF 2.1.0 log with one result per invalid file."""
+
+    def start(self) -> None:
+        rules = [
+            {"id": rule, "shortDescription": {"text": description}}
+            for rule, description in (*RULES.values(), UNREADABLE_RULE)
+        ]
+        driver = {"name": "dc-avro", "informationUri": INFORMATION_URI, "rules": rules}
+        # the results array is written item by item before closing the run
+        self.output.write(
+            f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "2.1.0", '
+            f'"runs": [{{"tool": {json.dumps({"driver": driver})}, "results": ['
+        )
+        self.separator = ""
+
+    def add(self, result: LintResult) -> None:
+        if result.error is None:
+            return
+
+        sarif_result = {
+            "ruleId": rule_id(result.error),
+            "level": "error",
+            "message": {"text": str(result.error)},
+            "locations": [
+                {"physicalLocation": {"artifactLocation": {"uri": result.path}}}
+            ],
+        }
+        self.output.write(self.separator + json.dumps(sarif_result))
+        self.separator = ", "
+
+    def finish(self) -> None:
+        self.output.write("]}]}\n")
+
+
+class JUnitReport(LintReport):
+    """
+    JUnit xml with one test case per linted file.
+
+    The test suite has the number of tests and failures, which are only
+    known at the end, so the test cases are spooled to a temporary file,
+    on disk once it is bigger than SPOOL_MAX_SIZE, and written by `finish`.
+    """
+
+    def start(self) -> None:
+        self.testcases = tempfile.SpooledTemporaryFile(
+            max_size=SPOOL_MAX_SIZE, mode="w+", encoding="utf-8"
+        )
+        self.tests = 0
+        self.failures = 0
+
+    def add(self, result: LintResult) -> None:
+        self.tests += 1
+        testcase = f'<testcase classname="dc-avro.lint" name={quoteattr(result.path)}'
+        if result.error is None:
+            self.testcases.write(testcase + "/>\n")
+            return
+
+        self.failures += 1
+        error_type = type(result.error).__name__
+        message = str(result.error)
+        self.testcases.write(
+            f"{testcase}>"
+            f"<failure type={quoteattr(error_type)} message={quoteattr(message)}>"
+            f"{escape(message)}</failure></testcase>\n"
+        )
+
+    def finish(self) -> None:
+        counts = f'tests="{self.tests}" failures="{self.failures}" errors="0"'
+        self.output.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f"<testsuites {counts}>\n"
+            f'<testsuite name="dc-avro lint" {counts}>\n'
+        )
+        self.testcases.seek(0)
+        shutil.copyfileobj(self.testcases, self.output)
+        self.testcases.close()
+        self.output.write("</testsuite>\n</testsuites>\n")
+
+
+REPORTS: Dict[LintFormat, Type[LintReport]] = {
+    LintFormat.JSONL: JsonLinesReport,
+    LintFormat.SARIF: SarifReport,
+    LintFormat.JUNIT: JUnitReport,
+}
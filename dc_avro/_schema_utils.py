@@ -1,37 +1,71 @@
 import json
-from typing import Any, Iterable
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Union
 from urllib.parse import urlparse
 
-import httpx
 from fastavro import _schema_common, parse_schema
 from fastavro.types import Schema
-from fastavro.utils import generate_many, generate_one
 
+from . import _cache, _registry
 from ._types import JsonDict
 from .exceptions import InvalidSchema, JsonRequired
 
+if TYPE_CHECKING:
+    from ._cache import ValidationCache
+
+# Max number of parsed schemas kept by parse, the least recently used are
+# dropped first
+PARSED_SCHEMAS_MAX_SIZE = 1024
+
+_parsed_schemas: "OrderedDict[str, Schema]" = OrderedDict()
+
 
 def get_resource_from_url(url: str) -> JsonDict:
+    if _registry.is_registry_resource(url):
+        location = _registry.resolve(url)
+        if not is_url(location):
+            return get_resource_from_path(location)
+        url = location
+
+    from . import _http
+
+    response = _http.get(url, cache=_http.default_cache())
+    return load_resource(response.content, name=url)
+
+
+def load_resource(content: Union[str, bytes], *, name: str) -> JsonDict:
+    """
+    Convert the content of a resource called name to json. Schema Registry
+    payloads, with the schema as a string, are unwrapped.
+    """
     try:
-        response = httpx.get(url)
-        return response.json()
-    except json.JSONDecodeError as exc:
-        raise JsonRequired(f"Can not convert to json the resource from {url}") from exc
+        return _registry.unwrap(json.loads(content))
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise JsonRequired(f"Can not convert to json the resource from {name}") from exc
 
 
 def get_resource_from_path(path: str) -> JsonDict:
-    with open(path, mode="r") as resource:
-        schema = resource.read()
-        try:
-            return json.loads(schema)
-        except json.JSONDecodeError as exc:
-            raise JsonRequired(
-                f"Can not convert to json the resource from {path}"
-            ) from exc
+    with open(path, mode="rb") as resource:
+        return load_resource(resource.read(), name=path)
 
 
 def get_raw_resource_from_url(url: str) -> list[str]:
-    response = httpx.get(url)
+    if _registry.is_registry_resource(url):
+        location = _registry.resolve(url)
+        if not is_url(location):
+            return get_raw_resource_from_path(location)
+        url = location
+
+    from . import _http
+
+    response = _http.get(url, cache=_http.default_cache())
+    try:
+        payload = response.json()
+    except json.JSONDecodeError:
+        payload = None
+    if payload is not None and _registry.unwrap(payload) is not payload:
+        # the schema of a registry payload is a single line string
+        return json.dumps(_registry.unwrap(payload), indent=2).splitlines()
     return [line for line in response.iter_lines()]
 
 
@@ -42,10 +76,83 @@ def get_raw_resource_from_path(path: str) -> list[str]:
     return schema
 
 
-def validate(*, schema: JsonDict) -> bool:
+def validate(
+    *,
+    schema: JsonDict,
+    named_schemas: Optional[Dict[str, Any]] = None,
+) -> Schema:
+    """
+    Validate schema raising InvalidSchema when it is not valid and return
+    the parsed schema, so it can be used without parsing it again.
+
+    named_schemas are the named types, defined in other schemas, that schema
+    can reference. It is populated with the named types defined by schema.
+    """
+    return parse(schema=schema, named_schemas=named_schemas)
+
+
+def validate_cached(*, schema: JsonDict, cache: "ValidationCache") -> None:
+    """
+    Validate schema raising InvalidSchema when it is not valid, looking up
+    the outcome by the schema content so parse_schema is only called for
+    schemas that were not seen before.
+
+    Unlike validate nothing is returned: a valid schema found in the cache
+    is never parsed.
+    """
+    key = cache.key(canonical_json(schema).encode())
+    outcome = cache.get(key)
+    if outcome is None:
+        try:
+            parse(schema=schema)
+        except InvalidSchema as exc:
+            cache.set(key, _cache.outcome_from_error(exc))
+            raise
+        cache.set(key, _cache.outcome_from_error(None))
+        return
+
+    error = _cache.error_from_outcome(outcome)
+    if error is not None:
+        raise error
+
+
+def canonical_json(schema: JsonDict) -> str:
+    """
+    Json of schema with sorted keys, equal for equal schemas. Unlike the avro
+    parsing canonical form it keeps defaults, aliases and docs.
+    """
+    return json.dumps(schema, sort_keys=True)
+
+
+def parse(
+    *, schema: JsonDict, named_schemas: Optional[Dict[str, Any]] = None
+) -> Schema:
+    """
+    Parse schema with fastavro raising InvalidSchema when it is not valid.
+
+    Schemas without named_schemas are parsed once per process: the parsed
+    schema is kept, by its canonical json, and returned for equal schemas.
+    """
+    if named_schemas is not None:
+        return _parse(schema=schema, named_schemas=named_schemas)
+
+    key = canonical_json(schema)
+    parsed_schema = _parsed_schemas.get(key)
+    if parsed_schema is None:
+        parsed_schema = _parse(schema=schema)
+        _parsed_schemas[key] = parsed_schema
+        if len(_parsed_schemas) > PARSED_SCHEMAS_MAX_SIZE:
+            _parsed_schemas.popitem(last=False)
+    else:
+        _parsed_schemas.move_to_end(key)
+    return parsed_schema
+
+
+def _parse(
+    *, schema: JsonDict, named_schemas: Optional[Dict[str, Any]] = None
+) -> Schema:
     try:
-        parse_schema(schema=schema)
-        return True
+        return parse_schema(schema=schema, named_schemas=named_schemas)
     except _schema_common.SchemaParseException as exc:
         raise InvalidSchema(
             f"Schema {schema} is not valid.\n Error: `{str(exc)}`"
@@ -65,14 +172,23 @@ def is_url(resource: str) -> bool:
 
 
 def get_schema(resource: str) -> Schema:
-    """Get a schema from a uri or path."""
-    if is_url(resource):
-        return parse_schema(get_resource_from_url(resource))
-    return parse_schema(get_resource_from_path(resource))
+    """Get a schema from a uri, a registry resource or path."""
+    if is_url(resource) or _registry.is_registry_resource(resource):
+        return parse(schema=get_resource_from_url(resource))
+    return parse(schema=get_resource_from_path(resource))
 
 
 def generate_data(schema: Schema, count: int = 1) -> Iterable[Any]:
     """Generate data from a schema."""
+    from fastavro.utils import generate_many, generate_one
+
     if count == 1:
         return generate_one(schema)
     return list(generate_many(schema, count=count))
+
+
+def iter_data(schema: Schema, count: int = 1) -> Iterator[Any]:
+    """Lazily generate count records from a schema."""
+    from fastavro.utils import generate_many
+
+    return generate_many(schema, count=count)
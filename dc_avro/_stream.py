@@ -0,0 +1,460 @@
+import datetime
+import decimal
+import io
+import itertools
+import json
+import struct
+import uuid
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Optional, Set
+
+import fastavro
+from fastavro.types import Schema
+
+from ._types import DataFormat, SerializationType, StreamFormat
+from .exceptions import InvalidData, JsonRequired
+
+# Every length prefixed message starts with its size as a 4 bytes big endian
+# unsigned integer
+LENGTH_PREFIX = struct.Struct(">I")
+
+# Confluent wire format: magic byte followed by the schema id
+CONFLUENT_HEADER = struct.Struct(">bI")
+CONFLUENT_MAGIC_BYTE = 0
+
+# Number of records encoded in memory before they are written to the output
+BATCH_SIZE = 1000
+
+READ_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = " \t\n\r"
+
+
+def iter_json_records(stream: IO[str]) -> Iterator[Any]:
+    """
+    Lazily decode the records from a stream with either one json document
+    per line (NDJSON) or a single json array.
+    """
+    char = stream.read(1)
+    while char and char in JSON_WHITESPACE:
+        char = stream.read(1)
+
+    if not char:
+        return
+    elif char == "[":
+        yield from _iter_json_array(stream)
+    else:
+        yield from _iter_json_lines(char + stream.readline(), stream)
+
+
+def _iter_json_lines(first_line: str, stream: IO[str]) -> Iterator[Any]:
+    line_number = 1
+    line = first_line
+    while line:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise JsonRequired(
+                    f"Can not convert to json the record in line {line_number}"
+                ) from exc
+        line = stream.readline()
+        line_number += 1
+
+
+def _iter_json_array(stream: IO[str]) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    index = 0
+
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_WHITESPACE + ",":
+            position += 1
+
+        if position < len(buffer) and buffer[position] == "]":
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+            # a number at the end of the buffer can be incomplete
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError as exc:
+            if eof:
+                raise JsonRequired(
+                    f"Can not convert to json the record at position {index}"
+                ) from exc
+            complete = False
+
+        if complete:
+            yield record
+            index += 1
+            position = end
+            continue
+
+        chunk = stream.read(READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+        if eof and not buffer.strip():
+            raise JsonRequired("Can not convert to json, the array is not closed")
+
+
+def _has_bytes(schema: Any, named_schemas: Dict[str, Any], visited: Set[str]) -> bool:
+    if isinstance(schema, str):
+        if schema == "bytes":
+            return True
+        if schema in named_schemas and schema not in visited:
+            visited.add(schema)
+            return _has_bytes(named_schemas[schema], named_schemas, visited)
+        return False
+    if isinstance(schema, list):
+        return any(_has_bytes(item, named_schemas, visited) for item in schema)
+
+    schema_type = schema["type"]
+    if schema_type == "fixed":
+        return True
+    if schema_type in ("record", "error"):
+        return any(
+            _has_bytes(field["type"], named_schemas, visited)
+            for field in schema["fields"]
+        )
+    if schema_type == "array":
+        return _has_bytes(schema["items"], named_schemas, visited)
+    if schema_type == "map":
+        return _has_bytes(schema["values"], named_schemas, visited)
+    return _has_bytes(schema_type, named_schemas, visited)
+
+
+def json_to_datum(schema: Schema) -> Optional[Callable[[Any], Any]]:
+    """
+    Return a function that converts a record decoded from json to the python
+    types fastavro expects.
+
+    json has no bytes, so `bytes` and `fixed` values are given as strings
+    with one character per byte, like in the avro json encoding, and
+    decimals can be given as strings or numbers. When the schema has no such
+    types there is nothing to convert and None is returned.
+    """
+    named_schemas: Dict[str, Any] = schema.get("__named_schemas", {})  # type: ignore
+    if not _has_bytes(schema, named_schemas, visited=set()):
+        return None
+
+    def convert(datum: Any, schema: Any) -> Any:
+        if isinstance(schema, str):
+            if schema == "bytes":
+                return _to_bytes(datum)
+            if schema in named_schemas:
+                return convert(datum, named_schemas[schema])
+            return datum
+
+        if isinstance(schema, list):
+            return convert(datum, _union_branch(datum, schema, named_schemas))
+
+        schema_type = schema["type"]
+        if schema.get("logicalType") == "decimal" and isinstance(
+            datum, (str, int, float)
+        ):
+            return decimal.Decimal(str(datum))
+        if schema_type == "fixed":
+            return _to_bytes(datum)
+        if schema_type in ("record", "error") and isinstance(datum, dict):
+            fields = {field["name"]: field["type"] for field in schema["fields"]}
+            return {
+                key: convert(value, fields[key]) if key in fields else value
+                for key, value in datum.items()
+            }
+        if schema_type == "array" and isinstance(datum, list):
+            return [convert(item, schema["items"]) for item in datum]
+        if schema_type == "map" and isinstance(datum, dict):
+            return {
+                key: convert(value, schema["values"]) for key, value in datum.items()
+            }
+        return convert(datum, schema_type)
+
+    return lambda record: convert(record, schema)
+
+
+def _to_bytes(datum: Any) -> Any:
+    if isinstance(datum, str):
+        return datum.encode("iso-8859-1")
+    return datum
+
+
+def _union_branch(datum: Any, union: list, named_schemas: Dict[str, Any]) -> Any:
+    def type_of(branch: Any) -> str:
+        if isinstance(branch, str):
+            branch = named_schemas.get(branch, branch)
+        return branch if isinstance(branch, str) else branch["type"]
+
+    types = [type_of(branch) for branch in union]
+    if isinstance(datum, str):
+        if "string" in types:
+            return "string"
+        for branch, branch_type in zip(union, types):
+            if branch_type in ("bytes", "fixed", "enum"):
+                return branch
+    elif isinstance(datum, dict):
+        for branch, branch_type in zip(union, types):
+            if branch_type in ("record", "error"):
+                record = named_schemas[branch] if isinstance(branch, str) else branch
+                if set(datum) <= {field["name"] for field in record["fields"]}:
+                    return branch
+        if "map" in types:
+            return union[types.index("map")]
+    elif isinstance(datum, list) and "array" in types:
+        return union[types.index("array")]
+    return "null"
+
+
+def count(records: Iterable[Any], counter: list) -> Iterator[Any]:
+    for record in records:
+        counter[0] += 1
+        yield record
+
+
+def write_container(
+    output: IO[bytes],
+    schema: Schema,
+    records: Iterable[Any],
+    codec: str = "null",
+    sync_marker: Optional[bytes] = None,
+) -> int:
+    """Write records to output as an Avro Object Container File."""
+    counter = [0]
+    fastavro.writer(
+        output,
+        schema,
+        count(records, counter),
+        codec=codec,
+        sync_marker=sync_marker,  # type: ignore
+    )
+    return counter[0]
+
+
+def write_length_prefixed(
+    output: IO[bytes],
+    schema: Schema,
+    records: Iterable[Any],
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    Write records to output as avro binary messages, each one prefixed with
+    its length. Messages are encoded in memory and written in batches.
+    """
+    batch = io.BytesIO()
+    message = io.BytesIO()
+    total = 0
+
+    for record in records:
+        message.seek(0)
+        message.truncate()
+        fastavro.schemaless_writer(message, schema, record)
+        payload = message.getvalue()
+        batch.write(LENGTH_PREFIX.pack(len(payload)))
+        batch.write(payload)
+
+        total += 1
+        if total % batch_size == 0:
+            output.write(batch.getvalue())
+            batch.seek(0)
+            batch.truncate()
+
+    output.write(batch.getvalue())
+    return total
+
+
+def write_avro_json(output: IO[bytes], schema: Schema, records: Iterable[Any]) -> int:
+    """Write records to output using the avro json encoding, one per line."""
+    records = iter(records)
+    first_record = next(records, None)
+    if first_record is None:
+        return 0
+
+    counter = [0]
+    text_output = io.TextIOWrapper(output, encoding="utf-8", write_through=True)
+    try:
+        fastavro.json_writer(
+            text_output,
+            schema,
+            count(itertools.chain([first_record], records), counter),
+        )
+        text_output.write("\n")
+    finally:
+        text_output.detach()
+    return counter[0]
+
+
+def serialize_records(
+    *,
+    input: IO[str],
+    output: IO[bytes],
+    schema: Schema,
+    serialization_type: SerializationType = SerializationType.AVRO,
+    output_format: StreamFormat = StreamFormat.CONTAINER,
+    codec: str = "null",
+) -> int:
+    """
+    Serialize the json records read from input with an already parsed schema
+    and return the number of records written to output.
+    """
+    records: Iterable[Any] = iter_json_records(input)
+    converter = json_to_datum(schema)
+    if converter is not None:
+        records = map(converter, records)
+
+    if serialization_type == SerializationType.AVRO_JSON:
+        return write_avro_json(output, schema, records)
+    elif output_format == StreamFormat.LENGTH_PREFIXED:
+        return write_length_prefixed(output, schema, records)
+    return write_container(output, schema, records, codec=codec)
+
+
+def iter_length_prefixed(input: IO[bytes]) -> Iterator[bytes]:
+    """Lazily read the length-prefixed messages from input."""
+    while prefix := input.read(LENGTH_PREFIX.size):
+        if len(prefix) < LENGTH_PREFIX.size:
+            raise InvalidData("Truncated length prefix at the end of the input")
+
+        (size,) = LENGTH_PREFIX.unpack(prefix)
+        message = input.read(size)
+        if len(message) < size:
+            raise InvalidData(
+                f"Truncated message: expected {size} bytes but got {len(message)}"
+            )
+        yield message
+
+
+def strip_confluent_header(message: bytes) -> memoryview:
+    """Return the avro payload of a message in the Confluent wire format."""
+    if len(message) < CONFLUENT_HEADER.size:
+        raise InvalidData("The message is too short for the Confluent wire format")
+
+    magic_byte, _ = CONFLUENT_HEADER.unpack_from(message)
+    if magic_byte != CONFLUENT_MAGIC_BYTE:
+        raise InvalidData(f"Unknown magic byte {magic_byte} in Confluent message")
+    return memoryview(message)[CONFLUENT_HEADER.size :]
+
+
+def iter_messages(
+    input: IO[bytes],
+    writer_schema: Schema,
+    reader_schema: Optional[Schema] = None,
+    confluent: bool = False,
+) -> Iterator[Any]:
+    """Lazily decode the length-prefixed avro messages from input."""
+    for message in iter_length_prefixed(input):
+        payload = strip_confluent_header(message) if confluent else message
+        yield fastavro.schemaless_reader(
+            io.BytesIO(payload), writer_schema, reader_schema
+        )
+
+
+def json_default(value: Any) -> Any:
+    """Convert the values that json can not encode."""
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("iso-8859-1")
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, tuple):
+        # union branch written with the record name, (name, value)
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_ndjson(
+    output: IO[str], records: Iterable[Any], batch_size: int = BATCH_SIZE
+) -> int:
+    """Write records to output as json, one per line, in batches."""
+    encoder = json.JSONEncoder(default=json_default, ensure_ascii=False)
+    batch = []
+    total = 0
+
+    for record in records:
+        batch.append(encoder.encode(record))
+        total += 1
+        if len(batch) == batch_size:
+            batch.append("")
+            output.write("\n".join(batch))
+            batch.clear()
+
+    if batch:
+        batch.append("")
+        output.write("\n".join(batch))
+    return total
+
+
+def message_encoder(
+    schema: Schema, output_format: DataFormat
+) -> Callable[[Any], bytes]:
+    """
+    Return a function that encodes one record as a self-contained message:
+    a json line or a length-prefixed avro message.
+    """
+    if output_format == DataFormat.NDJSON:
+        encoder = json.JSONEncoder(default=json_default, ensure_ascii=False)
+        return lambda record: (encoder.encode(record) + "\n").encode()
+    elif output_format == DataFormat.LENGTH_PREFIXED:
+
+        def encode(record: Any) -> bytes:
+            message = io.BytesIO()
+            fastavro.schemaless_writer(message, schema, record)
+            payload = message.getvalue()
+            return LENGTH_PREFIX.pack(len(payload)) + payload
+
+        return encode
+    raise InvalidData(f"Records can not be written one by one as {output_format.value}")
+
+
+def write_records(
+    *,
+    output: IO[bytes],
+    schema: Schema,
+    records: Iterable[Any],
+    output_format: DataFormat = DataFormat.CONTAINER,
+    codec: str = "null",
+    sync_marker: Optional[bytes] = None,
+) -> int:
+    """
+    Write python records, e.g. generated from a schema, to output and return
+    the number of records written.
+    """
+    if output_format == DataFormat.NDJSON:
+        text_output = io.TextIOWrapper(output, encoding="utf-8", write_through=True)
+        try:
+            return write_ndjson(text_output, records)
+        finally:
+            text_output.detach()
+    elif output_format == DataFormat.LENGTH_PREFIXED:
+        return write_length_prefixed(output, schema, records)
+    return write_container(
+        output, schema, records, codec=codec, sync_marker=sync_marker
+    )
+
+
+def deserialize_records(
+    *,
+    input: IO[bytes],
+    output: IO[str],
+    schema: Optional[Schema] = None,
+    input_format: StreamFormat = StreamFormat.CONTAINER,
+) -> int:
+    """
+    Decode the records read from input and write them to output as NDJSON.
+
+    Records are decoded lazily, so input can be bigger than the memory.
+    For container files schema is the reader schema and it is optional, as
+    the writer schema is stored in the file. For length-prefixed messages
+    schema is used as writer and reader schema.
+    """
+    records: Iterable[Any]
+    if input_format == StreamFormat.CONTAINER:
+        records = fastavro.reader(input, reader_schema=schema)
+    elif schema is None:
+        raise InvalidData(f"A schema is required to read {input_format.value} messages")
+    else:
+        records = iter_messages(
+            input, schema, confluent=input_format == StreamFormat.CONFLUENT
+        )
+    return write_ndjson(output, records)
@@ -4,7 +4,51 @@ import typing
 JsonDict = typing.Dict[str, typing.Any]
 
 
+# Same values as dataclasses_avroschema.ModelType, which is only imported
+# by generate-model
+class ModelType(str, enum.Enum):
+    DATACLASS = "dataclass"
+    PYDANTIC = "pydantic"
+    AVRODANTIC = "avrodantic"
+
+
+class DiffTypes(str, enum.Enum):
+    TABLE = "table"
+    CONTEXT = "context"
+    UNIFIED = "unified"
+    SEMANTIC = "semantic"
+
+
 # Move this to dataclasses-avroschema
 class SerializationType(str, enum.Enum):
     AVRO = "avro"
     AVRO_JSON = "avro-json"
+
+
+class StreamFormat(str, enum.Enum):
+    CONTAINER = "container"
+    LENGTH_PREFIXED = "length-prefixed"
+    # length-prefixed messages using the Confluent wire format: a magic byte
+    # and the schema id before the avro payload
+    CONFLUENT = "confluent"
+
+
+class DataFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CONTAINER = "container"
+    LENGTH_PREFIXED = "length-prefixed"
+
+
+class CompatibilityLevel(str, enum.Enum):
+    # the new schema can read the data written with the previous versions
+    BACKWARD = "backward"
+    # the previous versions can read the data written with the new schema
+    FORWARD = "forward"
+    FULL = "full"
+
+
+class LintFormat(str, enum.Enum):
+    TEXT = "text"
+    JSONL = "jsonl"
+    SARIF = "sarif"
+    JUNIT = "junit"
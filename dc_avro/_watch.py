@@ -0,0 +1,207 @@
+import os
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Union
+
+from . import _lint, _named_types, _schema_utils
+from ._cache import ValidationCache
+from ._types import JsonDict
+from .exceptions import JsonRequired
+
+# Seconds between two scans of the watched files
+POLL_INTERVAL = 0.2
+
+
+class FileState(NamedTuple):
+    mtime_ns: int
+    size: int
+
+
+class WatchUpdate(NamedTuple):
+    # files that were linted again
+    linted: List[str]
+    # errors that are new or different from the ones previously reported
+    errors: Dict[str, Exception]
+    # files that were invalid and are now valid
+    fixed: List[str]
+    # files that were invalid and were deleted
+    removed: List[str]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.errors or self.fixed or self.removed)
+
+
+def scan(files: Iterable[str]) -> Dict[str, FileState]:
+    states = {}
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        states[path] = FileState(stat.st_mtime_ns, stat.st_size)
+    return states
+
+
+def _same_error(one: Exception, other: Exception) -> bool:
+    return type(one) is type(other) and str(one) == str(other)
+
+
+class Watcher:
+    def __init__(
+        self,
+        list_files: Callable[[], Iterable[str]],
+        resolve_references: bool = False,
+        cache: Optional[ValidationCache] = None,
+    ) -> None:
+        """
+        Lint the files returned by list_files again when they change.
+
+        Every `poll` stats the files and only the new and modified ones are
+        linted. With resolve_references, the files that reference the named
+        types defined by the changed files, directly or transitively, are
+        linted as well, because their result depends on them.
+        """
+        self.list_files = list_files
+        self.resolve_references = resolve_references
+        self.cache = cache
+        self.states: Dict[str, FileState] = {}
+        self.errors: Dict[str, Exception] = {}
+        # files in the order they were listed by the last scan
+        self.order: Dict[str, int] = {}
+
+        # state used to resolve references, the schema of every file, or the
+        # error raised while reading it, and the named types it uses
+        self.schemas: Dict[str, Union[JsonDict, Exception]] = {}
+        self.defined: Dict[str, Set[str]] = {}
+        self.referenced: Dict[str, Set[str]] = {}
+        # named type fullname -> files that define or reference it
+        self.definers: Dict[str, Set[str]] = {}
+        self.referrers: Dict[str, Set[str]] = {}
+
+    def poll(self) -> WatchUpdate:
+        """Scan the files once and lint the ones affected by the changes."""
+        states = scan(self.list_files())
+        changed = [
+            path for path, state in states.items() if self.states.get(path) != state
+        ]
+        deleted = [path for path in self.states if path not in states]
+        self.states = states
+        self.order = {path: index for index, path in enumerate(states)}
+
+        if self.resolve_references:
+            results = self._lint_with_references(changed, deleted)
+        else:
+            results = {}
+            for path in changed:
+                try:
+                    results[path] = _lint.lint_file(path, cache=self.cache).error
+                except FileNotFoundError:
+                    # deleted after the scan, the next poll reports it
+                    continue
+
+        errors: Dict[str, Exception] = {}
+        fixed = []
+        for path, error in results.items():
+            previous = self.errors.get(path)
+            if error is None:
+                if previous is not None:
+                    fixed.append(path)
+                    del self.errors[path]
+            elif previous is None or not _same_error(previous, error):
+                errors[path] = self.errors[path] = error
+
+        removed = [path for path in deleted if self.errors.pop(path, None)]
+        return WatchUpdate(
+            linted=list(results), errors=errors, fixed=fixed, removed=removed
+        )
+
+    def _read(self, path: str) -> None:
+        self._forget(path)
+        try:
+            schema = _schema_utils.get_resource_from_path(path=path)
+        except (JsonRequired, FileNotFoundError) as exc:
+            self.schemas[path] = exc
+            defined: Set[str] = set()
+            referenced: Set[str] = set()
+        else:
+            self.schemas[path] = schema
+            defined, referenced = _named_types.collect_names(schema)
+
+        self.defined[path] = defined
+        self.referenced[path] = referenced
+        for name in defined:
+            self.definers.setdefault(name, set()).add(path)
+        for name in referenced:
+            self.referrers.setdefault(name, set()).add(path)
+
+    def _forget(self, path: str) -> None:
+        for name in self.defined.pop(path, ()):
+            self.definers[name].discard(path)
+        for name in self.referenced.pop(path, ()):
+            self.referrers[name].discard(path)
+        self.schemas.pop(path, None)
+
+    def _lint_with_references(
+        self, changed: List[str], deleted: List[str]
+    ) -> Dict[str, Optional[Exception]]:
+        # named types whose definition may have changed
+        names: Set[str] = set()
+        for path in deleted:
+            names.update(self.defined.get(path, ()))
+            self._forget(path)
+        for path in changed:
+            names.update(self.defined.get(path, ()))
+            self._read(path)
+            names.update(self.defined[path])
+
+        # the changed files and the ones that depend on them
+        affected = set(changed)
+        pending = list(names)
+        while pending:
+            for path in self.referrers.get(pending.pop(), ()):
+                if path not in affected:
+                    affected.add(path)
+                    pending.extend(self.defined[path])
+        if not affected:
+            return {}
+
+        # the affected files, the files they depend on and the files defining
+        # the same named types, so duplicates resolve like in a full run
+        needed = set(affected)
+        pending = list(affected)
+        while pending:
+            path = pending.pop()
+            related: Set[str] = set()
+            for name in self.defined[path] | self.referenced[path]:
+                related.update(self.definers.get(name, ()))
+            for other in related - needed:
+                needed.add(other)
+                pending.append(other)
+
+        registry = _named_types.NamedTypeRegistry()
+        for path in sorted(needed, key=self.order.__getitem__):
+            schema = self.schemas[path]
+            if isinstance(schema, Exception):
+                registry.add_error(path, schema)
+            else:
+                registry.add(path, schema)
+        results = registry.resolve()
+        return {
+            path: results[path] for path in sorted(affected, key=self.order.__getitem__)
+        }
+
+    def run(
+        self,
+        on_update: Callable[[WatchUpdate, float], None],
+        interval: float = POLL_INTERVAL,
+    ) -> None:
+        """
+        Poll the files every interval seconds until interrupted, calling
+        on_update with the changes and the seconds it took to lint them.
+        """
+        while True:
+            start = time.perf_counter()
+            update = self.poll()
+            if update.has_changes or update.linted:
+                on_update(update, time.perf_counter() - start)
+            time.sleep(interval)
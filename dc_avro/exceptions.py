@@ -2,3 +2,15 @@ class InvalidSchema(Exception): ...
 
 
 class JsonRequired(Exception): ...
+
+
+class InvalidData(Exception): ...
+
+
+class RegistryError(Exception): ...
+
+
+class DaemonError(Exception): ...
+
+
+class IncompatibleSchema(Exception): ...
@@ -1,28 +1,58 @@
 import ast
-from typing import Dict, List, Optional, Sequence
+import contextlib
+import itertools
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
-import rich
 import typer
-from dataclasses_avroschema import (
-    ModelGenerator,
+
+from . import (
+    _container,
+    _files,
+    _generate,
+    _lint,
+    _rate,
+    _registry,
+    _schema_utils,
+    _stream,
+)
+from ._cache import HttpCache, ValidationCache, default_cache_dir
+from ._types import (
+    CompatibilityLevel,
+    DataFormat,
+    DiffTypes,
+    JsonDict,
+    LintFormat,
     ModelType,
-    serialization,
+    SerializationType,
+    StreamFormat,
 )
+from .exceptions import IncompatibleSchema, InvalidSchema
+
+# Heavy dependencies, like dataclasses_avroschema, rich or httpx, are only
+# imported by the commands that use them, so the CLI starts fast.
+
+
+class LazyConsole:
+    def __init__(self, **kwargs: Any) -> None:
+        """rich Console that is created, and rich imported, on first use."""
+        self._kwargs = kwargs
+        self._console: Any = None
 
-from . import _schema_utils
-from ._diff import DiffTypes, context_diff, table_diff, unified_diff
-from ._types import JsonDict, SerializationType
-from .exceptions import InvalidSchema, JsonRequired
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._kwargs)
+        return getattr(self._console, name)
 
-try:
-    import truststore
-    truststore.inject_into_ssl()
-except ImportError:
-    # truststore is not available, continue without it
-    ...
 
 app = typer.Typer()
-console = rich.console.Console()
+registry_app = typer.Typer(help="Work with a Confluent Schema Registry")
+app.add_typer(registry_app, name="registry")
+console = LazyConsole()
+err_console = LazyConsole(stderr=True)
 
 
 def generate_error_messages(
@@ -70,6 +100,26 @@ def get_raw_resource(
         raise typer.BadParameter(error_messages["required"])
 
 
+def literal_eval(value: Optional[str]) -> Any:
+    if value is None:
+        return None
+    return ast.literal_eval(value)
+
+
+def get_validation_cache(
+    *, cache: bool, cache_dir: Optional[str]
+) -> Optional[ValidationCache]:
+    if not cache:
+        return None
+    return ValidationCache(directory=cache_dir or default_cache_dir())
+
+
+def get_http_cache(*, cache: bool, cache_dir: Optional[str]) -> Optional[HttpCache]:
+    if not cache:
+        return None
+    return HttpCache(directory=cache_dir or default_cache_dir())
+
+
 @app.command()
 def generate_model(
     path: str = typer.Option(None),
@@ -79,6 +129,8 @@ def generate_model(
         help="Model Type",
     ),
 ):
+    from dataclasses_avroschema import ModelGenerator
+
     resource = get_resource(path=path, url=url)
     _schema_utils.validate(schema=resource)
 
@@ -88,6 +140,71 @@ def generate_model(
     print(result)
 
 
+@app.command(help="Generate the models of a directory of schemas as a python package")
+def generate_models(
+    directory: str = typer.Argument(..., help="Directory with the schemas"),
+    output: str = typer.Option(..., help="Directory where the package is written"),
+    model_type: ModelType = typer.Option(ModelType.DATACLASS, help="Model Type"),
+    include: Optional[List[str]] = typer.Option(
+        None, help="Pattern of the schema files. Default to *.avsc"
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, help="Pattern of the files or directories to skip"
+    ),
+    gitignore: bool = typer.Option(
+        True, help="Whether to skip the files ignored by .gitignore files"
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Number of worker processes rendering models. 0 uses one per CPU",
+    ),
+    incremental: bool = typer.Option(
+        True,
+        "--incremental/--force",
+        help=(
+            "Whether to only render the models affected by the schemas that "
+            "changed since the previous run, or all of them"
+        ),
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        help=(
+            "Print the modules affected by the changes since the previous run "
+            "without writing them"
+        ),
+    ),
+) -> None:
+    from . import _models
+
+    files = (
+        (path, _models.module_path(os.path.relpath(path, directory)))
+        for path in _files.iter_schema_files(
+            [directory], include=include, exclude=exclude, use_ignore_files=gitignore
+        )
+    )
+    if dry_run:
+        for module in _models.affected_modules(files, output, model_type=model_type):
+            console.print(module)
+        return
+
+    result = _models.generate_package(
+        files, output, model_type=model_type, jobs=jobs, incremental=incremental
+    )
+    console.print(
+        f":+1: Modules written: {len(result.written)}, "
+        f"unchanged: {len(result.unchanged)}, removed: {len(result.removed)}"
+    )
+    if result.errors:
+        for error_path, error in result.errors.items():
+            console.print(":boom: File: " + error_path)
+            console.print(str(error), style="red", markup=False, highlight=False)
+        app.pretty_exceptions_show_locals = False
+        raise InvalidSchema(f"Total errors detected: {len(result.errors)}")
+
+
 @app.command()
 def schema_diff(
     source_path: str = typer.Option(None, help="Source path to the local schema"),
@@ -105,10 +222,44 @@ def schema_diff(
     num_lines: int = typer.Option(
         5, help="Number of lines to show in the diff when context is set to True"
     ),
+    page_size: int = typer.Option(
+        0,
+        min=0,
+        help=(
+            "Rows of the table diff rendered at a time, so the first rows of huge "
+            "diffs are shown right away. 0 renders the whole table at once"
+        ),
+    ),
     type: DiffTypes = typer.Option(
-        "table", help="Type of diff to display: table, context or unified"
+        "table",
+        help=(
+            "Type of diff to display: table, context, unified or semantic. "
+            "semantic compares the avro structure of the schemas"
+        ),
     ),
 ) -> None:
+    if type == DiffTypes.SEMANTIC:
+        from ._diff import format_changes, semantic_diff
+
+        changes = semantic_diff(
+            source_schema=get_resource(
+                path=source_path,
+                url=source_url,
+                error_messages=generate_error_messages(
+                    path_name="--source-path", url_name="--source-url"
+                ),
+            ),
+            target_schema=get_resource(
+                path=target_path,
+                url=target_url,
+                error_messages=generate_error_messages(
+                    path_name="--target-path", url_name="--target-url"
+                ),
+            ),
+        )
+        console.print(format_changes(changes))
+        return
+
     source_resource = get_raw_resource(
         path=source_path,
         url=source_url,
@@ -125,7 +276,20 @@ def schema_diff(
         ),
     )
 
-    if type == DiffTypes.TABLE:
+    from ._diff import context_diff, iter_table_diff, table_diff, unified_diff
+
+    if type == DiffTypes.TABLE and page_size:
+        for table in iter_table_diff(
+            source_resource=source_resource,
+            source_name=source_path or source_url,
+            target_resource=target_resource,
+            target_name=target_path or target_url,
+            only_deltas=only_deltas,
+            num_lines=num_lines,
+            page_size=page_size,
+        ):
+            console.print(table)
+    elif type == DiffTypes.TABLE:
         console.print(
             table_diff(
                 source_resource=source_resource,
@@ -162,19 +326,62 @@ def schema_diff(
 
 @app.command()
 def serialize(
-    data: str = typer.Argument(None, callback=ast.literal_eval),
+    data: str = typer.Argument(None, callback=literal_eval),
     path: str = typer.Option(None),
     url: str = typer.Option(None),
     serialization_type: SerializationType = typer.Option(
         SerializationType.AVRO,
     ),
+    input: Optional[str] = typer.Option(
+        None,
+        help=(
+            "File with the records to serialize, either NDJSON or a json array. "
+            "Use - to read from stdin"
+        ),
+    ),
+    output: str = typer.Option(
+        "-", help="File where the records from --input are written. Default to stdout"
+    ),
+    output_format: StreamFormat = typer.Option(
+        StreamFormat.CONTAINER,
+        help="Format of the records written from --input",
+    ),
+    codec: str = typer.Option(
+        "null", help="Compression codec of the container files, e.g. null or deflate"
+    ),
 ) -> None:
     resource = get_resource(path=path, url=url)
-    _schema_utils.validate(schema=resource)
+
+    if input is not None:
+        if data is not None:
+            raise typer.BadParameter("You can not specify both DATA and --input")
+        if output_format == StreamFormat.CONFLUENT:
+            raise typer.BadParameter(
+                "Records can only be written as container or length-prefixed"
+            )
+
+        schema = _schema_utils.parse(schema=resource)
+        with (
+            typer.open_file(input, mode="r") as records,
+            typer.open_file(output, mode="wb") as output_stream,
+        ):
+            _stream.serialize_records(
+                input=records,
+                output=output_stream,
+                schema=schema,
+                serialization_type=serialization_type,
+                output_format=output_format,
+                codec=codec,
+            )
+        return
+
+    schema = _schema_utils.validate(schema=resource)
+
+    from dataclasses_avroschema import serialization
 
     output = serialization.serialize(
         data,  # type: ignore
-        resource,
+        schema,  # type: ignore
         serialization_type=serialization_type,  # type: ignore
     )
     console.print(output)
@@ -182,15 +389,105 @@ def serialize(
 
 @app.command()
 def deserialize(
-    event: str,
+    event: Optional[str] = typer.Argument(None),
     path: str = typer.Option(None),
     url: str = typer.Option(None),
     serialization_type: SerializationType = typer.Option(
         SerializationType.AVRO,
     ),
+    input: Optional[str] = typer.Option(
+        None,
+        help=(
+            "File with the events to deserialize, written as NDJSON to --output. "
+            "Use - to read from stdin"
+        ),
+    ),
+    input_format: StreamFormat = typer.Option(
+        StreamFormat.CONTAINER, help="Format of the events from --input"
+    ),
+    output: str = typer.Option(
+        "-", help="File where the events from --input are written. Default to stdout"
+    ),
+    mmap: bool = typer.Option(
+        False, help="Whether to memory-map the container file from --input"
+    ),
+    offset: int = typer.Option(
+        0,
+        min=0,
+        help="Start from the first block of the container file after this byte",
+    ),
+    limit: Optional[int] = typer.Option(
+        None, min=0, help="Max number of blocks to read from the container file"
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Number of worker processes decoding blocks. 0 uses one per CPU",
+    ),
 ) -> None:
+    if input is not None:
+        if event is not None:
+            raise typer.BadParameter("You can not specify both EVENT and --input")
+
+        # container files include the writer schema so a schema is optional
+        schema = None
+        if path or url or input_format != StreamFormat.CONTAINER:
+            schema = _schema_utils.parse(schema=get_resource(path=path, url=url))
+
+        if mmap or offset or limit is not None or jobs != 1:
+            if input == "-" or input_format != StreamFormat.CONTAINER:
+                raise typer.BadParameter(
+                    "--mmap, --offset, --limit and --jobs require a container file "
+                    "as --input"
+                )
+            if os.path.isfile(input) and os.path.getsize(input) == 0:
+                # empty files can not be memory-mapped
+                raise typer.BadParameter(
+                    f"{input} is empty, it is not an Avro Object Container File",
+                    param_hint="--input",
+                )
+            with typer.open_file(output, mode="w") as output_stream:
+                if jobs != 1:
+                    _stream.write_ndjson(
+                        output_stream,
+                        _container.iter_records_parallel(
+                            input,
+                            reader_schema=schema,
+                            offset=offset,
+                            limit=limit,
+                            jobs=jobs,
+                        ),
+                    )
+                    return
+
+                with _container.open_mapped(input) as buffer:
+                    _stream.write_ndjson(
+                        output_stream,
+                        _container.iter_records(
+                            buffer, reader_schema=schema, offset=offset, limit=limit
+                        ),
+                    )
+            return
+
+        with (
+            typer.open_file(input, mode="rb") as events,
+            typer.open_file(output, mode="w") as output_stream,
+        ):
+            _stream.deserialize_records(
+                input=events,
+                output=output_stream,
+                schema=schema,
+                input_format=input_format,
+            )
+        return
+
+    if event is None:
+        raise typer.BadParameter("EVENT or --input must be specified")
+
     resource = get_resource(path=path, url=url)
-    _schema_utils.validate(schema=resource)
+    schema = _schema_utils.validate(schema=resource)
 
     data = (
         ast.literal_eval(event)
@@ -198,9 +495,11 @@ def deserialize(
         else event.encode()
     )
 
+    from dataclasses_avroschema import serialization
+
     output = serialization.deserialize(
         data=data,
-        schema=resource,
+        schema=schema,  # type: ignore
         serialization_type=serialization_type,  # type: ignore
     )
     console.print(output)
@@ -210,30 +509,176 @@ def deserialize(
 def validate_schema(
     path: Optional[str] = typer.Option(None, help="Path to the local schema"),
     url: Optional[str] = typer.Option(None, help="Schema url"),
+    cache: bool = typer.Option(
+        True, help="Whether to cache the validation result of unchanged schemas"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        None,
+        envvar="DC_AVRO_CACHE_DIR",
+        help="Directory used to cache the results. Default to ~/.cache/dc-avro",
+    ),
 ) -> None:
     resource = get_resource(path=path, url=url)
+    validation_cache = get_validation_cache(cache=cache, cache_dir=cache_dir)
 
-    if _schema_utils.validate(schema=resource):
-        console.print("[bold green]Valid schema!![/bold green] :+1: \n")
-        console.print(resource)
+    if validation_cache is None:
+        _schema_utils.validate(schema=resource)
+    else:
+        _schema_utils.validate_cached(schema=resource, cache=validation_cache)
+    console.print("[bold green]Valid schema!![/bold green] :+1: \n")
+    console.print(resource)
 
 
 @app.command()
-def lint(files: List[str]) -> None:
+def lint(
+    files: Optional[List[str]] = typer.Argument(
+        None, help="Schema files, directories, glob patterns or urls to lint"
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None,
+        help="Pattern of the files to lint inside directories. Default to *.avsc",
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, help="Pattern of the files or directories to skip"
+    ),
+    gitignore: bool = typer.Option(
+        True, help="Whether to skip the files ignored by .gitignore files"
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Number of worker processes used to lint. 0 uses one per CPU",
+    ),
+    cache: bool = typer.Option(
+        True, help="Whether to cache the validation result of unchanged schemas"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        None,
+        envvar="DC_AVRO_CACHE_DIR",
+        help="Directory used to cache the results. Default to ~/.cache/dc-avro",
+    ),
+    resolve_references: bool = typer.Option(
+        False,
+        help=(
+            "Whether to resolve the named types referenced across files. "
+            "Files are linted in a single process and without cache"
+        ),
+    ),
+    registry: Optional[str] = typer.Option(
+        None, help="Schema registry url whose subjects latest schemas are linted"
+    ),
+    concurrency: int = typer.Option(
+        16, min=1, help="Max number of schemas fetched at the same time from urls"
+    ),
+    watch: bool = typer.Option(
+        False,
+        help=(
+            "Keep running and lint the files again when they change, printing "
+            "only the errors that appear or are fixed"
+        ),
+    ),
+    interval: float = typer.Option(
+        0.2, min=0.01, help="Seconds between two checks of the files with --watch"
+    ),
+    output_format: LintFormat = typer.Option(
+        LintFormat.TEXT,
+        "--format",
+        help=(
+            "text: report for humans, jsonl, sarif or junit: results streamed to "
+            "stdout as the files are linted"
+        ),
+    ),
+    fail_fast: bool = typer.Option(
+        False, help="Whether to stop at the first invalid schema"
+    ),
+) -> None:
+    validation_cache = get_validation_cache(cache=cache, cache_dir=cache_dir)
+    http_cache = get_http_cache(cache=cache, cache_dir=cache_dir)
     errors: dict = {}
     valid_schemas = []
-    for path in files:
-        try:
-            schema = _schema_utils.get_resource_from_path(path=path)
-        except JsonRequired as e:
-            errors[path] = e
-            continue
-        try:
-            _schema_utils.validate(schema=schema)
-        except InvalidSchema as e:
-            errors[path] = e
-            continue
-        valid_schemas.append(path)
+    cache_misses = 0
+    files = [
+        _registry.resolve(file) if _registry.is_registry_resource(file) else file
+        for file in files or []
+    ]
+    urls = [file for file in files if _schema_utils.is_url(file)]
+    if registry is not None:
+        urls.extend(_lint.registry_schema_urls(registry, http_cache=http_cache))
+    if not files and not urls:
+        raise typer.BadParameter("FILES or --registry must be specified")
+
+    if watch:
+        if urls:
+            raise typer.BadParameter("--watch only supports files")
+        if output_format != LintFormat.TEXT:
+            raise typer.BadParameter("--watch only supports the text format")
+        watch_files(
+            lambda: _files.iter_schema_files(
+                files, include=include, exclude=exclude, use_ignore_files=gitignore
+            ),
+            resolve_references=resolve_references,
+            cache=None if resolve_references else validation_cache,
+            interval=interval,
+        )
+        return
+
+    paths = _files.iter_schema_files(
+        [file for file in files if not _schema_utils.is_url(file)],
+        include=include,
+        exclude=exclude,
+        use_ignore_files=gitignore,
+    )
+    if resolve_references:
+        if urls:
+            raise typer.BadParameter("--resolve-references only supports files")
+        validation_cache = None
+        results = _lint.lint_files_with_references(paths)
+    else:
+        results = itertools.chain(
+            _lint.lint_files(paths, jobs=jobs, cache=validation_cache),
+            _lint.lint_urls(
+                urls,
+                concurrency=concurrency,
+                cache=validation_cache,
+                http_cache=http_cache,
+            ),
+        )
+
+    if output_format != LintFormat.TEXT:
+        from . import _report
+
+        invalid = 0
+        with typer.open_file("-", mode="w") as output:
+            report = _report.REPORTS[output_format](output)
+            report.start()
+            for result in results:
+                report.add(result)
+                invalid += not result.is_valid
+                cache_misses += not result.cached
+                if invalid and fail_fast:
+                    break
+            report.finish()
+
+        if validation_cache is not None and cache_misses:
+            validation_cache.prune()
+        if invalid:
+            raise typer.Exit(code=1)
+        return
+
+    for result in results:
+        if result.is_valid:
+            valid_schemas.append(result.path)
+        else:
+            errors[result.path] = result.error
+        cache_misses += not result.cached
+        if errors and fail_fast:
+            break
+
+    if validation_cache is not None and cache_misses:
+        validation_cache.prune()
+
     if valid_schemas:
         console.print(f"\n:+1: Total valid schemas: {len(valid_schemas)}")
         for valid in valid_schemas:
@@ -247,13 +692,258 @@ def lint(files: List[str]) -> None:
         raise InvalidSchema(error_msg)
 
 
+def watch_files(
+    list_files: Callable[[], Iterable[str]],
+    resolve_references: bool,
+    cache: Optional[ValidationCache],
+    interval: float,
+) -> None:
+    from . import _watch
+
+    def print_update(update: "_watch.WatchUpdate", elapsed: float) -> None:
+        for path in update.removed:
+            console.print(":wastebasket: Removed: " + path)
+        for path in update.fixed:
+            console.print(":+1: Fixed: " + path)
+        for path, error in update.errors.items():
+            console.print(":boom: File: " + path)
+            console.print(str(error), style="red", markup=False, highlight=False)
+        console.print(
+            f":eyes: Linted {len(update.linted)} files in {elapsed * 1000:.0f}ms, "
+            f"total errors: {len(watcher.errors)}"
+        )
+
+    watcher = _watch.Watcher(
+        list_files, resolve_references=resolve_references, cache=cache
+    )
+    try:
+        watcher.run(print_update, interval=interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.prune()
+
+
+@app.command(help="Check whether a schema is compatible with its previous versions")
+def compatibility(
+    previous: List[str] = typer.Argument(
+        ...,
+        help=(
+            "Previous versions of the schema, paths, urls or registry resources, "
+            "from oldest to newest"
+        ),
+    ),
+    path: Optional[str] = typer.Option(None, help="Path to the new schema"),
+    url: Optional[str] = typer.Option(None, help="New schema url"),
+    level: CompatibilityLevel = typer.Option(
+        CompatibilityLevel.BACKWARD,
+        help=(
+            "backward: the new schema reads the data of the previous versions, "
+            "forward: the previous versions read the data of the new schema, "
+            "full: both"
+        ),
+    ),
+    transitive: bool = typer.Option(
+        False, help="Whether to check all the previous versions or only the latest"
+    ),
+) -> None:
+    from . import _compatibility
+
+    schema = _schema_utils.validate(schema=get_resource(path=path, url=url))
+    results = _compatibility.check_compatibility(
+        schema,
+        [(version, _schema_utils.get_schema(version)) for version in previous],
+        level=level,
+        transitive=transitive,
+    )
+
+    incompatible = 0
+    for result in results:
+        if not result.errors:
+            console.print(f":+1: {result.direction} compatible with {result.version}")
+            continue
+        incompatible += 1
+        console.print(f":boom: {result.direction} incompatible with {result.version}")
+        for error in result.errors:
+            console.print(
+                f"{error.path}: {error.message}",
+                style="red",
+                markup=False,
+                highlight=False,
+            )
+
+    if incompatible:
+        app.pretty_exceptions_show_locals = False
+        raise IncompatibleSchema(f"Total incompatible versions: {incompatible}")
+
+
 @app.command(help="Generate fake data for a given avsc schema")
 def generate_data(
     resource: str = typer.Argument(None, help="Path or URL to the avro schema"),
-    count: int = typer.Option(
-        1, help="Number of data to generate, more than one prints a list"
+    count: Optional[int] = typer.Option(
+        None,
+        help=(
+            "Number of data to generate, more than one prints a list. Default to 1, "
+            "with --rate records are emitted until interrupted"
+        ),
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        help=(
+            "File where the data is streamed instead of printed. "
+            "Use - to write to stdout and {shard} to write one file per job"
+        ),
+    ),
+    output_format: DataFormat = typer.Option(
+        DataFormat.NDJSON, help="Format of the data written to --output"
+    ),
+    codec: str = typer.Option(
+        "null", help="Compression codec of the container files, e.g. null or deflate"
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Number of worker processes generating --output. 0 uses one per CPU",
+    ),
+    seed: Optional[int] = typer.Option(
+        None, help="Seed to generate the same data for the same seed and jobs"
+    ),
+    rate: Optional[float] = typer.Option(
+        None,
+        help="Emit the data at a steady number of records per second",
+    ),
+    duration: Optional[float] = typer.Option(
+        None,
+        min=0,
+        help="Seconds to emit data with --rate. Default to until interrupted",
     ),
 ) -> None:
     schema = _schema_utils.get_schema(resource=resource)
-    data = _schema_utils.generate_data(schema=schema, count=count)
-    console.print(data)
+
+    if rate is not None:
+        if rate <= 0:
+            raise typer.BadParameter("--rate must be greater than 0")
+        if jobs != 1 or output_format == DataFormat.CONTAINER:
+            raise typer.BadParameter(
+                "--rate emits ndjson or length-prefixed records from a single job"
+            )
+        output = output or "-"
+        if _rate.is_socket_address(output):
+            sink: Any = contextlib.closing(_rate.connect(output))
+        else:
+            sink = typer.open_file(output, mode="wb")
+
+        batches = _rate.prefetch(_generate.message_batches(schema, output_format))
+        with sink as output_stream, _generate.seeded(seed), contextlib.closing(batches):
+            stats = _rate.emit_at_rate(
+                output_stream,
+                batches,
+                rate=rate,
+                duration=duration,
+                count=count,
+                report=lambda stats, now: err_console.print(stats.summary(now)),
+            )
+        err_console.print(stats.summary(time.perf_counter(), final=True))
+        return
+
+    count = 1 if count is None else count
+
+    if output is None:
+        if jobs != 1:
+            raise typer.BadParameter("--jobs requires --output")
+        with _generate.seeded(seed):
+            data = _schema_utils.generate_data(schema=schema, count=count)
+        console.print(data)
+        return
+
+    start = time.perf_counter()
+    if "{shard}" in output:
+        total = _generate.generate_shards(
+            paths=[
+                output.format(shard=shard)
+                for shard in range(_generate.worker_count(jobs))
+            ],
+            schema=schema,
+            count=count,
+            seed=seed,
+            output_format=output_format,
+            codec=codec,
+        )
+    else:
+        with typer.open_file(output, mode="wb") as output_stream:
+            total = _generate.generate(
+                output=output_stream,
+                schema=schema,
+                count=count,
+                jobs=jobs,
+                seed=seed,
+                output_format=output_format,
+                codec=codec,
+            )
+    elapsed = time.perf_counter() - start
+    err_console.print(
+        f"Generated {total} records in {elapsed:.2f}s "
+        f"({total / elapsed if elapsed else total:.0f} records/s)"
+    )
+
+
+@registry_app.command(help="Mirror all the subjects of a registry into a directory")
+def snapshot(
+    url: str = typer.Option(..., help="Schema Registry url"),
+    output: str = typer.Option(
+        ..., help="Directory where the subjects and the index are written"
+    ),
+    concurrency: int = typer.Option(
+        16, min=1, help="Max number of schemas fetched at the same time"
+    ),
+    cache: bool = typer.Option(
+        True, help="Whether to cache the responses of the registry"
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        None,
+        envvar="DC_AVRO_CACHE_DIR",
+        help="Directory used to cache the responses. Default to ~/.cache/dc-avro",
+    ),
+) -> None:
+    registry_snapshot = _registry.snapshot(
+        url,
+        output,
+        concurrency=concurrency,
+        http_cache=get_http_cache(cache=cache, cache_dir=cache_dir),
+    )
+    subjects = registry_snapshot.index["subjects"]
+    versions = sum(len(subject["versions"]) for subject in subjects.values())
+    console.print(
+        f":camera: Snapshot of {len(subjects)} subjects and {versions} versions "
+        f"written to {output}"
+    )
+
+
+@app.command(help="Run a daemon that keeps the imports warm for other commands")
+def serve(
+    socket: str = typer.Option(
+        None,
+        help=(
+            "Unix socket where the daemon listens. "
+            "Default to $XDG_RUNTIME_DIR/dc-avro.sock"
+        ),
+    ),
+) -> None:
+    import signal
+
+    from . import _daemon
+
+    # stop, and remove the socket, on SIGTERM as well
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    socket = socket or _daemon.default_socket_path()
+    _daemon.warm_up()
+    with _daemon.DaemonServer(socket, typer.main.get_command(app)) as server:
+        err_console.print(
+            f"Listening on {socket}, run commands with "
+            f"{_daemon.DAEMON_ENV}={socket} to forward them"
+        )
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
@@ -1,6 +1,9 @@
 import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Callable
+from urllib.parse import unquote
 
 import pytest
 from dataclasses_avroschema.model_generator.lang.python.avro_to_python_utils import (
@@ -162,3 +165,86 @@ def create_table() -> Callable:
         return table
 
     return table
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch) -> str:
+    # never use the user cache while running the tests
+    directory = str(tmp_path / "cache")
+    monkeypatch.setenv("DC_AVRO_CACHE_DIR", directory)
+    return directory
+
+
+USER_V1 = {
+    "type": "record",
+    "name": "User",
+    "fields": [{"name": "name", "type": "string"}],
+}
+USER_V2 = {
+    "type": "record",
+    "name": "User",
+    "fields": [
+        {"name": "name", "type": "string"},
+        {"name": "age", "type": "long", "default": 0},
+    ],
+}
+
+# subject -> list of (schema id, schema)
+REGISTRY_SUBJECTS = {
+    "users-value": [(1, USER_V1), (2, USER_V2)],
+    "orders/value": [(3, {"type": "string"})],
+}
+
+
+class SchemaRegistryHandler(BaseHTTPRequestHandler):
+    """Stub of the Confluent Schema Registry REST api."""
+
+    def do_GET(self) -> None:
+        parts = [unquote(part) for part in self.path.strip("/").split("/")]
+        versions = {
+            schema_id: (subject, version, schema)
+            for subject, schemas in REGISTRY_SUBJECTS.items()
+            for version, (schema_id, schema) in enumerate(schemas, start=1)
+        }
+
+        if parts == ["subjects"]:
+            return self.reply(list(REGISTRY_SUBJECTS))
+        if parts[:2] == ["schemas", "ids"] and int(parts[2]) in versions:
+            return self.reply({"schema": json.dumps(versions[int(parts[2])][2])})
+        if parts[0] == "subjects" and parts[1] in REGISTRY_SUBJECTS:
+            schemas = REGISTRY_SUBJECTS[parts[1]]
+            if len(parts) == 3:
+                return self.reply(list(range(1, len(schemas) + 1)))
+            version = len(schemas) if parts[3] == "latest" else int(parts[3])
+            schema_id, schema = schemas[version - 1]
+            return self.reply(
+                {
+                    "subject": parts[1],
+                    "version": version,
+                    "id": schema_id,
+                    "schema": json.dumps(schema),
+                }
+            )
+        self.send_error(404)
+
+    def reply(self, payload) -> None:
+        content = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.schemaregistry.v1+json")
+        self.send_header("Content-Length", str(len(content)))
+        # the responses can be cached
+        self.send_header("ETag", f'"{hash(content)}"')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args) -> None: ...
+
+
+@pytest.fixture
+def schema_registry():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SchemaRegistryHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
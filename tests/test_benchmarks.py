@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from fastavro import parse_schema
+from typer.testing import CliRunner
+
+from benchmarks import corpora, suite
+from benchmarks.__main__ import app
+from benchmarks.compare import compare
+
+runner = CliRunner()
+
+
+@pytest.mark.parametrize("corpus", corpora.CORPORA)
+def test_corpora(corpus) -> None:
+    schema = parse_schema(corpora.CORPORA[corpus](10))
+    records = corpora.records(schema, 5)
+    assert records == corpora.records(schema, 5)
+
+    assert len(corpora.ndjson(records).splitlines()) == 5
+    assert corpora.container(schema, records)
+
+
+def test_diff_pair() -> None:
+    source, target = corpora.diff_pair(5000)
+    assert 4500 < len(source) < 5500
+    assert source != target
+    json.loads("".join(target))
+
+
+def test_cases() -> None:
+    cases = list(suite.cases({"wide": [10, 100], "diff": [500]}, records=3))
+    assert [case.name for case in cases] == [
+        "validate[wide-10]",
+        "serialize[wide-10]",
+        "deserialize[wide-10]",
+        "generate-data[wide-10]",
+        "validate[wide-100]",
+        "serialize[wide-100]",
+        "deserialize[wide-100]",
+        "generate-data[wide-100]",
+        "schema-diff-table[diff-500]",
+        "schema-diff-unified[diff-500]",
+        "schema-diff-semantic[diff-500]",
+    ]
+
+    # every run can be measured
+    for case in cases[:4] + cases[-3:]:
+        result = suite.measure(case, repeat=1)
+        assert result.min == result.median > 0
+        assert result.peak_memory > 0
+
+
+def result(name: str, median: float, peak_memory: int) -> suite.Result:
+    return suite.Result(
+        name=name,
+        command="validate",
+        corpus="wide",
+        size=10,
+        items=10,
+        unit="fields",
+        repeat=1,
+        min=median,
+        median=median,
+        throughput=10 / median,
+        peak_memory=peak_memory,
+    )
+
+
+def test_compare() -> None:
+    baseline = {
+        "same": result("same", 1.0, 100),
+        "slower": result("slower", 1.0, 100),
+        "bigger": result("bigger", 1.0, 100),
+        "removed": result("removed", 1.0, 100),
+    }
+    current = {
+        "same": result("same", 1.05, 100),
+        "slower": result("slower", 1.5, 100),
+        "bigger": result("bigger", 0.5, 200),
+        "added": result("added", 1.0, 100),
+    }
+
+    comparisons = {
+        comparison.name: comparison for comparison in compare(baseline, current)
+    }
+    assert [
+        name for name, comparison in comparisons.items() if comparison.regression
+    ] == ["slower", "bigger"]
+    assert comparisons["slower"].time_ratio == 1.5
+    assert comparisons["bigger"].memory_ratio == 2
+    assert comparisons["added"].baseline is None
+    assert comparisons["removed"].time_ratio is None
+
+
+def test_run_and_compare(tmp_path) -> None:
+    baseline = str(tmp_path / "baseline.json")
+    result = runner.invoke(
+        app,
+        [
+            "run",
+            "--quick",
+            "--repeat",
+            "1",
+            "--filter",
+            "validate",
+            "--output",
+            baseline,
+        ],
+    )
+    assert result.exit_code == 0
+    assert "validate[wide-10]" in result.stdout
+
+    content = json.loads((tmp_path / "baseline.json").read_text())
+    assert set(content["packages"]) == set(suite.PACKAGES)
+    assert [result["name"] for result in content["results"]] == [
+        "validate[wide-10]",
+        "validate[deep-10]",
+        "validate[union-10]",
+    ]
+
+    result = runner.invoke(app, ["compare", baseline, baseline])
+    assert result.exit_code == 0
+    assert "1.00x" in result.stdout
+
+    content["results"][0]["median"] *= 2
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(content))
+    result = runner.invoke(app, ["compare", baseline, str(current)])
+    assert result.exit_code == 1
+    assert "1 regressions" in result.stdout
@@ -0,0 +1,92 @@
+import os
+
+from dc_avro import exceptions
+from dc_avro._cache import (
+    CachedResponse,
+    HttpCache,
+    ValidationCache,
+    default_cache_dir,
+    error_from_outcome,
+    outcome_from_error,
+)
+
+
+def test_default_cache_dir(monkeypatch) -> None:
+    monkeypatch.delenv("DC_AVRO_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/xdg")
+    assert default_cache_dir() == "/tmp/xdg/dc-avro"
+
+    monkeypatch.setenv("DC_AVRO_CACHE_DIR", "/tmp/dc-avro")
+    assert default_cache_dir() == "/tmp/dc-avro"
+
+
+def test_outcome_round_trip() -> None:
+    assert error_from_outcome(outcome_from_error(None)) is None
+
+    error = error_from_outcome(outcome_from_error(exceptions.InvalidSchema("boom")))
+    assert isinstance(error, exceptions.InvalidSchema)
+    assert str(error) == "boom"
+
+
+def test_get_set(cache_dir: str) -> None:
+    cache = ValidationCache(directory=cache_dir)
+    key = cache.key(b"{}")
+
+    assert key != cache.key(b"[]")
+    assert cache.get(key) is None
+
+    cache.set(key, {"error": None})
+    assert cache.get(key) == {"error": None}
+
+
+def test_key_depends_on_versions(cache_dir: str) -> None:
+    cache = ValidationCache(directory=cache_dir)
+    other_cache = ValidationCache(directory=cache_dir)
+    other_cache.salt = b"fastavro=0.0.0;dc-avro=0.0.0"
+
+    assert cache.key(b"{}") != other_cache.key(b"{}")
+
+
+def test_prune_evicts_least_recently_used(cache_dir: str) -> None:
+    cache = ValidationCache(directory=cache_dir)
+    keys = [cache.key(str(index).encode()) for index in range(4)]
+    for mtime, key in enumerate(keys):
+        cache.set(key, {"error": None})
+        os.utime(cache._entry_path(key), (mtime, mtime))
+
+    entry_size = os.path.getsize(cache._entry_path(keys[0]))
+    cache.max_size = entry_size * 2
+    cache.prune()
+
+    assert [cache.get(key) is not None for key in keys] == [False, False, True, True]
+
+
+def test_prune_empty_cache(cache_dir: str) -> None:
+    ValidationCache(directory=cache_dir).prune()
+
+
+def test_unwritable_cache_dir(tmp_path) -> None:
+    # the cache directory is inside a regular file
+    (tmp_path / "file").write_text("")
+    cache_dir = str(tmp_path / "file" / "cache")
+
+    cache = ValidationCache(directory=cache_dir)
+    key = cache.key(b"{}")
+    cache.set(key, {"error": None})
+    assert cache.get(key) is None
+    cache.prune()
+
+    http_cache = HttpCache(cache_dir)
+    http_cache.set("https://schema-registry/a.avsc", CachedResponse(content=b"{}"))
+    assert http_cache.get("https://schema-registry/a.avsc") is None
+
+
+def test_http_cache(tmp_path) -> None:
+    cache = HttpCache(str(tmp_path))
+    url = "https://schema-registry/example.avsc"
+    assert cache.get(url) is None
+
+    response = CachedResponse(content=b"\x00\xff{}", etag='"v1"')
+    cache.set(url, response)
+    assert cache.get(url) == response
+    assert cache.get(url + "?version=2") is None
@@ -1,13 +1,18 @@
 import ast
+import io
+import json
 import os
 from unittest import mock
 
+import fastavro
+import httpx
 import pytest
 from dataclasses_avroschema import ModelType
 from httpx import Response, codes
 from typer.testing import CliRunner
 
 from dc_avro._types import JsonDict, SerializationType
+from dc_avro.exceptions import IncompatibleSchema
 from dc_avro.main import app
 
 runner = CliRunner()
@@ -25,7 +30,7 @@ def test_validate_schema_from_path(schema_dir: str):
 
 def test_validate_schema_from_url(example_schema_json: JsonDict):
     response = Response(status_code=codes.OK, json=example_schema_json)
-    with mock.patch("dc_avro.main._schema_utils.httpx.get", return_value=response):
+    with mock.patch("dc_avro._http.get", return_value=response):
         result = runner.invoke(app, ["validate-schema", "--url", url])
         assert result.exit_code == 0
         assert "Valid schema!!" in result.stdout
@@ -94,7 +99,7 @@ def test_generate_model_from_url(
 ):
     expected_output = request.getfixturevalue(expected_output)
     response = Response(status_code=codes.OK, json=example_schema_json)
-    with mock.patch("dc_avro.main._schema_utils.httpx.get", return_value=response):
+    with mock.patch("dc_avro._http.get", return_value=response):
         result = runner.invoke(
             app, ["generate-model", "--url", url, "--model-type", model_type]
         )
@@ -102,6 +107,55 @@ def test_generate_model_from_url(
         assert expected_output == result.stdout
 
 
+def test_generate_models(schema_dir: str, tmp_path):
+    output = str(tmp_path / "models")
+    result = runner.invoke(
+        app,
+        ["generate-models", schema_dir, "--output", output, "--jobs", "2"],
+    )
+    assert result.exit_code == 1
+    assert "Modules written: 3, unchanged: 0, removed: 0" in result.stdout
+    assert "invalid_example.avsc" in result.stdout
+    # both versions of the schema use the same enum
+    with open(os.path.join(output, "example.py")) as module:
+        assert module.readline() == "from .common import FavoriteColor\n"
+
+    result = runner.invoke(
+        app,
+        ["generate-models", schema_dir, "--output", output, "--exclude", "invalid_*"],
+    )
+    assert result.exit_code == 0
+    assert "Modules written: 0, unchanged: 3, removed: 0" in result.stdout
+
+    result = runner.invoke(
+        app,
+        [
+            "generate-models",
+            schema_dir,
+            "--output",
+            output,
+            "--exclude",
+            "invalid_*",
+            "--force",
+        ],
+    )
+    assert "Modules written: 3, unchanged: 0, removed: 0" in result.stdout
+
+
+def test_generate_models_dry_run(schema_dir: str, tmp_path):
+    output = str(tmp_path / "models")
+    command = ["generate-models", schema_dir, "--output", output]
+    command += ["--exclude", "invalid_*"]
+    result = runner.invoke(app, [*command, "--dry-run"])
+    assert result.exit_code == 0
+    assert result.stdout.split() == ["example.py", "example_v2.py"]
+    assert not os.path.exists(output)
+
+    runner.invoke(app, command)
+    result = runner.invoke(app, [*command, "--dry-run"])
+    assert result.stdout == ""
+
+
 @pytest.mark.parametrize(
     "only_deltas, num_lines, total_output_len",
     ((True, 5, 2535), (True, 10, 2940), (False, 0, 6018)),
@@ -127,6 +181,28 @@ def test_schema_table_diff(
     assert len(result.stdout) == total_output_len
 
 
+def test_schema_table_diff_pages(schema_dir: str):
+    result = runner.invoke(
+        app,
+        [
+            "schema-diff",
+            "--source-path",
+            os.path.join(schema_dir, "example.avsc"),
+            "--target-path",
+            os.path.join(schema_dir, "example_v2.avsc"),
+            "--only-deltas",
+            "--page-size",
+            "10",
+        ],
+    )
+    assert result.exit_code == 0
+    assert result.stdout.count("Schema Diff") == 1
+    # only the first table has the column names
+    assert result.stdout.count("┏") == 1
+    # one table per page
+    assert result.stdout.count("└") == 3
+
+
 @pytest.mark.parametrize(
     "only_deltas, num_lines, total_output_len",
     ((True, 5, 902), (True, 10, 1064), (False, 0, 2502)),
@@ -185,6 +261,27 @@ def test_schema_unified_diff(
     assert len(result.stdout) <= total_output_len
 
 
+def test_schema_semantic_diff(schema_dir: str):
+    result = runner.invoke(
+        app,
+        [
+            "schema-diff",
+            "--source-path",
+            os.path.join(schema_dir, "example.avsc"),
+            "--target-path",
+            os.path.join(schema_dir, "example_v2.avsc"),
+            "--type",
+            "semantic",
+        ],
+    )
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == [
+        '~ UserAdvance.country.default: "Argentina" -> "Netherlands"',
+        '+ UserAdvance.address[int]: "int"',
+        '- UserAdvance.md5: "md5"',
+    ]
+
+
 def test_generate_model_two_options(schema_dir: str):
     result = runner.invoke(
         app,
@@ -254,7 +351,7 @@ def test_serialize_from_url(
     data = "{'name': 'bond', 'age': 50, 'pets': ['dog', 'cat'], 'accounts': {'key': 1}, 'has_car': False, 'favorite_colors': 'BLUE', 'country': 'Argentina', 'address': None, 'md5': b'u00ffffffffffffx'}"
 
     response = Response(status_code=codes.OK, json=example_schema_json)
-    with mock.patch("dc_avro.main._schema_utils.httpx.get", return_value=response):
+    with mock.patch("dc_avro._http.get", return_value=response):
         result = runner.invoke(
             app,
             [
@@ -354,7 +451,7 @@ def test_deserialize_from_url(
     }
 
     response = Response(status_code=codes.OK, json=example_schema_json)
-    with mock.patch("dc_avro.main._schema_utils.httpx.get", return_value=response):
+    with mock.patch("dc_avro._http.get", return_value=response):
         result = runner.invoke(
             app,
             [
@@ -423,3 +520,549 @@ def test_generate_data_from_path(schema_dir: str):
         app, ["generate-data", os.path.join(schema_dir, "example.avsc")]
     )
     assert result.exit_code == 0
+
+
+def test_generate_data_output(schema_dir: str, tmp_path):
+    schema_path = os.path.join(schema_dir, "example.avsc")
+    result = runner.invoke(
+        app, ["generate-data", schema_path, "--count", "10", "--output", "-"]
+    )
+    assert result.exit_code == 0
+    assert len(result.stdout.rstrip("\n").split("\n")) == 10
+    assert "Generated 10 records" in result.stderr
+
+    output = tmp_path / "data.avro"
+    result = runner.invoke(
+        app,
+        [
+            "generate-data",
+            schema_path,
+            "--count",
+            "10",
+            "--output",
+            str(output),
+            "--output-format",
+            "container",
+            "--codec",
+            "deflate",
+        ],
+    )
+    assert result.exit_code == 0
+    with open(output, "rb") as container:
+        assert len(list(fastavro.reader(container))) == 10
+
+
+def test_generate_data_jobs_and_seed(schema_dir: str, tmp_path):
+    schema_path = os.path.join(schema_dir, "example.avsc")
+    command = ["generate-data", schema_path, "--count", "20", "--seed", "3"]
+
+    outputs = []
+    for name in ("first.avro", "second.avro"):
+        output = tmp_path / name
+        result = runner.invoke(
+            app,
+            command
+            + ["-j", "2", "--output", str(output), "--output-format", "container"],
+        )
+        assert result.exit_code == 0
+        outputs.append(output.read_bytes())
+    assert outputs[0] == outputs[1]
+
+    result = runner.invoke(
+        app, command + ["-j", "2", "--output", str(tmp_path / "shard-{shard}.ndjson")]
+    )
+    assert result.exit_code == 0
+    assert sorted(os.listdir(tmp_path))[-2:] == ["shard-0.ndjson", "shard-1.ndjson"]
+
+    result = runner.invoke(app, command + ["-j", "2"])
+    assert result.exit_code == 2
+
+
+def test_generate_data_rate(schema_dir: str):
+    schema_path = os.path.join(schema_dir, "example.avsc")
+    result = runner.invoke(
+        app, ["generate-data", schema_path, "--rate", "200", "--duration", "0.1"]
+    )
+    assert result.exit_code == 0
+    assert len(result.stdout.rstrip("\n").split("\n")) == 20
+    assert "sent=20" in result.stderr
+
+    result = runner.invoke(
+        app, ["generate-data", schema_path, "--rate", "1000", "--count", "5"]
+    )
+    assert result.exit_code == 0
+    assert len(result.stdout.rstrip("\n").split("\n")) == 5
+    assert "sent=5" in result.stderr
+
+    result = runner.invoke(
+        app,
+        ["generate-data", schema_path, "--rate", "200", "--output-format", "container"],
+    )
+    assert result.exit_code == 2
+
+
+def test_lint_jobs(schema_dir: str):
+    result = runner.invoke(
+        app,
+        [
+            "lint",
+            os.path.join(schema_dir, "example.avsc"),
+            os.path.join(schema_dir, "example_v2.avsc"),
+            "--jobs",
+            "2",
+        ],
+    )
+    assert result.exit_code == 0
+    assert "Total valid schemas: 2" in result.stdout
+
+    result = runner.invoke(
+        app,
+        [
+            "lint",
+            os.path.join(schema_dir, "example.avsc"),
+            os.path.join(schema_dir, "invalid_example.avsc"),
+            "-j",
+            "0",
+        ],
+    )
+    assert result.exit_code == 1
+    assert "invalid_example.avsc" in result.stdout
+
+
+def test_lint_cache(schema_dir: str, cache_dir: str):
+    path = os.path.join(schema_dir, "example.avsc")
+
+    result = runner.invoke(app, ["lint", path, "--no-cache"])
+    assert result.exit_code == 0
+    assert not os.path.exists(cache_dir)
+
+    result = runner.invoke(app, ["lint", path])
+    assert result.exit_code == 0
+    assert os.path.exists(cache_dir)
+
+    with mock.patch("dc_avro._lint._lint_content") as lint_content:
+        result = runner.invoke(app, ["lint", path])
+        lint_content.assert_not_called()
+    assert result.exit_code == 0
+    assert "Total valid schemas: 1" in result.stdout
+
+
+def test_validate_schema_cache_dir(schema_dir: str, tmp_path):
+    cache_dir = str(tmp_path / "other-cache")
+    result = runner.invoke(
+        app,
+        [
+            "validate-schema",
+            "--path",
+            os.path.join(schema_dir, "example.avsc"),
+            "--cache-dir",
+            cache_dir,
+        ],
+    )
+    assert result.exit_code == 0
+    assert os.listdir(cache_dir)
+
+
+def test_lint_unwritable_cache_dir(schema_dir: str, tmp_path, monkeypatch):
+    (tmp_path / "file").write_text("")
+    monkeypatch.setenv("DC_AVRO_CACHE_DIR", str(tmp_path / "file" / "cache"))
+    path = os.path.join(schema_dir, "example.avsc")
+
+    result = runner.invoke(app, ["lint", path])
+    assert result.exit_code == 0
+    assert "Total valid schemas: 1" in result.stdout
+
+    result = runner.invoke(app, ["validate-schema", "--path", path])
+    assert result.exit_code == 0
+
+
+def test_lint_directory(schema_dir: str):
+    result = runner.invoke(app, ["lint", schema_dir, "--exclude", "invalid_*"])
+    assert result.exit_code == 0
+    assert "Total valid schemas: 2" in result.stdout
+
+    result = runner.invoke(app, ["lint", schema_dir, "--include", "*.txt"])
+    assert result.exit_code == 1
+    assert "invalid_resource.txt" in result.stdout
+
+
+@pytest.mark.parametrize("resolve_references, exit_code", ((True, 0), (False, 1)))
+def test_lint_resolve_references(tmp_path, resolve_references: bool, exit_code: int):
+    address = {
+        "type": "record",
+        "name": "Address",
+        "fields": [{"name": "street", "type": "string"}],
+    }
+    user = {
+        "type": "record",
+        "name": "User",
+        "fields": [{"name": "address", "type": "Address"}],
+    }
+    (tmp_path / "address.avsc").write_text(json.dumps(address))
+    (tmp_path / "user.avsc").write_text(json.dumps(user))
+
+    result = runner.invoke(
+        app,
+        [
+            "lint",
+            str(tmp_path),
+            "--resolve-references" if resolve_references else "--no-resolve-references",
+        ],
+    )
+    assert result.exit_code == exit_code
+
+
+def test_lint_watch(schema_dir: str):
+    with mock.patch("time.sleep", side_effect=KeyboardInterrupt):
+        result = runner.invoke(app, ["lint", schema_dir, "--watch"])
+
+    assert result.exit_code == 0
+    assert result.stdout.count("💥 File:") == 1
+    assert "invalid_example.avsc" in result.stdout
+    assert "Linted 3 files" in result.stdout
+    assert "total errors: 1" in result.stdout
+
+
+def test_lint_watch_urls():
+    result = runner.invoke(
+        app, ["lint", "--watch", "https://schema-registry/schema.avsc"]
+    )
+    assert result.exit_code == 2
+
+
+def test_lint_watch_format(schema_dir: str):
+    result = runner.invoke(app, ["lint", "--watch", schema_dir, "--format", "jsonl"])
+    assert result.exit_code == 2
+
+
+def test_lint_format(schema_dir: str):
+    result = runner.invoke(app, ["lint", schema_dir, "--format", "jsonl"])
+    assert result.exit_code == 1
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [line["valid"] for line in lines] == [True, True, False]
+
+    result = runner.invoke(
+        app, ["lint", schema_dir, "--format", "sarif", "--exclude", "invalid_*"]
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["runs"][0]["results"] == []
+
+
+def test_lint_fail_fast(schema_dir: str):
+    files = [
+        os.path.join(schema_dir, name)
+        for name in ("invalid_example.avsc", "example.avsc")
+    ]
+    result = runner.invoke(app, ["lint", *files, "--format", "jsonl", "--fail-fast"])
+    assert result.exit_code == 1
+    assert len(result.stdout.splitlines()) == 1
+
+    result = runner.invoke(app, ["lint", *files, "--fail-fast"])
+    assert result.exit_code == 1
+    assert "Total valid schemas" not in result.stdout
+
+
+def test_lint_urls(example_schema_json: JsonDict, schema_dir: str):
+    def handler(request: httpx.Request) -> Response:
+        return Response(status_code=codes.OK, json=example_schema_json)
+
+    subjects = Response(
+        status_code=codes.OK,
+        json=["users-value", "orders-value"],
+        request=httpx.Request("GET", "https://schema-registry/subjects"),
+    )
+    with (
+        mock.patch(
+            "dc_avro._http.get_async_client",
+            return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ),
+        mock.patch("dc_avro._http.get", return_value=subjects),
+    ):
+        result = runner.invoke(
+            app,
+            [
+                "lint",
+                os.path.join(schema_dir, "example.avsc"),
+                url,
+                "--registry",
+                "https://schema-registry",
+                "--concurrency",
+                "2",
+            ],
+        )
+    assert result.exit_code == 0
+    assert "Total valid schemas: 4" in result.stdout
+    assert "subjects/orders-value/versions/latest/schema" in result.stdout
+
+    result = runner.invoke(app, ["lint"])
+    assert result.exit_code == 2
+
+
+def test_serialize_stream(schema_dir: str, tmp_path):
+    records = [
+        {
+            "name": "bond",
+            "age": 50,
+            "pets": ["dog", "cat"],
+            "accounts": {"key": 1},
+            "favorite_colors": "BLUE",
+            "address": None,
+            "md5": "u00ffffffffffffx",
+        }
+    ] * 3
+    output = tmp_path / "records.avro"
+
+    result = runner.invoke(
+        app,
+        [
+            "serialize",
+            "--path",
+            os.path.join(schema_dir, "example.avsc"),
+            "--input",
+            "-",
+            "--output",
+            str(output),
+        ],
+        input="\n".join(json.dumps(record) for record in records),
+    )
+    assert result.exit_code == 0
+
+    with open(output, "rb") as container:
+        assert len(list(fastavro.reader(container))) == 3
+
+    result = runner.invoke(
+        app,
+        [
+            "serialize",
+            "--path",
+            os.path.join(schema_dir, "example.avsc"),
+            "--input",
+            "-",
+            "--output-format",
+            "length-prefixed",
+        ],
+        input=json.dumps(records),
+    )
+    assert result.exit_code == 0
+    assert result.stdout_bytes.startswith(b"\x00\x00\x00")
+
+
+def test_serialize_data_and_input(schema_dir: str):
+    result = runner.invoke(
+        app,
+        [
+            "serialize",
+            "{}",
+            "--path",
+            os.path.join(schema_dir, "example.avsc"),
+            "--input",
+            "-",
+        ],
+    )
+    assert result.exit_code == 2
+
+
+def test_deserialize_stream(schema_dir: str, tmp_path):
+    records = [{"name": "bond", "age": 50}, {"name": "alice", "age": 30}]
+    schema = {
+        "type": "record",
+        "name": "User",
+        "fields": [
+            {"name": "name", "type": "string"},
+            {"name": "age", "type": "long"},
+        ],
+    }
+    container = tmp_path / "users.avro"
+    with open(container, "wb") as output:
+        fastavro.writer(output, schema, records)
+
+    result = runner.invoke(app, ["deserialize", "--input", str(container)])
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in result.stdout.splitlines()] == records
+
+    schema_path = tmp_path / "user.avsc"
+    schema_path.write_text(json.dumps(schema))
+    messages = b""
+    for record in records:
+        message = io.BytesIO()
+        fastavro.schemaless_writer(message, schema, record)
+        messages += len(message.getvalue()).to_bytes(4, "big") + message.getvalue()
+
+    output = tmp_path / "users.ndjson"
+    result = runner.invoke(
+        app,
+        [
+            "deserialize",
+            "--input",
+            "-",
+            "--input-format",
+            "length-prefixed",
+            "--path",
+            str(schema_path),
+            "--output",
+            str(output),
+        ],
+        input=messages,
+    )
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in output.read_text().splitlines()] == records
+
+
+def test_deserialize_event_or_input_required(schema_dir: str):
+    result = runner.invoke(
+        app, ["deserialize", "--path", os.path.join(schema_dir, "example.avsc")]
+    )
+    assert result.exit_code == 2
+
+    result = runner.invoke(
+        app,
+        [
+            "deserialize",
+            "{}",
+            "--path",
+            os.path.join(schema_dir, "example.avsc"),
+            "--input",
+            "-",
+        ],
+    )
+    assert result.exit_code == 2
+
+
+def test_deserialize_mmap(tmp_path):
+    records = [{"name": f"user-{index}", "age": index} for index in range(50)]
+    schema = {
+        "type": "record",
+        "name": "User",
+        "fields": [
+            {"name": "name", "type": "string"},
+            {"name": "age", "type": "long"},
+        ],
+    }
+    container = tmp_path / "users.avro"
+    with open(container, "wb") as output:
+        fastavro.writer(output, schema, records, codec="deflate", sync_interval=100)
+
+    result = runner.invoke(app, ["deserialize", "--input", str(container), "--mmap"])
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in result.stdout.splitlines()] == records
+
+    result = runner.invoke(
+        app, ["deserialize", "--input", str(container), "--offset", "1", "--limit", "1"]
+    )
+    assert result.exit_code == 0
+    first_block = [json.loads(line) for line in result.stdout.splitlines()]
+    assert 0 < len(first_block) < len(records)
+    assert first_block == records[: len(first_block)]
+
+    result = runner.invoke(app, ["deserialize", "--input", str(container), "-j", "2"])
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in result.stdout.splitlines()] == records
+
+    result = runner.invoke(app, ["deserialize", "--input", "-", "--mmap"])
+    assert result.exit_code == 2
+
+
+def test_deserialize_mmap_empty_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "empty.avro").write_bytes(b"")
+
+    for option in ("--mmap", "-j2"):
+        result = runner.invoke(app, ["deserialize", "--input", "empty.avro", option])
+        assert result.exit_code == 2
+        assert "is empty" in result.stderr
+
+
+def test_lint_registry_cache_dir(schema_registry: str, cache_dir: str, tmp_path):
+    other_cache_dir = str(tmp_path / "other-cache")
+
+    result = runner.invoke(
+        app, ["lint", "--registry", schema_registry, "--cache-dir", other_cache_dir]
+    )
+    assert result.exit_code == 0
+    assert os.listdir(os.path.join(other_cache_dir, "http"))
+    assert not os.path.exists(cache_dir)
+
+    result = runner.invoke(app, ["lint", "--registry", schema_registry, "--no-cache"])
+    assert result.exit_code == 0
+    assert not os.path.exists(cache_dir)
+
+
+def test_registry_snapshot_cache(schema_registry: str, cache_dir: str, tmp_path):
+    directory = str(tmp_path / "snapshot")
+    args = ["registry", "snapshot", "--url", schema_registry, "--output", directory]
+
+    result = runner.invoke(app, args + ["--no-cache"])
+    assert result.exit_code == 0
+    assert not os.path.exists(cache_dir)
+
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert os.listdir(os.path.join(cache_dir, "http"))
+
+
+def test_registry_snapshot(schema_registry: str, tmp_path, monkeypatch):
+    directory = str(tmp_path / "snapshot")
+    result = runner.invoke(
+        app, ["registry", "snapshot", "--url", schema_registry, "--output", directory]
+    )
+    assert result.exit_code == 0
+    assert "2 subjects and 3 versions" in result.stdout
+
+    monkeypatch.setenv("DC_AVRO_REGISTRY_SNAPSHOT", directory)
+    result = runner.invoke(app, ["validate-schema", "--url", "registry://users-value"])
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, ["lint", "registry://users-value/1"])
+    assert result.exit_code == 0
+    assert "Total valid schemas: 1" in result.stdout
+
+    result = runner.invoke(
+        app,
+        [
+            "schema-diff",
+            "--source-url",
+            "registry://users-value/1",
+            "--target-url",
+            "registry://users-value/2",
+            "--type",
+            "unified",
+        ],
+    )
+    assert result.exit_code == 0
+    assert '"age"' in result.stdout
+
+
+def test_compatibility(schema_dir: str):
+    previous = os.path.join(schema_dir, "example.avsc")
+    path = os.path.join(schema_dir, "example_v2.avsc")
+
+    result = runner.invoke(app, ["compatibility", previous, "--path", path])
+    assert result.exit_code == 0
+    assert f"backward compatible with {previous}" in result.stdout
+
+    result = runner.invoke(
+        app, ["compatibility", previous, "--path", path, "--level", "full"]
+    )
+    assert result.exit_code == 1
+    assert f"forward incompatible with {previous}" in result.stdout
+    assert "UserAdvance.address[int]: int is not a branch of null | string" in (
+        result.stdout
+    )
+    assert isinstance(result.exception, IncompatibleSchema)
+
+
+def test_compatibility_transitive(schema_dir: str):
+    path = os.path.join(schema_dir, "example.avsc")
+    previous = [os.path.join(schema_dir, "example_v2.avsc"), path]
+
+    result = runner.invoke(app, ["compatibility", *previous, "--path", path])
+    assert result.exit_code == 0
+    assert "example_v2.avsc" not in result.stdout
+
+    result = runner.invoke(
+        app, ["compatibility", *previous, "--path", path, "--transitive"]
+    )
+    assert result.exit_code == 1
+    assert "UserAdvance.md5: field is not in the writer schema and has no default" in (
+        result.stdout
+    )
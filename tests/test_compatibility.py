@@ -0,0 +1,209 @@
+import typing
+
+import pytest
+
+from dc_avro._compatibility import (
+    CompatibilityChecker,
+    CompatibilityResult,
+    Incompatibility,
+    check_compatibility,
+    fingerprints,
+    named_types,
+)
+from dc_avro._schema_utils import parse
+from dc_avro._types import CompatibilityLevel
+
+
+def record(*fields: dict, name: str = "User", **attributes) -> dict:
+    return {"type": "record", "name": name, "fields": list(fields), **attributes}
+
+
+def check(reader: typing.Any, writer: typing.Any) -> typing.List[Incompatibility]:
+    return CompatibilityChecker().check(
+        reader=parse(schema=reader), writer=parse(schema=writer)
+    )
+
+
+@pytest.mark.parametrize(
+    "reader, writer",
+    (
+        ("long", "int"),
+        ("double", "int"),
+        ("double", "float"),
+        ("bytes", "string"),
+        ("string", "bytes"),
+        (["null", "long"], "int"),
+        (["null", "string"], ["string", "null"]),
+        ({"type": "array", "items": "long"}, {"type": "array", "items": "int"}),
+        (
+            {"type": "int", "logicalType": "date"},
+            "int",
+        ),
+    ),
+)
+def test_compatible_types(reader, writer) -> None:
+    assert check(reader, writer) == []
+
+
+@pytest.mark.parametrize(
+    "reader, writer, expected",
+    (
+        ("int", "long", [Incompatibility("int", "long can not be read as int")]),
+        (
+            {"type": "map", "values": "int"},
+            {"type": "map", "values": "string"},
+            [Incompatibility("map.values", "string can not be read as int")],
+        ),
+        (
+            ["null", "string"],
+            ["null", "string", "int"],
+            [
+                Incompatibility(
+                    "null | string[int]", "int is not a branch of null | string"
+                )
+            ],
+        ),
+        (
+            {"type": "fixed", "name": "md5", "size": 16},
+            {"type": "fixed", "name": "md5", "size": 32},
+            [Incompatibility("md5.size", "size 32 can not be read as 16")],
+        ),
+        (
+            record(name="Customer"),
+            record(name="User"),
+            [Incompatibility("Customer", "User can not be read as Customer")],
+        ),
+    ),
+)
+def test_incompatible_types(reader, writer, expected) -> None:
+    assert check(reader, writer) == expected
+
+
+def test_fields() -> None:
+    writer = record({"name": "name", "type": "string"}, {"name": "age", "type": "int"})
+    reader = record(
+        {"name": "full_name", "type": "string", "aliases": ["name"]},
+        {"name": "age", "type": "long"},
+        {"name": "email", "type": "string", "default": ""},
+    )
+
+    assert check(reader, writer) == []
+    assert check(writer, reader) == [
+        Incompatibility(
+            "User.name", "field is not in the writer schema and has no default"
+        ),
+        Incompatibility("User.age", "long can not be read as int"),
+    ]
+
+
+def test_enum_symbols() -> None:
+    writer = {"type": "enum", "name": "Color", "symbols": ["BLUE", "RED", "GREEN"]}
+    reader = {"type": "enum", "name": "Color", "symbols": ["BLUE", "RED"]}
+
+    assert check(writer, reader) == []
+    assert check(reader, writer) == [
+        Incompatibility(
+            "Color.symbols", "symbols GREEN are missing and there is no default"
+        )
+    ]
+    assert check({**reader, "default": "BLUE"}, writer) == []
+
+
+def test_renamed_record() -> None:
+    writer = record({"name": "name", "type": "string"}, namespace="com.example")
+    reader = record(
+        {"name": "name", "type": "string"},
+        name="Customer",
+        namespace="com.example",
+        aliases=["User"],
+    )
+
+    assert check(reader, writer) == []
+
+
+def test_recursive_types() -> None:
+    writer = record(
+        {"name": "value", "type": "int"},
+        {"name": "next", "type": ["null", "Node"]},
+        name="Node",
+    )
+    reader = record(
+        {"name": "value", "type": "long"},
+        {"name": "next", "type": ["null", "Node"]},
+        name="Node",
+    )
+
+    assert check(reader, writer) == []
+    assert check(writer, reader) == [
+        Incompatibility("Node.value", "long can not be read as int")
+    ]
+
+
+def test_fingerprints_include_references() -> None:
+    def schema(street_type: str) -> typing.Any:
+        return parse(
+            schema=record(
+                {
+                    "name": "billing",
+                    "type": record(
+                        {"name": "street", "type": street_type}, name="Address"
+                    ),
+                },
+                {"name": "shipping", "type": "Address"},
+                name="Order",
+            )
+        )
+
+    first = fingerprints(named_types(schema("string")))
+    second = fingerprints(named_types(schema("bytes")))
+
+    assert set(first) == {"Order", "Address"}
+    assert first["Address"] != second["Address"]
+    assert first["Order"] != second["Order"]
+    assert first == fingerprints(named_types(schema("string")))
+
+
+def test_named_types_checked_once() -> None:
+    address = record({"name": "street", "type": "string"}, name="Address")
+    versions = [
+        parse(
+            schema=record(
+                {"name": "address", "type": address}, {"name": "id", "type": id_type}
+            )
+        )
+        for id_type in ("int", "int", "long")
+    ]
+    checker = CompatibilityChecker()
+
+    for version in versions:
+        assert checker.check(reader=versions[-1], writer=version) == []
+
+    # Address is checked once, and User once per pair of different versions
+    assert len(checker._results) == 3
+
+
+def test_check_compatibility() -> None:
+    versions = [
+        ("v1", parse(schema=record({"name": "id", "type": "int"}))),
+        ("v2", parse(schema=record({"name": "id", "type": "long"}))),
+    ]
+    schema = parse(
+        schema=record(
+            {"name": "id", "type": "long"},
+            {"name": "email", "type": "string", "default": ""},
+        )
+    )
+
+    assert check_compatibility(schema, versions) == [
+        CompatibilityResult("v2", "backward", []),
+    ]
+    assert check_compatibility(
+        schema, versions, level=CompatibilityLevel.FULL, transitive=True
+    ) == [
+        CompatibilityResult("v1", "backward", []),
+        CompatibilityResult(
+            "v1", "forward", [Incompatibility("User.id", "long can not be read as int")]
+        ),
+        CompatibilityResult("v2", "backward", []),
+        CompatibilityResult("v2", "forward", []),
+    ]
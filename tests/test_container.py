@@ -0,0 +1,247 @@
+import io
+
+import fastavro
+import pytest
+
+from dc_avro import _container, exceptions
+from dc_avro._container import (
+    SYNC_SIZE,
+    decompress,
+    find_block,
+    iter_blocks,
+    iter_records,
+    iter_records_parallel,
+    open_mapped,
+    read_bytes,
+    read_header,
+    read_long,
+)
+
+SCHEMA = {
+    "type": "record",
+    "name": "User",
+    "fields": [
+        {"name": "name", "type": "string"},
+        {"name": "age", "type": "long"},
+    ],
+}
+RECORDS = [{"name": f"user-{index}", "age": index} for index in range(100)]
+
+
+def write_container(codec: str = "null", sync_interval: int = 100) -> bytes:
+    output = io.BytesIO()
+    fastavro.writer(output, SCHEMA, RECORDS, codec=codec, sync_interval=sync_interval)
+    return output.getvalue()
+
+
+def encode_long(value: int) -> bytes:
+    output = io.BytesIO()
+    fastavro.schemaless_writer(output, "long", value)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize(
+    "encoded, value",
+    (
+        (b"\x00", 0),
+        (b"\x01", -1),
+        (b"\x02", 1),
+        (b"\xac\x02", 150),
+    ),
+)
+def test_read_long(encoded: bytes, value: int):
+    assert read_long(encoded, 0) == (value, len(encoded))
+
+
+def test_read_long_truncated():
+    with pytest.raises(exceptions.InvalidData):
+        read_long(b"\x80", 0)
+
+
+def test_read_bytes_truncated():
+    assert bytes(read_bytes(b"\x06abc", 0)[0]) == b"abc"
+
+    with pytest.raises(exceptions.InvalidData):
+        read_bytes(b"\x06ab", 0)
+
+
+def test_read_header():
+    container = write_container(codec="deflate")
+    header = read_header(container)
+
+    assert header.codec == "deflate"
+    assert header.schema["name"] == "User"
+    assert container[header.end - 16 : header.end] == header.sync
+
+
+def test_read_header_invalid_magic():
+    with pytest.raises(exceptions.InvalidData):
+        read_header(b"not an avro file")
+
+
+def test_read_header_metadata_block_size():
+    container = write_container()
+    header = read_header(container)
+
+    # the same metadata map, in a block with a negative count and its size
+    metadata = b"".join(
+        encode_long(len(key)) + key.encode() + encode_long(len(value)) + value
+        for key, value in header.metadata.items()
+    )
+    encoded = (
+        container[:4]
+        + encode_long(-len(header.metadata))
+        + encode_long(len(metadata))
+        + metadata
+        + b"\x00"
+        + container[header.end - SYNC_SIZE :]
+    )
+
+    assert read_header(encoded).metadata == header.metadata
+    assert list(iter_records(encoded)) == RECORDS
+
+
+def test_find_block():
+    container = write_container()
+    header = read_header(container)
+    blocks = list(iter_blocks(container, header))
+
+    view = memoryview(container)
+    assert find_block(view, header, 0) == header.end
+    assert find_block(view, header, blocks[0].position + 1) == blocks[1].position
+    # the last block is followed by the end of the file
+    assert find_block(view, header, blocks[-1].position + 1) == len(container)
+    # there is no sync marker after the offset
+    data = container + b"garbage"
+    assert find_block(data, header, len(container) + 1) == len(data)
+
+
+def test_iter_blocks():
+    container = write_container()
+    header = read_header(container)
+    blocks = list(iter_blocks(container, header))
+
+    assert len(blocks) > 1
+    assert sum(block.records for block in blocks) == len(RECORDS)
+    assert all(isinstance(block.data, memoryview) for block in blocks)
+
+
+def test_iter_blocks_invalid_sync_marker():
+    container = bytearray(write_container())
+    container[-1] ^= 0xFF
+
+    with pytest.raises(exceptions.InvalidData):
+        list(iter_blocks(bytes(container), read_header(bytes(container))))
+
+
+@pytest.mark.parametrize("codec", ("null", "deflate", "bzip2", "xz"))
+def test_iter_records(codec: str):
+    container = write_container(codec=codec)
+    assert list(iter_records(container)) == RECORDS
+
+
+def test_iter_records_offset_and_limit():
+    container = write_container()
+    header = read_header(container)
+    blocks = list(iter_blocks(container, header))
+    second = blocks[1]
+
+    # any offset inside the first block starts from the second block
+    records = list(iter_records(container, offset=blocks[0].position + 1, limit=1))
+    assert records == RECORDS[blocks[0].records : blocks[0].records + second.records]
+    assert list(iter_records(container, offset=len(container))) == []
+    assert list(iter_records(container, limit=0)) == []
+
+
+def test_iter_records_reader_schema():
+    container = write_container()
+    reader_schema = fastavro.parse_schema(
+        {
+            "type": "record",
+            "name": "User",
+            "fields": [{"name": "name", "type": "string"}],
+        }
+    )
+
+    assert list(iter_records(container, reader_schema=reader_schema)) == [
+        {"name": record["name"]} for record in RECORDS
+    ]
+
+
+def test_decompress_unknown_codec():
+    with pytest.raises(exceptions.InvalidData):
+        decompress("unknown", memoryview(b""))
+
+
+def test_open_mapped(tmp_path):
+    path = tmp_path / "users.avro"
+    path.write_bytes(write_container(codec="deflate"))
+
+    with open_mapped(str(path)) as buffer:
+        assert list(iter_records(buffer)) == RECORDS
+
+
+def test_open_mapped_empty_file(tmp_path):
+    path = tmp_path / "empty.avro"
+    path.write_bytes(b"")
+
+    with pytest.raises(exceptions.InvalidData, match="is empty"):
+        with open_mapped(str(path)):
+            ...
+    with pytest.raises(exceptions.InvalidData, match="is empty"):
+        list(iter_records_parallel(str(path), jobs=2))
+
+
+def test_open_mapped_record_iterator_not_exhausted(tmp_path):
+    path = tmp_path / "users.avro"
+    path.write_bytes(write_container())
+
+    with open_mapped(str(path)) as buffer:
+        records = iter_records(buffer)
+        assert next(records) == RECORDS[0]
+    # the map is still exported by the iterator, it is closed when released
+    assert next(records) == RECORDS[1]
+    records.close()
+
+
+def test_decode_block_in_worker(tmp_path):
+    path = tmp_path / "users.avro"
+    container = write_container(codec="deflate")
+    path.write_bytes(container)
+    header = read_header(container)
+    blocks = list(iter_blocks(container, header))
+
+    _container._init_worker(str(path), header, None)
+    try:
+        assert (
+            _container._decode_block_at(blocks[1].position)
+            == (RECORDS[blocks[0].records : blocks[0].records + blocks[1].records])
+        )
+    finally:
+        _container._worker.pop("buffer").close()
+        _container._worker.clear()
+
+
+def test_decompress_lz4():
+    pytest.importorskip("lz4.block")
+
+    container = write_container(codec="lz4")
+    assert read_header(container).codec == "lz4"
+    assert list(iter_records(container)) == RECORDS
+
+
+@pytest.mark.parametrize("codec", ("null", "deflate"))
+def test_iter_records_parallel(tmp_path, codec: str):
+    path = tmp_path / "users.avro"
+    container = write_container(codec=codec)
+    path.write_bytes(container)
+
+    assert list(iter_records_parallel(str(path), jobs=2)) == RECORDS
+
+    blocks = list(iter_blocks(container, read_header(container)))
+    records = list(
+        iter_records_parallel(str(path), offset=blocks[0].position + 1, limit=2, jobs=2)
+    )
+    assert records == list(
+        iter_records(container, offset=blocks[0].position + 1, limit=2)
+    )
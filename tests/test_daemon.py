@@ -0,0 +1,289 @@
+import base64
+import os
+import runpy
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+import typer
+
+from dc_avro import __main__, _daemon, exceptions
+from dc_avro.main import app
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = str(tmp_path / "dc-avro.sock")
+    server = _daemon.DaemonServer(socket_path, typer.main.get_command(app))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_streams_stdio():
+    assert _daemon.streams_stdio(["deserialize", "--input", "-", "--output", "x"])
+    assert _daemon.streams_stdio(["serialize", "--input=-"])
+    # the records from a file are written to stdout by default
+    assert _daemon.streams_stdio(["deserialize", "--input", "events.avro"])
+    assert _daemon.streams_stdio(["serialize", "--input", "a.json", "--output=-"])
+    assert not _daemon.streams_stdio(
+        ["serialize", "--input", "a.json", "--output", "a.avro"]
+    )
+    assert not _daemon.streams_stdio(["serialize", "--output", "-"])
+    assert not _daemon.streams_stdio(["deserialize", "--input"])
+    # lint results streamed as they are validated
+    assert _daemon.streams_stdio(["lint", "--format", "junit", "schemas"])
+    assert _daemon.streams_stdio(["lint", "--format=jsonl", "schemas"])
+    assert not _daemon.streams_stdio(["lint", "--format", "text", "schemas"])
+
+
+def test_watches_files():
+    assert _daemon.watches_files(["lint", "--watch", "schemas"])
+    assert _daemon.watches_files(["lint", "--no-watch", "--watch", "schemas"])
+    assert not _daemon.watches_files(["lint", "--watch", "--no-watch", "schemas"])
+    assert not _daemon.watches_files(["lint", "schemas"])
+
+
+def test_forward(daemon, schema_dir, capsysbinary):
+    exit_code = _daemon.forward(
+        ["validate-schema", "--path", os.path.join(schema_dir, "example.avsc")],
+        daemon,
+    )
+
+    assert exit_code == 0
+    assert "Valid schema!!" in capsysbinary.readouterr().out.decode()
+
+
+def test_forward_uses_client_cwd_and_env(
+    daemon, schema_dir, tmp_path, capsysbinary, monkeypatch
+):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.chdir(schema_dir)
+    monkeypatch.setenv("DC_AVRO_CACHE_DIR", cache_dir)
+
+    assert _daemon.forward(["validate-schema", "--path", "example.avsc"], daemon) == 0
+    assert (
+        _daemon.forward(["validate-schema", "--path", "invalid_example.avsc"], daemon)
+        == 1
+    )
+    assert os.listdir(cache_dir)
+    assert os.environ.get("DC_AVRO_CACHE_DIR") == cache_dir
+
+    captured = capsysbinary.readouterr()
+    assert "Valid schema!!" in captured.out.decode()
+    assert "InvalidSchema" in captured.err.decode()
+
+
+def test_forward_usage_error(daemon, capsysbinary):
+    assert _daemon.forward(["validate-schema"], daemon) == 2
+    assert "--path or --url must be specified" in capsysbinary.readouterr().err.decode()
+
+
+def test_forward_binary_output(daemon, schema_dir, capsysbinary):
+    data = (
+        '{"name": "x", "age": 1, "pets": [], "accounts": {}, '
+        '"favorite_colors": "BLUE", "md5": b"0123456789abcdef"}'
+    )
+    path = os.path.join(schema_dir, "example.avsc")
+
+    assert _daemon.forward(["serialize", data, "--path", path], daemon) == 0
+    assert b"Argentina" in capsysbinary.readouterr().out
+
+
+def test_forward_files(daemon, tmp_path, capsysbinary):
+    schema = tmp_path / "user.avsc"
+    schema.write_text(
+        '{"type": "record", "name": "User", '
+        '"fields": [{"name": "name", "type": "string"}]}'
+    )
+    records = tmp_path / "records.json"
+    records.write_text('{"name": "bond"}\n')
+    output = tmp_path / "records.avro"
+    args = ["serialize", "--path", str(schema), "--input", str(records)]
+
+    assert _daemon.forward(args + ["--output", str(output)], daemon) == 0
+    assert capsysbinary.readouterr().out == b""
+    assert b"bond" in output.read_bytes()
+
+
+def test_forward_runs_locally(daemon, tmp_path):
+    assert _daemon.forward(["generate-data", "schema.avsc"], daemon) is None
+    assert _daemon.forward(["deserialize", "--input", "-"], daemon) is None
+    assert _daemon.forward(["deserialize", "--input", "events.avro"], daemon) is None
+    assert _daemon.forward([], daemon) is None
+    assert _daemon.forward(["lint", "--format", "sarif", "a.avsc"], daemon) is None
+    # runs until interrupted
+    assert _daemon.forward(["lint", "--watch", "a.avsc"], daemon) is None
+    # the daemon is not running
+    assert _daemon.forward(["lint", "."], str(tmp_path / "missing.sock")) is None
+
+
+def test_stale_socket(tmp_path):
+    socket_path = str(tmp_path / "dc-avro.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    server = _daemon.DaemonServer(socket_path, typer.main.get_command(app))
+    assert oct(os.stat(socket_path).st_mode & 0o777) == "0o600"
+
+    with pytest.raises(exceptions.DaemonError):
+        _daemon.DaemonServer(socket_path, typer.main.get_command(app))
+
+    server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_socket_path_is_not_a_socket(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("notes")
+
+    with pytest.raises(exceptions.DaemonError, match="is not a socket"):
+        _daemon.DaemonServer(str(path), typer.main.get_command(app))
+    assert path.read_text() == "notes"
+
+
+def test_main_forwards(daemon, schema_dir, capsysbinary, monkeypatch):
+    path = os.path.join(schema_dir, "example.avsc")
+    monkeypatch.setenv(_daemon.DAEMON_ENV, daemon)
+    monkeypatch.setattr(sys, "argv", ["dc-avro", "validate-schema", "--path", path])
+
+    with pytest.raises(SystemExit) as exc_info:
+        __main__.main()
+
+    assert exc_info.value.code == 0
+    assert "Valid schema!!" in capsysbinary.readouterr().out.decode()
+
+
+def test_serve(tmp_path, schema_dir):
+    socket_path = str(tmp_path / "dc-avro.sock")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "dc_avro", "serve", "--socket", socket_path],
+        stderr=subprocess.PIPE,
+    )
+    try:
+        assert server.stderr is not None
+        assert b"Listening on" in server.stderr.readline()
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "dc_avro",
+                "validate-schema",
+                "--path",
+                os.path.join(schema_dir, "invalid_example.avsc"),
+            ],
+            env={**os.environ, _daemon.DAEMON_ENV: socket_path},
+            capture_output=True,
+        )
+        assert result.returncode == 1
+        assert b"_daemon.py" in result.stderr
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    assert not os.path.exists(socket_path)
+
+
+def test_default_socket_path(monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert _daemon.default_socket_path() == "/run/user/1000/dc-avro.sock"
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert _daemon.default_socket_path().endswith(f"dc-avro-{os.getuid()}.sock")
+
+
+def test_forward_daemon_not_listening(tmp_path):
+    # left behind by a daemon that did not stop cleanly
+    socket_path = str(tmp_path / "dc-avro.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    assert _daemon.forward(["lint", "."], socket_path) is None
+
+
+def test_forward_invalid_response(tmp_path):
+    socket_path = str(tmp_path / "dc-avro.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+
+    def reply() -> None:
+        connection, _ = server.accept()
+        with connection:
+            connection.makefile(mode="rb").readline()
+            connection.sendall(b"not json\n")
+
+    thread = threading.Thread(target=reply, daemon=True)
+    thread.start()
+    try:
+        assert _daemon.forward(["lint", "."], socket_path) is None
+    finally:
+        thread.join()
+        server.close()
+
+
+class Command:
+    def __init__(self, error=None) -> None:
+        self.error = error
+
+    def main(self, args, prog_name):
+        print(" ".join(args))
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.mark.parametrize(
+    "error, exit_code, stderr",
+    (
+        (None, 0, ""),
+        (SystemExit(), 0, ""),
+        (SystemExit(3), 3, ""),
+        (SystemExit("Aborted!"), 1, "Aborted!\n"),
+        (ValueError("unexpected"), 1, "ValueError: unexpected"),
+    ),
+)
+def test_run(error, exit_code, stderr):
+    response = _daemon.run(Command(error), ["lint", "."])
+
+    assert response["exit_code"] == exit_code
+    assert base64.b64decode(response["stdout"]) == b"lint .\n"
+    assert stderr in base64.b64decode(response["stderr"]).decode()
+
+
+def test_warm_up():
+    _daemon.warm_up()
+    assert set(_daemon.WARM_MODULES) <= set(sys.modules)
+
+
+def test_main_runs_locally(schema_dir, capsys, monkeypatch):
+    path = os.path.join(schema_dir, "example.avsc")
+    monkeypatch.delenv(_daemon.DAEMON_ENV, raising=False)
+    monkeypatch.setattr(sys, "argv", ["dc-avro", "validate-schema", "--path", path])
+    # run like `python -m dc_avro`, which imports the module as __main__
+    monkeypatch.delitem(sys.modules, "dc_avro.__main__")
+
+    with pytest.raises(SystemExit) as exc_info:
+        runpy.run_module("dc_avro", run_name="__main__")
+
+    assert exc_info.value.code == 0
+    assert "Valid schema!!" in capsys.readouterr().out
+
+
+def test_main_daemon_not_running(tmp_path, schema_dir, capsys, monkeypatch):
+    path = os.path.join(schema_dir, "example.avsc")
+    monkeypatch.setenv(_daemon.DAEMON_ENV, str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(sys, "argv", ["dc-avro", "validate-schema", "--path", path])
+
+    with pytest.raises(SystemExit) as exc_info:
+        __main__.main()
+
+    assert exc_info.value.code == 0
+    assert "Valid schema!!" in capsys.readouterr().out
@@ -1,3 +1,4 @@
+import json
 import os
 from typing import Callable
 
@@ -6,12 +7,20 @@ from rich.table import Table
 
 from dc_avro._diff import (
     ADD_COLOR,
+    ADDED,
+    CHANGED,
     DELETE_COLOR,
+    REMOVED,
+    Change,
     TableDiff,
     context_diff,
+    format_changes,
+    iter_table_diff,
+    semantic_diff,
     table_diff,
     unified_diff,
 )
+from dc_avro.exceptions import InvalidSchema
 
 
 @pytest.mark.parametrize(
@@ -178,6 +187,64 @@ def test_table_diff_with_and_without_deltas(
     assert result.row_count == total_rows
 
 
+@pytest.mark.parametrize("page_size, pages", ((10, 3), (26, 1), (100, 1)))
+def test_iter_table_diff(page_size: int, pages: int, schema_dir: str) -> None:
+    source_name = os.path.join(schema_dir, "example.avsc")
+    target_name = os.path.join(schema_dir, "example_v2.avsc")
+
+    with open(source_name, mode="r") as source, open(target_name, mode="r") as target:
+        source_resource = source.readlines()
+        target_resource = target.readlines()
+
+    tables = list(
+        iter_table_diff(
+            source_resource=source_resource,
+            target_resource=target_resource,
+            source_name=source_name,
+            target_name=target_name,
+            only_deltas=True,
+            page_size=page_size,
+        )
+    )
+    table = table_diff(
+        source_resource=source_resource,
+        target_resource=target_resource,
+        source_name=source_name,
+        target_name=target_name,
+        only_deltas=True,
+    )
+
+    assert len(tables) == pages
+    assert [table.show_header for table in tables] == [True] + [False] * (pages - 1)
+    assert tables[0].title == "Schema Diff"
+    assert [cell for page in tables for cell in page.columns[0].cells] == list(
+        table.columns[0].cells
+    )
+
+
+def test_iter_table_diff_empty() -> None:
+    tables = list(
+        iter_table_diff(
+            source_resource=[],
+            target_resource=[],
+            source_name="Resource A",
+            target_name="Resource B",
+        )
+    )
+
+    assert len(tables) == 1
+    assert tables[0].row_count == 0
+
+
+def test_table_diff_shares_styles() -> None:
+    text = TableDiff.build_text(text="1 a", style={"color": ADD_COLOR})
+
+    assert TableDiff.build_text(text="2 b", style={"color": ADD_COLOR}).style is (
+        text.style
+    )
+    assert TableDiff.build_text(text="1 a").style is TableDiff.build_text("2").style
+
+
 @pytest.mark.parametrize(
     "content_one, content_two, expected_result",
     (
@@ -311,3 +378,165 @@ def test_unified_diff(
         source_name=source_resource,
         target_name=target_resource,
     )
+
+
+USER = {
+    "type": "record",
+    "name": "User",
+    "namespace": "com.example",
+    "fields": [
+        {"name": "name", "type": "string"},
+        {"name": "age", "type": "int", "default": 0},
+        {
+            "name": "color",
+            "type": {"type": "enum", "name": "Color", "symbols": ["BLUE", "RED"]},
+        },
+        {"name": "friend", "type": ["null", "User"], "default": None},
+    ],
+}
+
+
+def user(**changes) -> dict:
+    schema = json.loads(json.dumps(USER))
+    fields = {field["name"]: field for field in schema["fields"]}
+    for name, field in changes.items():
+        if field is None:
+            schema["fields"].remove(fields[name])
+        elif name in fields:
+            fields[name].clear()
+            fields[name].update(field)
+        else:
+            schema["fields"].append(field)
+    return schema
+
+
+def test_semantic_diff_ignores_formatting() -> None:
+    reordered = json.loads(json.dumps(USER, sort_keys=True))
+    reordered["fields"] = [
+        dict(reversed(field.items())) for field in reordered["fields"]
+    ]
+
+    assert semantic_diff(source_schema=USER, target_schema=reordered) == []
+
+
+@pytest.mark.parametrize(
+    "target, expected",
+    (
+        (
+            user(email={"name": "email", "type": "string"}),
+            [Change(ADDED, "com.example.User.email", target="string")],
+        ),
+        (
+            user(age=None),
+            [Change(REMOVED, "com.example.User.age", source="int")],
+        ),
+        (
+            user(age={"name": "age", "type": "long", "default": 0}),
+            [Change(CHANGED, "com.example.User.age", "int", "long")],
+        ),
+        (
+            user(age={"name": "age", "type": "int", "default": 18}),
+            [Change(CHANGED, "com.example.User.age.default", 0, 18)],
+        ),
+        (
+            user(age={"name": "age", "type": {"type": "int", "logicalType": "date"}}),
+            [
+                Change(REMOVED, "com.example.User.age.default", source=0),
+                Change(ADDED, "com.example.User.age.logicalType", target="date"),
+            ],
+        ),
+        (
+            user(
+                age={"name": "years", "type": "int", "default": 0, "aliases": ["age"]}
+            ),
+            [
+                Change(CHANGED, "com.example.User.age.name", "age", "years"),
+                Change(ADDED, "com.example.User.age.aliases", target=["age"]),
+            ],
+        ),
+        (
+            user(
+                color={
+                    "name": "color",
+                    "type": {
+                        "type": "enum",
+                        "name": "Color",
+                        "symbols": ["RED", "GREEN", "BLUE"],
+                    },
+                }
+            ),
+            [
+                Change(ADDED, "com.example.User.color.symbols", target="GREEN"),
+                Change(
+                    CHANGED,
+                    "com.example.User.color.symbols",
+                    ["BLUE", "RED"],
+                    ["RED", "BLUE"],
+                ),
+            ],
+        ),
+        (
+            user(friend={"name": "friend", "type": ["User", "null", "string"]}),
+            [
+                Change(REMOVED, "com.example.User.friend.default", source=None),
+                Change(ADDED, "com.example.User.friend[string]", target="string"),
+                Change(
+                    CHANGED,
+                    "com.example.User.friend",
+                    "null | com.example.User",
+                    "com.example.User | null",
+                ),
+            ],
+        ),
+    ),
+)
+def test_semantic_diff(target: dict, expected: list) -> None:
+    assert semantic_diff(source_schema=USER, target_schema=target) == expected
+
+
+def test_semantic_diff_named_types() -> None:
+    source = {
+        "type": "record",
+        "name": "Order",
+        "fields": [
+            {
+                "name": "billing",
+                "type": {
+                    "type": "record",
+                    "name": "Address",
+                    "fields": [{"name": "street", "type": "string"}],
+                },
+            },
+            {"name": "shipping", "type": "Address"},
+        ],
+    }
+    target = json.loads(json.dumps(source))
+    target["fields"][0]["type"]["name"] = "PostalAddress"
+    target["fields"][0]["type"]["aliases"] = ["Address"]
+    target["fields"][0]["type"]["fields"].append({"name": "city", "type": "string"})
+    target["fields"][1]["type"] = "PostalAddress"
+
+    # the renamed type is compared once, where it is defined
+    assert semantic_diff(source_schema=source, target_schema=target) == [
+        Change(CHANGED, "Order.billing.name", "Address", "PostalAddress"),
+        Change(ADDED, "Order.billing.aliases", target=["Address"]),
+        Change(ADDED, "Order.billing.city", target="string"),
+    ]
+
+
+def test_semantic_diff_invalid_schema(invalid_example_schema_json) -> None:
+    with pytest.raises(InvalidSchema):
+        semantic_diff(source_schema=USER, target_schema=invalid_example_schema_json)
+
+
+def test_format_changes() -> None:
+    changes = [
+        Change(ADDED, "User.email", target="string"),
+        Change(REMOVED, "User.age", source="int"),
+        Change(CHANGED, "User.name", "string", "bytes"),
+    ]
+
+    assert format_changes(changes).plain == (
+        '+ User.email: "string"\n- User.age: "int"\n~ User.name: "string" -> "bytes"'
+    )
+    assert format_changes([]).plain == "No changes"
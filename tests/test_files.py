@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+from dc_avro._files import compile_pattern, iter_schema_files
+
+
+@pytest.fixture
+def schema_tree(tmp_path) -> str:
+    for relative_path in (
+        "user.avsc",
+        "README.md",
+        "events/order.avsc",
+        "events/nested/payment.avsc",
+        "events/nested/payment.json",
+        "build/generated.avsc",
+        "legacy/old.avsc",
+        "legacy/keep.avsc",
+        ".git/objects.avsc",
+    ):
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}")
+
+    (tmp_path / ".gitignore").write_text("# generated files\nbuild/\n")
+    (tmp_path / "legacy" / ".gitignore").write_text("*.avsc\n!keep.avsc\n")
+    return str(tmp_path)
+
+
+def relative(root: str, paths) -> list:
+    return [os.path.relpath(path, root) for path in paths]
+
+
+@pytest.mark.parametrize(
+    "pattern, path, matches",
+    (
+        ("*.avsc", "user.avsc", True),
+        ("*.avsc", "events/nested/payment.avsc", True),
+        ("*.avsc", "events/payment.json", False),
+        ("events/*.avsc", "events/order.avsc", True),
+        ("events/*.avsc", "events/nested/payment.avsc", False),
+        ("events/**/*.avsc", "events/nested/payment.avsc", True),
+        ("**/*.avsc", "user.avsc", True),
+        ("/user.avsc", "user.avsc", True),
+        ("/user.avsc", "events/user.avsc", False),
+        ("user-v[0-9].avsc", "user-v1.avsc", True),
+        ("user-v[!0-9].avsc", "user-v1.avsc", False),
+        ("user?.avsc", "user1.avsc", True),
+        ("user?.avsc", "user/.avsc", False),
+    ),
+)
+def test_compile_pattern(pattern: str, path: str, matches: bool) -> None:
+    assert bool(compile_pattern(pattern).fullmatch(path)) is matches
+
+
+def test_walk_directory(schema_tree: str) -> None:
+    assert relative(schema_tree, iter_schema_files([schema_tree])) == [
+        "user.avsc",
+        "events/order.avsc",
+        "events/nested/payment.avsc",
+        "legacy/keep.avsc",
+    ]
+
+
+def test_walk_directory_without_ignore_files(schema_tree: str) -> None:
+    paths = iter_schema_files([schema_tree], use_ignore_files=False)
+    assert relative(schema_tree, paths) == [
+        "user.avsc",
+        "build/generated.avsc",
+        "events/order.avsc",
+        "events/nested/payment.avsc",
+        "legacy/keep.avsc",
+        "legacy/old.avsc",
+    ]
+
+
+def test_walk_include_exclude(schema_tree: str) -> None:
+    paths = iter_schema_files(
+        [schema_tree], include=["events/**/*.avsc", "*.json"], exclude=["nested/"]
+    )
+    assert relative(schema_tree, paths) == ["events/order.avsc"]
+
+
+def test_walk_is_lazy(schema_tree: str) -> None:
+    paths = iter_schema_files([schema_tree])
+    assert relative(schema_tree, [next(paths)]) == ["user.avsc"]
+
+
+def test_glob_and_files(schema_tree: str) -> None:
+    paths = iter_schema_files(
+        [
+            os.path.join(schema_tree, "events", "**", "*.avsc"),
+            os.path.join(schema_tree, "README.md"),
+            os.path.join(schema_tree, "legacy", "old.avsc"),
+        ],
+        exclude=["old.avsc"],
+    )
+    assert sorted(relative(schema_tree, paths)) == [
+        "README.md",
+        "events/nested/payment.avsc",
+        "events/order.avsc",
+    ]
+
+
+@pytest.mark.parametrize("exclude", ("legacy/", "legacy", "**/legacy"))
+def test_glob_and_files_exclude_directories(schema_tree: str, exclude: str) -> None:
+    paths = iter_schema_files(
+        [
+            os.path.join(schema_tree, "**", "*.avsc"),
+            os.path.join(schema_tree, "legacy", "keep.avsc"),
+        ],
+        exclude=[exclude],
+    )
+    assert sorted(relative(schema_tree, paths)) == [
+        "build/generated.avsc",
+        "events/nested/payment.avsc",
+        "events/order.avsc",
+        "user.avsc",
+    ]
+
+
+def test_files_exclude_relative_directories(schema_tree: str, monkeypatch) -> None:
+    monkeypatch.chdir(schema_tree)
+    paths = iter_schema_files(
+        ["legacy/keep.avsc", "./events/order.avsc", "user.avsc"],
+        exclude=["/legacy/", "/events"],
+    )
+    assert list(paths) == ["user.avsc"]
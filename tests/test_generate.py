@@ -0,0 +1,95 @@
+import io
+import os
+
+import fastavro
+import pytest
+
+from dc_avro._generate import (
+    derive_seed,
+    generate,
+    generate_shards,
+    seeded,
+    shard_counts,
+)
+from dc_avro._schema_utils import generate_data, get_schema
+from dc_avro._types import DataFormat
+
+SCHEMA = fastavro.parse_schema(
+    {
+        "type": "record",
+        "name": "Event",
+        "fields": [
+            {"name": "id", "type": {"type": "string", "logicalType": "uuid"}},
+            {"name": "value", "type": "long"},
+            {"name": "payload", "type": "bytes"},
+        ],
+    }
+)
+
+
+def generate_bytes(**kwargs) -> bytes:
+    output = io.BytesIO()
+    generate(output=output, schema=SCHEMA, **kwargs)
+    return output.getvalue()
+
+
+def test_shard_counts():
+    assert shard_counts(10, 3) == [4, 3, 3]
+    assert shard_counts(2, 4) == [1, 1, 0, 0]
+    assert sum(shard_counts(1001, 7)) == 1001
+
+
+def test_derive_seed():
+    assert derive_seed(1, 0) == derive_seed(1, 0)
+    assert derive_seed(1, 0) != derive_seed(1, 1)
+    assert derive_seed(1, 0) != derive_seed(2, 0)
+
+
+def test_seeded(schema_dir: str):
+    schema = get_schema(os.path.join(schema_dir, "example.avsc"))
+    with seeded(42):
+        first = generate_data(schema=schema, count=5)
+    with seeded(42):
+        second = generate_data(schema=schema, count=5)
+    with seeded(43):
+        third = generate_data(schema=schema, count=5)
+
+    assert first == second
+    assert first != third
+
+
+@pytest.mark.parametrize("output_format", list(DataFormat))
+@pytest.mark.parametrize("jobs", (1, 3))
+def test_generate_reproducible(output_format: DataFormat, jobs: int):
+    kwargs = {"count": 50, "jobs": jobs, "seed": 7, "output_format": output_format}
+
+    assert generate_bytes(**kwargs) == generate_bytes(**kwargs)
+    assert generate_bytes(**kwargs) != generate_bytes(**{**kwargs, "seed": 8})
+
+
+def test_generate_container_merged():
+    container = generate_bytes(
+        count=50, jobs=3, seed=7, output_format=DataFormat.CONTAINER, codec="deflate"
+    )
+    records = list(fastavro.reader(io.BytesIO(container)))
+
+    assert len(records) == 50
+    assert len({record["id"] for record in records}) == 50
+
+
+def test_generate_shards(tmp_path):
+    paths = [str(tmp_path / f"shard-{shard}.avro") for shard in range(3)]
+    total = generate_shards(
+        paths=paths,
+        schema=SCHEMA,
+        count=10,
+        seed=1,
+        output_format=DataFormat.CONTAINER,
+    )
+
+    assert total == 10
+    counts = []
+    for path in paths:
+        with open(path, "rb") as shard:
+            counts.append(len(list(fastavro.reader(shard))))
+    assert counts == [4, 3, 3]
@@ -0,0 +1,71 @@
+import httpx
+
+from dc_avro import _http
+from dc_avro._cache import HttpCache
+
+URL = "https://schema-registry/example.avsc"
+CONTENT = b'{"type": "string"}'
+
+
+def make_client(requests: list, headers: dict) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        etag = headers.get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(status_code=httpx.codes.NOT_MODIFIED)
+        return httpx.Response(
+            status_code=httpx.codes.OK, content=CONTENT, headers=headers
+        )
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_get_client():
+    assert _http.get_client() is _http.get_client()
+
+
+def test_get_conditional_request(tmp_path):
+    requests: list = []
+    client = make_client(requests, headers={"ETag": '"v1"'})
+    cache = HttpCache(str(tmp_path))
+
+    response = _http.get(URL, client=client, cache=cache)
+    assert response.content == CONTENT
+    assert "If-None-Match" not in requests[0].headers
+
+    response = _http.get(URL, client=client, cache=cache)
+    assert response.status_code == httpx.codes.OK
+    assert response.json() == {"type": "string"}
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_get_last_modified(tmp_path):
+    requests: list = []
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    client = make_client(requests, headers={"Last-Modified": last_modified})
+    cache = HttpCache(str(tmp_path))
+
+    _http.get(URL, client=client, cache=cache)
+    _http.get(URL, client=client, cache=cache)
+
+    assert requests[1].headers["If-Modified-Since"] == last_modified
+
+
+def test_get_without_cache():
+    requests: list = []
+    client = make_client(requests, headers={"ETag": '"v1"'})
+
+    _http.get(URL, client=client)
+    _http.get(URL, client=client)
+
+    assert "If-None-Match" not in requests[1].headers
+
+
+def test_get_without_validators(tmp_path):
+    requests: list = []
+    client = make_client(requests, headers={})
+    cache = HttpCache(str(tmp_path))
+
+    _http.get(URL, client=client, cache=cache)
+
+    assert cache.get(URL) is None
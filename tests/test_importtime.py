@@ -0,0 +1,54 @@
+import subprocess
+import sys
+import typing
+
+# Cumulative microseconds that `import dc_avro.main` may take. It is around
+# 150ms locally, the budget leaves room for slow CI machines
+STARTUP_BUDGET_US = 750_000
+
+# Dependencies that only some commands need
+HEAVY_MODULES = (
+    "asyncio",
+    "dataclasses_avroschema",
+    "dc_avro._diff",
+    "deepdiff",
+    "httpx",
+    "multiprocessing",
+    "pydantic",
+    "rich",
+    "truststore",
+)
+
+
+def import_times(module: str) -> typing.Dict[str, int]:
+    """Cumulative import time, in microseconds, of every module imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_heavy_modules_are_not_imported() -> None:
+    imported = import_times("dc_avro.main")
+
+    assert [
+        name
+        for name in imported
+        if name.split(".")[0] in HEAVY_MODULES or name in HEAVY_MODULES
+    ] == []
+
+
+def test_startup_budget() -> None:
+    # best of three runs, so a busy machine does not make it flaky
+    cumulative = min(import_times("dc_avro.main")["dc_avro.main"] for _ in range(3))
+
+    assert cumulative < STARTUP_BUDGET_US
@@ -0,0 +1,125 @@
+import json
+import os
+from unittest import mock
+
+import httpx
+
+from dc_avro import _http, exceptions
+from dc_avro._cache import ValidationCache
+from dc_avro._lint import (
+    LintResult,
+    lint_file,
+    lint_files,
+    lint_urls,
+    registry_schema_urls,
+)
+
+REGISTRY_URL = "https://schema-registry"
+
+
+def test_lint_file(schema_dir: str) -> None:
+    path = os.path.join(schema_dir, "example.avsc")
+    assert lint_file(path) == LintResult(path=path)
+
+
+def test_lint_file_invalid(schema_dir: str) -> None:
+    path = os.path.join(schema_dir, "invalid_example.avsc")
+    result = lint_file(path)
+
+    assert not result.is_valid
+    assert isinstance(result.error, exceptions.InvalidSchema)
+
+    path = os.path.join(schema_dir, "invalid_resource.txt")
+    result = lint_file(path)
+
+    assert not result.is_valid
+    assert isinstance(result.error, exceptions.JsonRequired)
+
+
+def test_lint_files_parallel(schema_dir: str) -> None:
+    files = [
+        os.path.join(schema_dir, file_name)
+        for file_name in (
+            "example.avsc",
+            "invalid_example.avsc",
+            "example_v2.avsc",
+            "invalid_resource.txt",
+        )
+    ] * 10
+
+    serial = list(lint_files(files))
+    parallel = list(lint_files(files, jobs=2))
+
+    assert [result.path for result in parallel] == files
+    assert [result.is_valid for result in parallel] == [
+        result.is_valid for result in serial
+    ]
+    assert [str(result.error) for result in parallel] == [
+        str(result.error) for result in serial
+    ]
+
+
+def test_lint_file_cached(schema_dir: str, cache_dir: str) -> None:
+    cache = ValidationCache(directory=cache_dir)
+    valid_path = os.path.join(schema_dir, "example.avsc")
+    invalid_path = os.path.join(schema_dir, "invalid_example.avsc")
+
+    first_run = [lint_file(valid_path, cache), lint_file(invalid_path, cache)]
+    assert [result.cached for result in first_run] == [False, False]
+
+    with mock.patch("dc_avro._lint._lint_content") as lint_content:
+        second_run = [lint_file(valid_path, cache), lint_file(invalid_path, cache)]
+        lint_content.assert_not_called()
+
+    assert [result.cached for result in second_run] == [True, True]
+    assert second_run[0].is_valid
+    assert isinstance(second_run[1].error, exceptions.InvalidSchema)
+    assert str(second_run[1].error) == str(first_run[1].error)
+
+
+def registry_client(schemas: dict) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        name = request.url.path.strip("/")
+        if name not in schemas:
+            return httpx.Response(status_code=httpx.codes.NOT_FOUND)
+        return httpx.Response(status_code=httpx.codes.OK, content=schemas[name])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_lint_urls(schema_dir: str) -> None:
+    with open(os.path.join(schema_dir, "example.avsc"), "rb") as schema:
+        valid = schema.read()
+    schemas = {f"schema-{index}": valid for index in range(20)}
+    schemas["invalid"] = b'{"type": "record"}'
+    urls = [f"{REGISTRY_URL}/{name}" for name in schemas] + [f"{REGISTRY_URL}/missing"]
+
+    with mock.patch.object(
+        _http, "get_async_client", return_value=registry_client(schemas)
+    ):
+        results = list(lint_urls(urls, concurrency=4))
+
+    assert [result.path for result in results] == urls
+    assert all(result.is_valid for result in results[:20])
+    assert isinstance(results[20].error, exceptions.InvalidSchema)
+    assert isinstance(results[21].error, httpx.HTTPStatusError)
+
+
+def test_lint_urls_empty() -> None:
+    assert list(lint_urls([])) == []
+
+
+def test_registry_schema_urls() -> None:
+    response = httpx.Response(
+        status_code=httpx.codes.OK,
+        content=json.dumps(["users-value", "a/b"]),
+        request=httpx.Request("GET", f"{REGISTRY_URL}/subjects"),
+    )
+    with mock.patch.object(_http, "get", return_value=response) as get:
+        urls = registry_schema_urls(REGISTRY_URL + "/")
+
+    get.assert_called_once_with(f"{REGISTRY_URL}/subjects", cache=None)
+    assert urls == [
+        f"{REGISTRY_URL}/subjects/users-value/versions/latest/schema",
+        f"{REGISTRY_URL}/subjects/a%2Fb/versions/latest/schema",
+    ]
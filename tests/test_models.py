@@ -0,0 +1,255 @@
+import json
+import os
+from unittest import mock
+
+from dc_avro import _models
+from dc_avro._models import (
+    COMMON_MODULE,
+    Manifest,
+    affected_modules,
+    flatten,
+    generate_package,
+    module_path,
+    plan_modules,
+)
+
+COUNTRY = {"type": "enum", "name": "Country", "symbols": ["NL", "AR"]}
+ADDRESS = {
+    "type": "record",
+    "name": "Address",
+    "namespace": "com.example",
+    "fields": [
+        {"name": "street", "type": "string"},
+        {"name": "country", "type": COUNTRY, "default": "NL"},
+    ],
+}
+USER = {
+    "type": "record",
+    "name": "User",
+    "namespace": "com.example",
+    "fields": [
+        {"name": "address", "type": "Address"},
+        {"name": "country", "type": "Country", "default": "AR"},
+        {
+            "name": "meta",
+            "type": {
+                "type": "record",
+                "name": "Metadata",
+                "fields": [{"name": "id", "type": "string"}],
+            },
+        },
+    ],
+}
+ORDER = {
+    "type": "record",
+    "name": "Order",
+    "namespace": "com.example",
+    "fields": [
+        {"name": "address", "type": ADDRESS},
+        {"name": "hash", "type": {"type": "fixed", "name": "md5", "size": 16}},
+    ],
+}
+
+
+def write_schemas(directory, **schemas) -> list:
+    files = []
+    for name, schema in schemas.items():
+        path = directory / f"{name}.avsc"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(schema))
+        files.append((str(path), module_path(f"{name}.avsc")))
+    return files
+
+
+def test_module_path() -> None:
+    assert module_path("user.avsc") == "user.py"
+    assert module_path("events/user-created.v1.avsc") == "events/user_created_v1.py"
+    assert module_path("2024/user.avsc") == "_2024/user.py"
+
+
+def test_flatten() -> None:
+    flat = flatten(ORDER)
+
+    assert flat.root == "com.example.Order"
+    assert set(flat.definitions) == {
+        "com.example.Order",
+        "com.example.Address",
+        "com.example.Country",
+    }
+    assert flat.definitions["com.example.Order"]["fields"][0]["type"] == "Address"
+    # fixed types are not rendered as classes, so they stay inline
+    assert flat.definitions["com.example.Order"]["fields"][1]["type"]["size"] == 16
+    assert flat.dependencies["com.example.Address"] == {"com.example.Country"}
+    assert flat.references == {"com.example.Order"}
+
+
+def test_plan_modules_shares_named_types(tmp_path) -> None:
+    files = write_schemas(tmp_path, address=ADDRESS, order=ORDER, user=USER)
+
+    modules, errors, _ = plan_modules(files)
+
+    assert errors == {}
+    assert plan_modules(files).definitions == {
+        "com.example.Address": [files[0][0], files[1][0]],
+        "com.example.Country": [files[0][0], files[1][0]],
+    }
+    common, address, order, user = modules
+    assert common.path == f"{COMMON_MODULE}.py"
+    assert [schema["name"] for schema in common.schemas] == ["Country", "Address"]
+    assert common.schemas[0]["namespace"] == "com.example"
+    assert address.schemas == []
+    assert address.imports == ["Address"]
+    assert order.imports == ["Address"]
+    assert user.imports == ["Address", "Country"]
+    assert user.named_types == ["com.example.Address", "com.example.Country"]
+    # the order module only imports the address, which depends on the country
+    assert order.references == common.schemas
+    assert common.references == []
+    # named types used by a single schema are kept in its module
+    assert user.schemas[0]["fields"][2]["type"]["name"] == "Metadata"
+
+
+def test_plan_modules_different_definitions(tmp_path) -> None:
+    order_v2 = {**ORDER, "fields": [*ORDER["fields"], {"name": "id", "type": "long"}]}
+    address_v2 = {**ADDRESS, "doc": "Where users live"}
+    files = write_schemas(tmp_path, order=ORDER, order_v2=order_v2, user=USER)
+
+    modules, errors, _ = plan_modules(files)
+
+    # the address is shared, but every version of the order has its own
+    assert errors == {}
+    assert [schema["name"] for schema in modules[0].schemas] == ["Country", "Address"]
+    assert modules[1].imports == modules[2].imports == ["Address"]
+    assert modules[1].schemas[0]["name"] == modules[2].schemas[0]["name"] == "Order"
+
+    files = write_schemas(tmp_path, address=ADDRESS, address_v2=address_v2)
+    modules, errors, _ = plan_modules(files)
+    assert errors == {}
+    # only the country is the same in both
+    assert [module.imports for module in modules] == [[], ["Country"], ["Country"]]
+
+
+def test_plan_modules_errors(tmp_path) -> None:
+    files = write_schemas(
+        tmp_path, address=ADDRESS, user={**USER, "fields": [{"name": "age"}]}
+    )
+    (tmp_path / "broken.avsc").write_text("{")
+    files.append((str(tmp_path / "broken.avsc"), "broken.py"))
+    (tmp_path / "address-copy.avsc").write_text(json.dumps(ADDRESS))
+    files.append((str(tmp_path / "address-copy.avsc"), "address.py"))
+
+    modules, errors, _ = plan_modules(files)
+
+    assert [module.path for module in modules] == ["address.py"]
+    assert sorted(errors) == sorted(path for path, _ in files[1:])
+    assert "already used" in str(errors[files[-1][0]])
+
+
+def test_generate_package(tmp_path) -> None:
+    files = write_schemas(tmp_path / "schemas", address=ADDRESS, user=USER)
+    output = str(tmp_path / "models")
+
+    result = generate_package(files, output)
+    assert result.written == ["address.py", "common.py", "user.py"]
+    assert result.errors == {}
+    assert os.path.exists(os.path.join(output, "__init__.py"))
+    with open(os.path.join(output, "user.py")) as user_module:
+        code = user_module.read()
+    assert code.startswith("from .common import Address, Country\n")
+    assert "class User(AvroModel)" in code
+    assert "class Address" not in code
+
+    # nothing changed
+    result = generate_package(files, output)
+    assert result.written == []
+    assert len(result.unchanged) == 3
+
+    result = generate_package(files, output, incremental=False)
+    assert len(result.written) == 3
+
+    # the address is no longer shared
+    result = generate_package(files[:1], output)
+    assert result.written == ["address.py"]
+    assert result.removed == ["common.py", "user.py"]
+    assert not os.path.exists(os.path.join(output, "common.py"))
+
+
+def test_generate_package_render_errors(tmp_path, monkeypatch) -> None:
+    files = write_schemas(tmp_path / "schemas", address=ADDRESS)
+
+    def render(module, model_type):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(_models, "render", render)
+    result = generate_package(files, str(tmp_path / "models"))
+
+    assert result.written == []
+    assert str(result.errors["address.py"]) == "boom"
+
+
+def test_generate_package_without_changes(tmp_path) -> None:
+    files = write_schemas(tmp_path / "schemas", address=ADDRESS, user=USER)
+    output = str(tmp_path / "models")
+    generate_package(files, output)
+
+    # the schemas are not parsed when nothing changed
+    with mock.patch.object(_models, "plan_modules") as plan:
+        result = generate_package(files, output)
+    plan.assert_not_called()
+    assert result.unchanged == ["address.py", "common.py", "user.py"]
+
+    # modules modified by hand are written again
+    with open(os.path.join(output, "user.py"), mode="a") as user_module:
+        user_module.write("# edited\n")
+    result = generate_package(files, output)
+    assert result.written == ["user.py"]
+
+
+def test_manifest(tmp_path) -> None:
+    files = write_schemas(tmp_path / "schemas", address=ADDRESS, user=USER)
+    output = str(tmp_path / "models")
+    generate_package(files, output)
+
+    manifest = Manifest.read(output)
+    assert manifest.schemas[files[1][0]][1] == "user.py"
+    assert manifest.named_types == {
+        "com.example.Address": [files[0][0]],
+        "com.example.Country": [files[0][0]],
+    }
+    assert manifest.modules["user.py"][2] == [
+        "com.example.Address",
+        "com.example.Country",
+    ]
+    assert manifest.errors == []
+
+    with open(os.path.join(output, _models.MANIFEST_NAME), mode="w") as broken:
+        broken.write('{"version": 1}')
+    assert Manifest.read(output) == Manifest.empty()
+
+
+def test_affected_modules(tmp_path) -> None:
+    files = write_schemas(tmp_path / "schemas", address=ADDRESS, order=ORDER, user=USER)
+    output = str(tmp_path / "models")
+    assert affected_modules(files, output) == ["address.py", "order.py", "user.py"]
+
+    generate_package(files, output)
+    assert affected_modules(files, output) == []
+
+    # the modules that use the named types the address defines are affected
+    write_schemas(tmp_path / "schemas", address={**ADDRESS, "doc": "Address"})
+    assert affected_modules(files, output) == [
+        "address.py",
+        "common.py",
+        "order.py",
+        "user.py",
+    ]
+
+    write_schemas(tmp_path / "schemas", user={**USER, "doc": "User"})
+    assert affected_modules(files[1:], output) == [
+        "address.py",
+        "common.py",
+        "order.py",
+        "user.py",
+    ]
+    os.remove(os.path.join(output, "order.py"))
+    assert "order.py" in affected_modules(files, output)
@@ -0,0 +1,158 @@
+import json
+from unittest import mock
+
+from dc_avro import _schema_utils, exceptions
+from dc_avro._lint import lint_files_with_references
+from dc_avro._named_types import collect_names, load_registry
+
+ADDRESS = {
+    "type": "record",
+    "name": "Address",
+    "namespace": "com.example",
+    "fields": [
+        {"name": "street", "type": "string"},
+        {
+            "name": "country",
+            "type": {"type": "enum", "name": "Country", "symbols": ["NL", "AR"]},
+        },
+    ],
+}
+USER = {
+    "type": "record",
+    "name": "User",
+    "namespace": "com.example",
+    "fields": [
+        {"name": "name", "type": "string"},
+        {"name": "address", "type": "Address"},
+        {"name": "friends", "type": {"type": "array", "items": "User"}},
+    ],
+}
+ORDER = {
+    "type": "record",
+    "name": "Order",
+    "fields": [
+        {"name": "buyer", "type": "com.example.User"},
+        {"name": "countries", "type": {"type": "map", "values": "com.example.Country"}},
+    ],
+}
+
+
+def write_schemas(tmp_path, **schemas) -> dict:
+    paths = {}
+    for name, schema in schemas.items():
+        path = tmp_path / f"{name}.avsc"
+        path.write_text(json.dumps(schema))
+        paths[name] = str(path)
+    return paths
+
+
+def test_collect_names() -> None:
+    assert collect_names(ADDRESS) == (
+        {"com.example.Address", "com.example.Country"},
+        set(),
+    )
+    assert collect_names(USER) == ({"com.example.User"}, {"com.example.Address"})
+    assert collect_names(ORDER) == (
+        {"Order"},
+        {"com.example.User", "com.example.Country"},
+    )
+
+
+def test_collect_names_without_name() -> None:
+    # invalid named types, left to the validation
+    assert collect_names({"type": "record"}) == (set(), set())
+    assert collect_names(
+        {"type": "record", "name": "User", "fields": [{"name": "a", "type": "fixed"}]}
+    ) == ({"User"}, set())
+
+
+def test_resolve_references(tmp_path) -> None:
+    # the order of the files does not matter
+    paths = write_schemas(tmp_path, order=ORDER, user=USER, address=ADDRESS)
+    registry, files = load_registry(paths.values())
+
+    with mock.patch(
+        "dc_avro._named_types._schema_utils.validate",
+        wraps=_schema_utils.validate,
+    ) as validate:
+        errors = registry.resolve()
+
+    assert errors == {path: None for path in files}
+    assert [call.kwargs["schema"]["name"] for call in validate.call_args_list] == [
+        "Address",
+        "User",
+        "Order",
+    ]
+
+
+def test_resolve_missing_and_invalid(tmp_path) -> None:
+    invalid_address = dict(
+        ADDRESS,
+        fields=[{"name": "street", "type": "string", "default": 1}]
+        + ADDRESS["fields"][1:],
+    )
+    paths = write_schemas(tmp_path, address=invalid_address, user=USER, order=ORDER)
+    errors = registry_errors(paths)
+
+    assert "is not valid" in errors["address"]
+    assert errors["user"] == (
+        f"Schema {paths['user']} depends on invalid schemas: {paths['address']}"
+    )
+    assert errors["order"] == (
+        f"Schema {paths['order']} depends on invalid schemas: "
+        f"{paths['address']}, {paths['user']}"
+    )
+
+    paths = write_schemas(tmp_path, user=USER)
+    assert registry_errors(paths) == {
+        "user": f"Schema {paths['user']} references unknown named types: "
+        "com.example.Address"
+    }
+
+
+def test_resolve_named_type_without_name(tmp_path) -> None:
+    paths = write_schemas(tmp_path, unnamed={"type": "record"})
+    error = registry_errors(paths)["unnamed"]
+
+    assert '"name" is a required field' in error
+
+
+def test_resolve_cycles_and_duplicates(tmp_path) -> None:
+    first = {"type": "record", "name": "A", "fields": [{"name": "b", "type": "B"}]}
+    second = {"type": "record", "name": "B", "fields": [{"name": "a", "type": "A"}]}
+    third = {"type": "record", "name": "C", "fields": [{"name": "a", "type": "A"}]}
+    paths = write_schemas(tmp_path, first=first, second=second, third=third)
+    errors = registry_errors(paths)
+
+    cycle = f"{paths['first']} -> {paths['second']} -> {paths['first']}"
+    assert (
+        errors["first"]
+        == errors["second"]
+        == f"Cyclic reference between schemas: {cycle}"
+    )
+    assert "depends on invalid schemas" in errors["third"]
+
+    paths = write_schemas(tmp_path, address=ADDRESS, copy=ADDRESS)
+    errors = registry_errors(paths)
+    assert errors["address"] is None
+    assert errors["copy"] == (
+        f"Named type `com.example.Address` is already defined in {paths['address']}"
+    )
+
+
+def registry_errors(paths: dict) -> dict:
+    registry, _ = load_registry(paths.values())
+    errors = registry.resolve()
+    return {name: errors[path] and str(errors[path]) for name, path in paths.items()}
+
+
+def test_lint_files_with_references(tmp_path, schema_dir: str) -> None:
+    paths = write_schemas(tmp_path, user=USER, address=ADDRESS)
+    (tmp_path / "invalid.avsc").write_text("not json")
+    files = [paths["user"], str(tmp_path / "invalid.avsc"), paths["address"]]
+
+    results = list(lint_files_with_references(files))
+
+    assert [result.path for result in results] == files
+    assert [result.is_valid for result in results] == [True, False, True]
+    assert isinstance(results[1].error, exceptions.JsonRequired)
@@ -0,0 +1,135 @@
+import io
+import socket
+import threading
+import time
+
+import pytest
+
+from dc_avro._rate import (
+    RateStats,
+    connect,
+    emit_at_rate,
+    is_socket_address,
+    prefetch,
+)
+
+
+def test_rate_stats():
+    stats = RateStats(start=0.0)
+    for lateness in (0.001, 0.003):
+        stats.add(lateness)
+
+    assert stats.total == 2
+    assert stats.rate(now=2.0) == 1
+    assert stats.lateness_mean == pytest.approx(0.002)
+    assert stats.lateness_max == pytest.approx(0.003)
+    assert stats.jitter == pytest.approx(0.001)
+    assert "sent=2 rate=1/s" in stats.summary(now=2.0)
+
+    stats.reset(start=2.0)
+    assert stats.total == 2
+    assert stats.count == 0
+    assert stats.jitter == 0
+
+    stats.add(0.005)
+    # the window only has the last record, the final summary all of them
+    assert "sent=3 rate=1/s latency=5.00ms" in stats.summary(now=3.0)
+    assert "sent=3 rate=1/s latency=3.00ms max=5.00ms" in stats.summary(
+        now=3.0, final=True
+    )
+    assert stats.average_rate(now=6.0) == 0.5
+
+
+def test_prefetch():
+    calls = []
+
+    def generate_batch():
+        calls.append(None)
+        return [str(len(calls)).encode()]
+
+    batches = prefetch(generate_batch, size=2)
+    assert [next(batches) for _ in range(3)] == [[b"1"], [b"2"], [b"3"]]
+    batches.close()
+
+
+def test_prefetch_error():
+    calls = []
+
+    def generate_batch():
+        calls.append(None)
+        if len(calls) == 2:
+            raise ValueError("boom")
+        return [b"1"]
+
+    batches = prefetch(generate_batch, size=2)
+    assert next(batches) == [b"1"]
+    with pytest.raises(ValueError, match="boom"):
+        next(batches)
+    assert len(calls) == 2
+
+
+def test_emit_at_rate():
+    output = io.BytesIO()
+    batches = iter([[b"a\n"] * 30] * 10)
+    reports = []
+
+    start = time.perf_counter()
+    stats = emit_at_rate(
+        output,
+        batches,
+        rate=500,
+        duration=0.2,
+        report=lambda stats, now: reports.append(stats.count),
+        report_interval=0.05,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert stats.total == 100
+    assert output.getvalue() == b"a\n" * 100
+    # the last record is scheduled at 99 / 500 seconds
+    assert elapsed >= 0.198
+    assert reports
+
+
+def test_emit_at_rate_count():
+    output = io.BytesIO()
+    batches = iter([[b"a"] * 10] * 10)
+    stats = emit_at_rate(output, batches, rate=10_000, duration=10, count=25)
+
+    assert stats.total == 25
+    assert output.getvalue() == b"a" * 25
+
+
+def test_emit_at_rate_exhausted():
+    output = io.BytesIO()
+    stats = emit_at_rate(output, iter([[b"a", b"b"]]), rate=1000)
+
+    assert stats.total == 2
+    assert output.getvalue() == b"ab"
+
+
+def test_is_socket_address():
+    assert is_socket_address("tcp://localhost:9000")
+    assert is_socket_address("unix:///tmp/dc-avro.sock")
+    assert not is_socket_address("-")
+    assert not is_socket_address("records.ndjson")
+
+
+def test_connect_tcp():
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    received = []
+
+    def accept():
+        connection, _ = server.accept()
+        with connection:
+            received.append(connection.makefile("rb").read())
+
+    thread = threading.Thread(target=accept)
+    thread.start()
+    with connect(f"tcp://127.0.0.1:{port}") as output:
+        output.write(b"record\n")
+    thread.join(timeout=5)
+    server.close()
+
+    assert received == [b"record\n"]
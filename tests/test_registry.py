@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+from dc_avro import exceptions
+from dc_avro._registry import (
+    REGISTRY_URL_ENV,
+    SNAPSHOT_DIR_ENV,
+    RegistryResource,
+    Snapshot,
+    resolve,
+    snapshot,
+    unwrap,
+)
+from dc_avro._schema_utils import get_raw_resource_from_url, get_resource_from_url
+
+from .conftest import USER_V1, USER_V2
+
+
+@pytest.mark.parametrize(
+    "resource, expected",
+    (
+        ("registry://users-value", RegistryResource(subject="users-value")),
+        ("registry://users-value/2", RegistryResource("users-value", "2")),
+        ("registry://users-value/latest", RegistryResource("users-value")),
+        ("registry://orders%2Fvalue/1", RegistryResource("orders/value", "1")),
+        ("registry://schemas/ids/10", RegistryResource(schema_id=10)),
+    ),
+)
+def test_parse_registry_resource(resource: str, expected: RegistryResource) -> None:
+    assert RegistryResource.parse(resource) == expected
+
+
+@pytest.mark.parametrize(
+    "resource", ("registry://", "registry://users-value/v1", "registry://a/b/c")
+)
+def test_parse_invalid_registry_resource(resource: str) -> None:
+    with pytest.raises(exceptions.RegistryError):
+        RegistryResource.parse(resource)
+
+
+def test_registry_resource_path() -> None:
+    assert (
+        RegistryResource("orders/value").path()
+        == "subjects/orders%2Fvalue/versions/latest"
+    )
+    assert RegistryResource(schema_id=3).path() == "schemas/ids/3"
+
+
+def test_unwrap() -> None:
+    assert unwrap({"id": 1, "schema": json.dumps(USER_V1)}) == USER_V1
+    assert unwrap({"schema": '"string"'}) == "string"
+    assert unwrap(USER_V1) is USER_V1
+
+
+def test_resolve(monkeypatch) -> None:
+    monkeypatch.delenv(REGISTRY_URL_ENV, raising=False)
+    monkeypatch.delenv(SNAPSHOT_DIR_ENV, raising=False)
+    with pytest.raises(exceptions.RegistryError):
+        resolve("registry://users-value")
+
+    monkeypatch.setenv(REGISTRY_URL_ENV, "https://schema-registry/")
+    assert (
+        resolve("registry://users-value/1")
+        == "https://schema-registry/subjects/users-value/versions/1"
+    )
+
+
+def test_snapshot(schema_registry: str, tmp_path, monkeypatch) -> None:
+    directory = str(tmp_path / "snapshot")
+    registry_snapshot = snapshot(schema_registry, directory, concurrency=2)
+
+    assert registry_snapshot.index["registry"] == schema_registry
+    assert registry_snapshot.index["subjects"]["users-value"]["latest"] == 2
+    assert sorted(registry_snapshot.index["ids"]) == ["1", "2", "3"]
+
+    index = Snapshot(directory)
+    path = index.find(RegistryResource("users-value"))
+    assert path is not None
+    with open(path) as schema:
+        assert json.load(schema) == USER_V2
+    assert index.find(RegistryResource("users-value", "3")) is None
+    assert index.find(RegistryResource("unknown")) is None
+
+    monkeypatch.setenv(SNAPSHOT_DIR_ENV, directory)
+    monkeypatch.delenv(REGISTRY_URL_ENV, raising=False)
+    assert resolve("registry://schemas/ids/1") == os.path.join(
+        directory, "subjects", "users-value", "1.avsc"
+    )
+    assert get_resource_from_url("registry://orders%2Fvalue") == {"type": "string"}
+
+
+def test_snapshot_unavailable(tmp_path) -> None:
+    with pytest.raises(exceptions.RegistryError):
+        snapshot("http://127.0.0.1:1", str(tmp_path))
+
+
+def test_get_resource_from_registry(schema_registry: str, monkeypatch) -> None:
+    monkeypatch.setenv(REGISTRY_URL_ENV, schema_registry)
+
+    assert get_resource_from_url("registry://users-value/1") == USER_V1
+    assert get_resource_from_url("registry://users-value") == USER_V2
+    assert get_resource_from_url("registry://schemas/ids/3") == {"type": "string"}
+    assert (
+        get_raw_resource_from_url("registry://users-value/1")
+        == json.dumps(USER_V1, indent=2).splitlines()
+    )
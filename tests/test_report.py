@@ -0,0 +1,117 @@
+import io
+import json
+from xml.etree import ElementTree
+
+import pytest
+
+from dc_avro import _report
+from dc_avro._lint import LintResult
+from dc_avro._report import (
+    JsonLinesReport,
+    JUnitReport,
+    LintReport,
+    SarifReport,
+    rule_id,
+)
+from dc_avro.exceptions import InvalidSchema, JsonRequired
+
+RESULTS = [
+    LintResult(path="schemas/user.avsc"),
+    LintResult(path="schemas/order.avsc", error=InvalidSchema("<bad> & `wrong`")),
+    LintResult(path="schemas/broken.avsc", error=JsonRequired("not json")),
+    LintResult(path="schemas/missing.avsc", error=FileNotFoundError("missing")),
+]
+
+
+def write_report(report_class, results) -> str:
+    output = io.StringIO()
+    report = report_class(output)
+    report.start()
+    for result in results:
+        report.add(result)
+    report.finish()
+    return output.getvalue()
+
+
+def test_json_lines_report() -> None:
+    lines = write_report(JsonLinesReport, RESULTS).splitlines()
+
+    assert [json.loads(line) for line in lines[:2]] == [
+        {
+            "path": "schemas/user.avsc",
+            "valid": True,
+            "error": None,
+            "error_type": None,
+        },
+        {
+            "path": "schemas/order.avsc",
+            "valid": False,
+            "error": "<bad> & `wrong`",
+            "error_type": "InvalidSchema",
+        },
+    ]
+    assert len(lines) == 4
+
+
+@pytest.mark.parametrize("results", (RESULTS, RESULTS[:1], []))
+def test_sarif_report(results) -> None:
+    log = json.loads(write_report(SarifReport, results))
+
+    assert log["version"] == "2.1.0"
+    (run,) = log["runs"]
+    assert run["tool"]["driver"]["name"] == "dc-avro"
+    assert [result["ruleId"] for result in run["results"]] == [
+        rule_id(result.error) for result in results if result.error is not None
+    ]
+    if results == RESULTS:
+        location = run["results"][0]["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uri"] == "schemas/order.avsc"
+
+
+def test_junit_report() -> None:
+    suites = ElementTree.fromstring(write_report(JUnitReport, RESULTS))
+
+    suite = suites.find("testsuite")
+    assert suite.get("tests") == suites.get("tests") == str(len(RESULTS))
+    assert suite.get("failures") == str(len(RESULTS) - 1)
+    assert suite.get("errors") == "0"
+
+    testcases = suites.findall("testsuite/testcase")
+    assert [testcase.get("name") for testcase in testcases] == [
+        result.path for result in RESULTS
+    ]
+    assert testcases[0].find("failure") is None
+    failure = testcases[1].find("failure")
+    assert failure.get("type") == "InvalidSchema"
+    assert failure.get("message") == failure.text == "<bad> & `wrong`"
+
+
+def test_junit_report_without_results() -> None:
+    suites = ElementTree.fromstring(write_report(JUnitReport, []))
+    assert suites.find("testsuite").get("tests") == "0"
+
+
+def test_junit_report_spools_to_disk(monkeypatch) -> None:
+    monkeypatch.setattr(_report, "SPOOL_MAX_SIZE", 100)
+    output = io.StringIO()
+    report = JUnitReport(output)
+    report.start()
+    for result in RESULTS:
+        report.add(result)
+
+    assert report.testcases._rolled
+    report.finish()
+    assert len(ElementTree.fromstring(output.getvalue()).findall(".//testcase")) == 4
+
+
+def test_lint_report_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        LintReport(io.StringIO())  # type: ignore
+
+
+def test_rule_id() -> None:
+    assert [rule_id(result.error) for result in RESULTS[1:]] == [
+        "invalid-schema",
+        "json-required",
+        "unreadable-schema",
+    ]
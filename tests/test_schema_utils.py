@@ -1,18 +1,25 @@
+import copy
 import json
 import os
+from collections import OrderedDict
 from unittest import mock
 
+import fastavro
 import pytest
 from httpx import Response, codes
 
-from dc_avro import JsonDict, exceptions
+from dc_avro import JsonDict, _schema_utils, exceptions
+from dc_avro._cache import ValidationCache
 from dc_avro._schema_utils import (
     generate_data,
     get_resource_from_path,
     get_resource_from_url,
     get_schema,
     is_url,
+    iter_data,
+    parse,
     validate,
+    validate_cached,
 )
 
 
@@ -20,7 +27,7 @@ def test_get_resource_from_url(example_schema_json: JsonDict) -> None:
     url = "https://schema-registry/example.avsc"
 
     response = Response(status_code=codes.OK, json=example_schema_json)
-    with mock.patch("dc_avro._schema_utils.httpx.get", return_value=response):
+    with mock.patch("dc_avro._http.get", return_value=response):
         assert get_resource_from_url(url)
 
 
@@ -28,7 +35,7 @@ def test_get_invalid_resource_from_url(invalid_resource) -> None:
     url = "https://schema-registry/example.avsc"
 
     response = Response(status_code=codes.OK, content=invalid_resource)
-    with mock.patch("dc_avro._schema_utils.httpx.get", return_value=response):
+    with mock.patch("dc_avro._http.get", return_value=response):
         with pytest.raises(exceptions.JsonRequired) as exc_info:
             get_resource_from_url(url)
 
@@ -84,6 +91,58 @@ def test_invalid_schema(invalid_example_schema_json) -> None:
     assert exc_info.value.args[0] == expected_error
 
 
+def test_validate_cached(
+    example_schema_json, invalid_example_schema_json, cache_dir: str
+) -> None:
+    cache = ValidationCache(directory=cache_dir)
+    assert validate_cached(schema=example_schema_json, cache=cache) is None
+    with pytest.raises(exceptions.InvalidSchema) as first_error:
+        validate_cached(schema=invalid_example_schema_json, cache=cache)
+
+    with mock.patch("dc_avro._schema_utils.parse_schema") as parse_schema:
+        validate_cached(schema=example_schema_json, cache=cache)
+        with pytest.raises(exceptions.InvalidSchema) as second_error:
+            validate_cached(schema=invalid_example_schema_json, cache=cache)
+        parse_schema.assert_not_called()
+
+    assert str(first_error.value) == str(second_error.value)
+
+
+def test_schema_parsed_once(example_schema_json, monkeypatch) -> None:
+    monkeypatch.setattr(_schema_utils, "_parsed_schemas", OrderedDict())
+    reordered_schema = dict(reversed(example_schema_json.items()))
+
+    with mock.patch(
+        "dc_avro._schema_utils.parse_schema", wraps=fastavro.parse_schema
+    ) as parse_schema:
+        schema = validate(schema=example_schema_json)
+        assert parse(schema=reordered_schema) is schema
+        assert validate(schema=example_schema_json) is schema
+        parse_schema.assert_called_once()
+
+    assert schema["__fastavro_parsed"]
+
+
+def test_parsed_schemas_keep_defaults(example_schema_json, monkeypatch) -> None:
+    monkeypatch.setattr(_schema_utils, "_parsed_schemas", OrderedDict())
+    other_schema = copy.deepcopy(example_schema_json)
+    other_schema["fields"][5]["default"] = True
+
+    schema = parse(schema=example_schema_json)
+    assert parse(schema=other_schema) is not schema
+    assert parse(schema=other_schema)["fields"][5]["default"] is True
+
+
+def test_parsed_schemas_max_size(example_schema_json, monkeypatch) -> None:
+    monkeypatch.setattr(_schema_utils, "_parsed_schemas", OrderedDict())
+    monkeypatch.setattr(_schema_utils, "PARSED_SCHEMAS_MAX_SIZE", 1)
+
+    schema = parse(schema=example_schema_json)
+    parse(schema="string")
+    assert list(_schema_utils._parsed_schemas) == ['"string"']
+    assert parse(schema=example_schema_json) is not schema
+
+
 def test_is_url() -> None:
     url = "https://schema-registry.com/example.avsc"
     assert is_url(url)
@@ -98,7 +157,7 @@ def test_get_schema(schema_dir: str, example_schema_json: JsonDict) -> None:
     url = "https://schema-registry/example.avsc"
 
     responnse = Response(status_code=codes.OK, json=example_schema_json)
-    with mock.patch("dc_avro._schema_utils.httpx.get", return_value=responnse):
+    with mock.patch("dc_avro._http.get", return_value=responnse):
         assert get_schema(url)
 
 
@@ -111,3 +170,11 @@ def test_generate_data(schema_dir: str) -> None:
 
     data = generate_data(schema=schema, count=2)
     assert isinstance(data, list)
+
+
+def test_iter_data(schema_dir: str) -> None:
+    schema = get_schema(os.path.join(schema_dir, "example.avsc"))
+
+    data = iter_data(schema=schema, count=3)
+    assert not isinstance(data, list)
+    assert len(list(data)) == 3
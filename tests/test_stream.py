@@ -0,0 +1,361 @@
+import datetime
+import decimal
+import io
+import json
+import os
+import uuid
+
+import fastavro
+import pytest
+from fastavro.utils import generate_many
+
+from dc_avro import _stream, exceptions
+from dc_avro._schema_utils import get_schema
+from dc_avro._stream import (
+    LENGTH_PREFIX,
+    deserialize_records,
+    iter_json_records,
+    iter_length_prefixed,
+    json_default,
+    json_to_datum,
+    message_encoder,
+    serialize_records,
+    strip_confluent_header,
+    write_length_prefixed,
+    write_ndjson,
+    write_records,
+)
+from dc_avro._types import DataFormat, SerializationType, StreamFormat
+
+RECORDS = [
+    {
+        "name": "bond",
+        "age": 50,
+        "pets": ["dog", "cat"],
+        "accounts": {"key": 1},
+        "favorite_colors": "BLUE",
+        "address": None,
+        "md5": "u00ffffffffffffx",
+    },
+    {
+        "name": "alice",
+        "age": 30,
+        "pets": [],
+        "accounts": {},
+        "favorite_colors": "GREEN",
+        "has_car": True,
+        "address": "Amsterdam",
+        "md5": "u00ffffffffffffy",
+    },
+]
+
+
+@pytest.fixture
+def example_schema(schema_dir: str):
+    return get_schema(os.path.join(schema_dir, "example.avsc"))
+
+
+def test_iter_json_lines() -> None:
+    stream = io.StringIO("\n".join(json.dumps(record) for record in RECORDS) + "\n\n")
+    assert list(iter_json_records(stream)) == RECORDS
+
+
+def test_iter_json_array(monkeypatch) -> None:
+    # force the records to be split between several chunks
+    monkeypatch.setattr(_stream, "READ_CHUNK_SIZE", 7)
+    stream = io.StringIO("  " + json.dumps(RECORDS + [12345, "last"], indent=2))
+    assert list(iter_json_records(stream)) == RECORDS + [12345, "last"]
+
+    assert list(iter_json_records(io.StringIO("[]"))) == []
+    assert list(iter_json_records(io.StringIO(""))) == []
+
+
+@pytest.mark.parametrize("content", ('[{"name": "bond"}, {"name": ', '{"a": 1}\n{"a"'))
+def test_iter_json_records_invalid(content: str) -> None:
+    with pytest.raises(exceptions.JsonRequired):
+        list(iter_json_records(io.StringIO(content)))
+
+
+def test_json_to_datum(example_schema) -> None:
+    convert = json_to_datum(example_schema)
+    assert convert is not None
+
+    record = convert(RECORDS[0])
+    assert record["md5"] == b"u00ffffffffffffx"
+    assert record["pets"] == ["dog", "cat"]
+
+    schema = fastavro.parse_schema(
+        {
+            "type": "record",
+            "name": "Payment",
+            "fields": [
+                {"name": "id", "type": "string"},
+                {
+                    "name": "amount",
+                    "type": {
+                        "type": "bytes",
+                        "logicalType": "decimal",
+                        "precision": 10,
+                        "scale": 2,
+                    },
+                },
+                {"name": "raw", "type": ["null", {"type": "array", "items": "bytes"}]},
+            ],
+        }
+    )
+    record = json_to_datum(schema)({"id": "1", "amount": "10.50", "raw": ["ab"]})  # type: ignore
+    assert record == {"id": "1", "amount": decimal.Decimal("10.50"), "raw": [b"ab"]}
+
+
+def test_json_to_datum_without_bytes() -> None:
+    schema = fastavro.parse_schema(
+        {
+            "type": "record",
+            "name": "User",
+            "fields": [{"name": "name", "type": "string"}],
+        }
+    )
+    assert json_to_datum(schema) is None
+
+
+def test_json_to_datum_inline_record_in_union() -> None:
+    schema = fastavro.parse_schema(
+        {
+            "type": "record",
+            "name": "Message",
+            "fields": [
+                {"name": "b", "type": "bytes"},
+                {
+                    "name": "u",
+                    "type": [
+                        "null",
+                        {
+                            "type": "record",
+                            "name": "Inline",
+                            "fields": [{"name": "f", "type": "string"}],
+                        },
+                    ],
+                },
+            ],
+        }
+    )
+    record = json_to_datum(schema)({"b": "ab", "u": {"f": "x"}})  # type: ignore
+    assert record == {"b": b"ab", "u": {"f": "x"}}
+
+    output = io.BytesIO()
+    assert write_length_prefixed(output, schema, [record]) == 1
+
+
+@pytest.mark.parametrize("batch_size", (1, 1000))
+def test_write_length_prefixed(example_schema, batch_size: int) -> None:
+    output = io.BytesIO()
+    records = [json_to_datum(example_schema)(record) for record in RECORDS]  # type: ignore
+    assert write_length_prefixed(output, example_schema, records, batch_size) == 2
+
+    output.seek(0)
+    decoded = []
+    while prefix := output.read(LENGTH_PREFIX.size):
+        (size,) = LENGTH_PREFIX.unpack(prefix)
+        message = io.BytesIO(output.read(size))
+        decoded.append(fastavro.schemaless_reader(message, example_schema))
+    assert [record["md5"] for record in decoded] == [
+        b"u00ffffffffffffx",
+        b"u00ffffffffffffy",
+    ]
+
+
+def test_serialize_records_container(example_schema) -> None:
+    output = io.BytesIO()
+    total = serialize_records(
+        input=io.StringIO(json.dumps(RECORDS)),
+        output=output,
+        schema=example_schema,
+        codec="deflate",
+    )
+    assert total == 2
+
+    output.seek(0)
+    reader = fastavro.reader(output)
+    assert reader.codec == "deflate"
+    assert [record["name"] for record in reader] == ["bond", "alice"]
+
+
+def test_serialize_records_avro_json(example_schema) -> None:
+    output = io.BytesIO()
+    total = serialize_records(
+        input=io.StringIO("\n".join(json.dumps(record) for record in RECORDS)),
+        output=output,
+        schema=example_schema,
+        serialization_type=SerializationType.AVRO_JSON,
+        output_format=StreamFormat.LENGTH_PREFIXED,
+    )
+    assert total == 2
+
+    lines = output.getvalue().decode().splitlines()
+    assert json.loads(lines[1])["address"] == {"string": "Amsterdam"}
+
+    output = io.BytesIO()
+    assert (
+        serialize_records(
+            input=io.StringIO(""),
+            output=output,
+            schema=example_schema,
+            serialization_type=SerializationType.AVRO_JSON,
+        )
+        == 0
+    )
+    assert output.getvalue() == b""
+
+
+def length_prefixed(*messages: bytes) -> io.BytesIO:
+    return io.BytesIO(
+        b"".join(LENGTH_PREFIX.pack(len(message)) + message for message in messages)
+    )
+
+
+def test_iter_length_prefixed() -> None:
+    assert list(iter_length_prefixed(length_prefixed(b"one", b"", b"two"))) == [
+        b"one",
+        b"",
+        b"two",
+    ]
+
+    with pytest.raises(exceptions.InvalidData):
+        list(iter_length_prefixed(io.BytesIO(b"\x00\x00")))
+
+    with pytest.raises(exceptions.InvalidData):
+        list(iter_length_prefixed(io.BytesIO(LENGTH_PREFIX.pack(10) + b"short")))
+
+
+def test_strip_confluent_header() -> None:
+    assert bytes(strip_confluent_header(b"\x00\x00\x00\x00\x07payload")) == b"payload"
+
+    with pytest.raises(exceptions.InvalidData):
+        strip_confluent_header(b"\x01\x00\x00\x00\x07payload")
+
+    with pytest.raises(exceptions.InvalidData):
+        strip_confluent_header(b"\x00\x00")
+
+
+def test_json_default() -> None:
+    record = {
+        "md5": b"u00ff",
+        "created": datetime.datetime(2025, 1, 1, 10, 30),
+        "day": datetime.date(2025, 1, 1),
+        "amount": decimal.Decimal("10.50"),
+        "id": uuid.UUID(int=1),
+        "union": ("User", {"name": "bond"}),
+    }
+    assert json.loads(json.dumps(record, default=json_default)) == {
+        "md5": "u00ff",
+        "created": "2025-01-01T10:30:00",
+        "day": "2025-01-01",
+        "amount": "10.50",
+        "id": "00000000-0000-0000-0000-000000000001",
+        "union": ["User", {"name": "bond"}],
+    }
+
+    with pytest.raises(TypeError):
+        json_default(object())
+
+
+def test_write_ndjson() -> None:
+    output = io.StringIO()
+    assert write_ndjson(output, ({"index": index} for index in range(5)), 2) == 5
+    assert output.getvalue().splitlines() == [
+        json.dumps({"index": index}) for index in range(5)
+    ]
+
+
+def encoded_records(schema) -> list:
+    convert = json_to_datum(schema)
+    messages = []
+    for record in RECORDS:
+        message = io.BytesIO()
+        fastavro.schemaless_writer(message, schema, convert(record))  # type: ignore
+        messages.append(message.getvalue())
+    return messages
+
+
+@pytest.mark.parametrize(
+    "input_format, header",
+    (
+        (StreamFormat.LENGTH_PREFIXED, b""),
+        (StreamFormat.CONFLUENT, b"\x00\x00\x00\x00\x01"),
+    ),
+)
+def test_deserialize_messages(
+    example_schema, input_format: StreamFormat, header: bytes
+) -> None:
+    messages = [header + message for message in encoded_records(example_schema)]
+    output = io.StringIO()
+
+    total = deserialize_records(
+        input=length_prefixed(*messages),
+        output=output,
+        schema=example_schema,
+        input_format=input_format,
+    )
+
+    assert total == 2
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record["md5"] for record in records] == [
+        "u00ffffffffffffx",
+        "u00ffffffffffffy",
+    ]
+
+    with pytest.raises(exceptions.InvalidData):
+        deserialize_records(
+            input=length_prefixed(*messages), output=output, input_format=input_format
+        )
+
+
+def test_deserialize_container(example_schema) -> None:
+    container = io.BytesIO()
+    serialize_records(
+        input=io.StringIO(json.dumps(RECORDS)), output=container, schema=example_schema
+    )
+    container.seek(0)
+    output = io.StringIO()
+
+    assert deserialize_records(input=container, output=output) == 2
+    assert json.loads(output.getvalue().splitlines()[1])["address"] == "Amsterdam"
+
+
+@pytest.mark.parametrize("output_format", list(DataFormat))
+def test_write_records(example_schema, output_format: DataFormat) -> None:
+    records = list(generate_many(example_schema, count=5))
+    output = io.BytesIO()
+
+    total = write_records(
+        output=output,
+        schema=example_schema,
+        records=iter(records),
+        output_format=output_format,
+    )
+    assert total == 5
+
+    output.seek(0)
+    if output_format == DataFormat.NDJSON:
+        lines = output.getvalue().decode().rstrip("\n").split("\n")
+        assert [json.loads(line)["name"] for line in lines] == [
+            record["name"] for record in records
+        ]
+    elif output_format == DataFormat.LENGTH_PREFIXED:
+        assert len(list(iter_length_prefixed(output))) == 5
+    else:
+        assert list(fastavro.reader(output)) == records
+
+
+def test_message_encoder(example_schema) -> None:
+    records = list(generate_many(example_schema, count=3))
+
+    encode = message_encoder(example_schema, DataFormat.NDJSON)
+    assert all(encode(record).endswith(b"\n") for record in records)
+
+    encode = message_encoder(example_schema, DataFormat.LENGTH_PREFIXED)
+    messages = b"".join(encode(record) for record in records)
+    assert list(_stream.iter_messages(io.BytesIO(messages), example_schema)) == records
+
+    with pytest.raises(exceptions.InvalidData):
+        message_encoder(example_schema, DataFormat.CONTAINER)
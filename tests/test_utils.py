@@ -21,7 +21,7 @@ def test_get_raw_resource_from_url(schema_dir: str) -> None:
         schema = file.read()
 
     response = Response(status_code=codes.OK, text=schema)
-    with mock.patch("dc_avro.main._schema_utils.httpx.get", return_value=response):
+    with mock.patch("dc_avro._http.get", return_value=response):
         result = get_raw_resource_from_url("http://example.com")
 
     assert result == schema.splitlines()
@@ -0,0 +1,171 @@
+import json
+import os
+from unittest import mock
+
+from dc_avro import _files, _lint, exceptions
+from dc_avro._watch import Watcher
+
+ADDRESS = {
+    "type": "record",
+    "name": "Address",
+    "fields": [{"name": "street", "type": "string"}],
+}
+USER = {
+    "type": "record",
+    "name": "User",
+    "fields": [{"name": "address", "type": "Address"}],
+}
+ORDER = {
+    "type": "record",
+    "name": "Order",
+    "fields": [{"name": "buyer", "type": "User"}],
+}
+INVALID = {"type": "record", "name": "Invalid", "fields": [{"name": "age"}]}
+
+
+def write(path, schema) -> None:
+    stat = os.stat(path) if path.exists() else None
+    path.write_text(json.dumps(schema))
+    if stat is not None:
+        # make sure the change is detected on file systems with coarse mtimes
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def watcher(tmp_path, **kwargs) -> Watcher:
+    return Watcher(lambda: _files.iter_schema_files([str(tmp_path)]), **kwargs)
+
+
+def test_poll_lints_changed_files(tmp_path) -> None:
+    write(tmp_path / "address.avsc", ADDRESS)
+    write(tmp_path / "invalid.avsc", INVALID)
+    invalid = str(tmp_path / "invalid.avsc")
+    schema_watcher = watcher(tmp_path)
+
+    update = schema_watcher.poll()
+    assert len(update.linted) == 2
+    assert list(update.errors) == [invalid]
+
+    # nothing changed
+    update = schema_watcher.poll()
+    assert update.linted == []
+    assert not update.has_changes
+
+    write(tmp_path / "invalid.avsc", ADDRESS)
+    with mock.patch.object(_lint, "lint_file", wraps=_lint.lint_file) as lint_file:
+        update = schema_watcher.poll()
+    assert [call.args[0] for call in lint_file.call_args_list] == [invalid]
+    assert update.fixed == [invalid]
+    assert update.errors == {}
+    assert schema_watcher.errors == {}
+
+
+def test_poll_reports_changed_errors_only(tmp_path) -> None:
+    write(tmp_path / "invalid.avsc", INVALID)
+    schema_watcher = watcher(tmp_path)
+    schema_watcher.poll()
+
+    # same error after saving the file again
+    write(tmp_path / "invalid.avsc", INVALID)
+    update = schema_watcher.poll()
+    assert len(update.linted) == 1
+    assert not update.has_changes
+
+    write(tmp_path / "invalid.avsc", {**INVALID, "name": "Other"})
+    assert len(schema_watcher.poll().errors) == 1
+
+
+def test_poll_removed_files(tmp_path) -> None:
+    write(tmp_path / "invalid.avsc", INVALID)
+    schema_watcher = watcher(tmp_path)
+    schema_watcher.poll()
+
+    os.remove(tmp_path / "invalid.avsc")
+    update = schema_watcher.poll()
+    assert update.removed == [str(tmp_path / "invalid.avsc")]
+    assert schema_watcher.errors == {}
+
+
+def test_poll_resolve_references(tmp_path) -> None:
+    write(tmp_path / "address.avsc", ADDRESS)
+    write(tmp_path / "invalid.avsc", INVALID)
+    write(tmp_path / "order.avsc", ORDER)
+    write(tmp_path / "user.avsc", USER)
+    paths = {name: str(tmp_path / f"{name}.avsc") for name in ("address", "order")}
+    schema_watcher = watcher(tmp_path, resolve_references=True)
+
+    update = schema_watcher.poll()
+    assert len(update.linted) == 4
+    assert len(update.errors) == 1
+
+    # the files that depend on the address, directly or not, are linted again
+    write(tmp_path / "address.avsc", {**ADDRESS, "name": "Location"})
+    update = schema_watcher.poll()
+    assert update.linted == [
+        paths["address"],
+        paths["order"],
+        str(tmp_path / "user.avsc"),
+    ]
+    assert list(update.errors) == [paths["order"], str(tmp_path / "user.avsc")]
+
+    write(tmp_path / "address.avsc", ADDRESS)
+    update = schema_watcher.poll()
+    assert update.fixed == [paths["order"], str(tmp_path / "user.avsc")]
+
+    # a file that does not define named types used by others
+    write(tmp_path / "order.avsc", {**ORDER, "doc": "orders"})
+    assert schema_watcher.poll().linted == [paths["order"]]
+
+
+def test_poll_resolve_references_deleted_definition(tmp_path) -> None:
+    write(tmp_path / "address.avsc", ADDRESS)
+    write(tmp_path / "user.avsc", USER)
+    schema_watcher = watcher(tmp_path, resolve_references=True)
+    assert schema_watcher.poll().errors == {}
+
+    os.remove(tmp_path / "address.avsc")
+    update = schema_watcher.poll()
+    assert update.linted == [str(tmp_path / "user.avsc")]
+    assert "unknown named types: Address" in str(
+        update.errors[str(tmp_path / "user.avsc")]
+    )
+
+
+def test_poll_resolve_references_duplicates(tmp_path) -> None:
+    write(tmp_path / "address.avsc", ADDRESS)
+    write(tmp_path / "user.avsc", USER)
+    schema_watcher = watcher(tmp_path, resolve_references=True)
+    schema_watcher.poll()
+
+    # the first file keeps the definition, like in a full run
+    write(tmp_path / "z_address.avsc", ADDRESS)
+    update = schema_watcher.poll()
+    assert list(update.errors) == [str(tmp_path / "z_address.avsc")]
+    assert "already defined" in str(update.errors[str(tmp_path / "z_address.avsc")])
+
+
+def test_poll_files_deleted_during_poll(tmp_path) -> None:
+    write(tmp_path / "address.avsc", ADDRESS)
+    missing = str(tmp_path / "missing.avsc")
+    schema_watcher = Watcher(lambda: [str(tmp_path / "address.avsc"), missing])
+
+    # deleted after the scan
+    with mock.patch.object(_lint, "lint_file", side_effect=FileNotFoundError):
+        update = schema_watcher.poll()
+    assert update.linted == []
+    assert list(schema_watcher.states) == [str(tmp_path / "address.avsc")]
+
+
+def test_poll_resolve_references_invalid_json(tmp_path) -> None:
+    write(tmp_path / "address.avsc", ADDRESS)
+    (tmp_path / "broken.avsc").write_text("not json")
+    broken = str(tmp_path / "broken.avsc")
+    schema_watcher = watcher(tmp_path, resolve_references=True)
+
+    update = schema_watcher.poll()
+    assert list(update.errors) == [broken]
+    assert isinstance(update.errors[broken], exceptions.JsonRequired)
+
+    # nothing changed
+    update = schema_watcher.poll()
+    assert update.linted == []
+    assert not update.has_changes